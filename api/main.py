@@ -1,10 +1,19 @@
 import datetime as dt
 import os
+from contextlib import asynccontextmanager
 from typing import Callable, Tuple
 
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field
-
+from starlette.concurrency import run_in_threadpool
+
+from tradingagents.dataflows.ccxt_bybit import start_kline_stream, start_orderbook_sampler
+from tradingagents.dataflows.ccxt_bybit_async import aget_market_snapshot
+from tradingagents.dataflows.ccxt_pool import close_async_clients
+from tradingagents.dataflows.interface import get_dataflow_stats
+from tradingagents.dataflows.kline_stream import get_stream_hub
+from tradingagents.dataflows.market_catalogue import UnknownSymbolError, get_market_catalogue, normalize_symbol
+from tradingagents.dataflows.orderbook_sampler import set_orderbook_sampler
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.graph.trading_graph import TradingAgentsGraph
 from bot.config import resolve_model
@@ -29,20 +38,77 @@ class SignalResponse(BaseModel):
     raw_decision: str
 
 
+class SnapshotResponse(BaseModel):
+    symbol: str
+    ohlcv: str
+    orderbook: str
+    funding_rate: str
+    open_interest: str
+
+
 def default_graph_factory(config) -> TradingAgentsGraph:
     return TradingAgentsGraph(selected_analysts=["market"], debug=config.get("debug", False), config=config)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load (or refresh) the market catalogue once so requests validate from memory;
+    # the refresh may download the market list, so it runs off the event loop
+    await run_in_threadpool(get_market_catalogue)
+    # Keep rolling orderbook stats warm for the configured symbols
+    sampled_symbols = DEFAULT_CONFIG.get("orderbook_sampler_symbols") or []
+    if sampled_symbols:
+        start_orderbook_sampler(list(sampled_symbols))
+    # Serve OHLCV windows for the configured series from live kline buffers
+    streamed = DEFAULT_CONFIG.get("kline_stream_subscriptions") or []
+    if streamed:
+        try:
+            start_kline_stream([tuple(pair) for pair in streamed])
+        except Exception as e:
+            print(f"WARNING: kline stream not started, OHLCV falls back to REST: {e}")
+    yield
+    get_stream_hub().stop()
+    set_orderbook_sampler(None)
+    # Release the pooled async exchange sessions owned by the server loop
+    await close_async_clients()
+
+
+def _validated_symbol(symbol: str) -> str:
+    """Normalize to a listed symbol, rejecting unknown ones before any expensive work."""
+    try:
+        # Snapshot only: the catalogue is refreshed in the lifespan, never per request
+        return normalize_symbol(symbol, refresh=False)
+    except UnknownSymbolError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 def create_app(graph_factory: Callable = default_graph_factory) -> FastAPI:
-    app = FastAPI(title="TradingAgents Crypto Perp API", version="0.1.0")
+    app = FastAPI(title="TradingAgents Crypto Perp API", version="0.1.0", lifespan=lifespan)
 
     @app.get("/health")
     def health():
         return {"status": "ok"}
 
+    @app.get("/stats")
+    def stats():
+        """Cache hit rates, coalesced requests and rate-limit waits for the data layer."""
+        return get_dataflow_stats()
+
+    @app.get("/snapshot", response_model=SnapshotResponse)
+    async def snapshot(symbol: str = "BTC/USDT", trade_date: str | None = None, timeframe: str = "15m"):
+        """Raw market context for a symbol, fetched concurrently on the event loop."""
+        trade_date = trade_date or dt.date.today().strftime("%Y-%m-%d")
+        symbol = _validated_symbol(symbol)
+        try:
+            parts = await aget_market_snapshot(symbol, trade_date, trade_date, timeframe=timeframe)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Snapshot failed: {e}")
+        return SnapshotResponse(symbol=symbol, **parts)
+
     @app.post("/signal", response_model=SignalResponse)
     def signal(req: SignalRequest):
         trade_date = req.trade_date or dt.date.today().strftime("%Y-%m-%d")
+        symbol = _validated_symbol(req.symbol)
         deep, quick = resolve_model(req.model)
 
         config = DEFAULT_CONFIG.copy()
@@ -54,7 +120,7 @@ def create_app(graph_factory: Callable = default_graph_factory) -> FastAPI:
 
         try:
             graph = graph_factory(config)
-            final_state, decision_text = graph.propagate(req.symbol, trade_date, stop_loss_pct=req.stop_loss_pct)
+            final_state, decision_text = graph.propagate(symbol, trade_date, stop_loss_pct=req.stop_loss_pct)
             decision = graph.process_signal(decision_text)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Graph execution failed: {e}")
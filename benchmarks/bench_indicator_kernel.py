@@ -0,0 +1,117 @@
+"""
+Benchmark: batched indicator kernel vs one pandas indicator pass per symbol,
+and float32 `OhlcvArrays` input against float64 frames (time and bar memory).
+
+Usage:
+    python benchmarks/bench_indicator_kernel.py --symbols 100 200 --bars 1500
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows.indicator_engine import INDICATOR_COLUMNS  # noqa: E402
+from tradingagents.dataflows.indicator_kernel import batch_indicators, stack_closes  # noqa: E402
+from tradingagents.dataflows.ohlcv_arrays import OhlcvArrays  # noqa: E402
+
+
+def pandas_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """The per-frame pandas bundle `compute_indicators` used before the registry."""
+    out = df.copy()
+    close = out["close"]
+    for n in (7, 25, 99):
+        out[f"sma_{n}"] = close.rolling(window=n, min_periods=n).mean()
+    delta = close.diff()
+    gain = delta.clip(lower=0).rolling(window=14, min_periods=14).mean()
+    loss = (-delta.clip(upper=0)).rolling(window=14, min_periods=14).mean()
+    out["rsi_14"] = 100 - (100 / (1 + gain / loss.replace(0, pd.NA)))
+    mean, std = close.rolling(window=20, min_periods=20).mean(), close.rolling(window=20, min_periods=20).std()
+    out["bb_mid_20"], out["bb_upper_20_2"], out["bb_lower_20_2"] = mean, mean + 2 * std, mean - 2 * std
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    out["macd"], out["macd_signal"] = macd, macd.ewm(span=9, adjust=False).mean()
+    out["macd_hist"] = out["macd"] - out["macd_signal"]
+    return out
+
+
+def synthetic_frames(symbols: int, bars: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    frames = {}
+    for i in range(symbols):
+        close = 100 * (1 + i % 50) * np.exp(np.cumsum(rng.normal(0, 0.002, bars)))
+        frames[f"SYM{i}/USDT:USDT"] = pd.DataFrame(
+            {
+                "datetime": pd.date_range("2024-01-01", periods=bars, freq="15min"),
+                "open": close,
+                "high": close * 1.001,
+                "low": close * 0.999,
+                "close": close,
+                "volume": rng.uniform(1, 100, bars),
+            }
+        )
+    return frames
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run(symbols: int, bars: int, repeat: int) -> None:
+    frames = synthetic_frames(symbols, bars)
+    per_symbol = best_of(lambda: [pandas_indicators(df) for df in frames.values()], repeat)
+    batched = best_of(lambda: batch_indicators(stack_closes(frames)[1]), repeat)
+
+    names, close = stack_closes(frames)
+    result = batch_indicators(close)
+    worst = 0.0
+    for i, name in enumerate(names):
+        expected = pandas_indicators(frames[name])
+        for col in INDICATOR_COLUMNS:
+            want = expected[col].astype("Float64").to_numpy("float64", na_value=np.nan)
+            ok = ~np.isnan(want)
+            worst = max(worst, float(np.max(np.abs(result[col][i][ok] - want[ok]) / np.maximum(1, np.abs(want[ok])), initial=0)))
+
+    compact = {name: OhlcvArrays.from_frame(df) for name, df in frames.items()}
+    batched32 = best_of(lambda: batch_indicators(stack_closes(compact)[1]), repeat)
+    result32 = batch_indicators(stack_closes(compact)[1])
+    worst32 = max(
+        float(np.nanmax(np.abs(result32[col] - result[col]) / np.maximum(1, np.abs(result[col])), initial=0))
+        for col in INDICATOR_COLUMNS
+    )
+    frame_mb = sum(df.memory_usage(deep=True).sum() for df in frames.values()) / 2**20
+    compact_mb = sum(bars.nbytes for bars in compact.values()) / 2**20
+
+    print(
+        f"symbols={symbols:>4} bars={bars:>5}  per-symbol={per_symbol * 1000:8.1f} ms  "
+        f"batched={batched * 1000:7.1f} ms  speedup={per_symbol / batched:5.1f}x  max_rel_err={worst:.1e}"
+    )
+    print(
+        f"{'':22}float32 batched={batched32 * 1000:7.1f} ms  max_rel_err_vs_f64={worst32:.1e}  "
+        f"bars memory frames={frame_mb:6.1f} MB compact={compact_mb:6.1f} MB"
+    )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, nargs="+", default=[100, 250])
+    parser.add_argument("--bars", type=int, default=1500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    for symbols in args.symbols:
+        run(symbols, args.bars, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
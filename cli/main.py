@@ -26,6 +26,7 @@ from rich.rule import Rule
 
 from tradingagents.graph.trading_graph import TradingAgentsGraph
 from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.dataflows.market_catalogue import UnknownSymbolError, normalize_symbol
 from cli.models import AnalystType
 from cli.utils import *
 
@@ -497,8 +498,13 @@ def get_user_selections():
 
 
 def get_ticker():
-    """Get ticker symbol from user input."""
-    return typer.prompt("", default="SPY")
+    """Get the symbol from user input, re-prompting until it is a listed market."""
+    while True:
+        symbol = typer.prompt("", default="BTC/USDT")
+        try:
+            return normalize_symbol(symbol)
+        except UnknownSymbolError as e:
+            console.print(f"[red]Error: {e}[/red]")
 
 
 def get_analysis_date():
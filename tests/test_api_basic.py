@@ -140,9 +140,23 @@ openai_stub = types.ModuleType("openai")
 openai_stub.OpenAI = DummyOpenAIClient
 sys.modules.setdefault("openai", openai_stub)
 
+import pytest
 from fastapi.testclient import TestClient
 
 from api.main import create_app
+from tradingagents.dataflows.market_catalogue import MarketCatalogue, set_market_catalogue
+
+
+def _perp(base):
+    return {"id": f"{base}USDT", "base": base, "quote": "USDT", "type": "swap", "linear": True, "active": True}
+
+
+@pytest.fixture(autouse=True)
+def pinned_catalogue():
+    # A fresh in-memory catalogue: neither the lifespan nor requests reach the exchange
+    set_market_catalogue(MarketCatalogue.from_ccxt_markets({f"{b}/USDT:USDT": _perp(b) for b in ("BTC", "ETH")}))
+    yield
+    set_market_catalogue(None)
 
 
 class DummyGraph:
@@ -179,3 +193,64 @@ def test_signal_endpoint():
     data = resp.json()
     assert data["decision"] == "LONG"
     assert "Final Decision" in data["summary"]
+
+
+def test_snapshot_endpoint_awaits_async_dataflows(monkeypatch):
+    import api.main as api_main
+
+    async def fake_snapshot(symbol, start_date, end_date, timeframe="15m"):
+        return {
+            "ohlcv": f"# Bybit OHLCV for {symbol}",
+            "orderbook": "# Orderbook",
+            "funding_rate": "# Funding",
+            "open_interest": "# OI",
+        }
+
+    monkeypatch.setattr(api_main, "aget_market_snapshot", fake_snapshot)
+    client = TestClient(create_app(graph_factory=dummy_graph_factory))
+
+    resp = client.get("/snapshot", params={"symbol": "ETH/USDT", "trade_date": "2024-11-01"})
+    assert resp.status_code == 200
+    assert resp.json()["symbol"] == "ETH/USDT:USDT"
+    assert resp.json()["ohlcv"] == "# Bybit OHLCV for ETH/USDT:USDT"
+
+
+def test_signal_normalizes_and_rejects_symbols_before_running_graph(monkeypatch):
+    seen = []
+
+    class RecordingGraph(DummyGraph):
+        def propagate(self, symbol, trade_date, stop_loss_pct=None):
+            seen.append(symbol)
+            return super().propagate(symbol, trade_date, stop_loss_pct)
+
+    def no_network(exchange_id="bybit"):
+        raise AssertionError("requests must validate against the loaded catalogue")
+
+    monkeypatch.setattr("tradingagents.dataflows.ccxt_pool.get_client", no_network)
+    client = TestClient(create_app(graph_factory=lambda config: RecordingGraph()))
+    ok = client.post("/signal", json={"symbol": "btcusdt", "trade_date": "2024-11-01"})
+    exact = client.post("/signal", json={"symbol": "BTC/USDT", "trade_date": "2024-11-01"})
+    bad = client.post("/signal", json={"symbol": "FOO", "trade_date": "2024-11-01"})
+
+    assert ok.status_code == 200 and exact.status_code == 200
+    assert seen == ["BTC/USDT:USDT", "BTC/USDT:USDT"]
+    assert bad.status_code == 400
+    assert "FOO" in bad.json()["detail"]
+
+
+def test_lifespan_starts_and_stops_configured_kline_stream(monkeypatch):
+    import api.main as api_main
+
+    started, stopped = [], []
+
+    class FakeHub:
+        def stop(self):
+            stopped.append(True)
+
+    monkeypatch.setitem(api_main.DEFAULT_CONFIG, "kline_stream_subscriptions", [["BTC/USDT:USDT", "15m"]])
+    monkeypatch.setattr(api_main, "start_kline_stream", lambda subs: started.append(subs))
+    monkeypatch.setattr(api_main, "get_stream_hub", lambda: FakeHub())
+    with TestClient(create_app(graph_factory=dummy_graph_factory)) as client:
+        assert client.get("/health").status_code == 200
+        assert started == [[("BTC/USDT:USDT", "15m")]]
+    assert stopped == [True]
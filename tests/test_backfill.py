@@ -0,0 +1,172 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows import market_catalogue
+from tradingagents.dataflows.backfill import backfill, main, plan_chunks, validate_series
+from tradingagents.dataflows.bar_store import BarStore
+from tradingagents.dataflows.market_catalogue import MarketCatalogue, set_market_catalogue
+from tradingagents.dataflows.rate_limiter import RateLimiter, set_rate_limiter
+
+STEP = 15 * 60_000
+DAY0 = 1704067200000  # 2024-01-01T00:00:00Z
+HOLE = DAY0 + 3 * 86_400_000 + 10 * STEP  # one bar the exchange never returns
+
+
+@pytest.fixture(autouse=True)
+def unlimited_rate_limiter():
+    # Backfills issue many requests; keep them from draining the shared Bybit bucket
+    set_rate_limiter(RateLimiter({}))
+    yield
+    set_rate_limiter(None)
+
+
+@pytest.fixture(autouse=True)
+def isolated_catalogue(monkeypatch, tmp_path):
+    # Listing times come from the catalogue snapshot; keep the user's cache out of it
+    monkeypatch.setattr(market_catalogue, "get_config", lambda: {"data_cache_dir": str(tmp_path / "markets")})
+    set_market_catalogue(None)
+    yield
+    set_market_catalogue(None)
+
+
+def bars_frame(since, n):
+    rows = [[since + i * STEP, 1.0, 2.0, 0.5, 1.5, 10.0] for i in range(n)]
+    return pd.DataFrame(rows, columns=["timestamp", "open", "high", "low", "close", "volume"])
+
+
+class HistoryClient:
+    def __init__(self, fail_after=None):
+        self.calls = []
+        self.fail_after = fail_after
+
+    def fetch_ohlcv(self, symbol, timeframe="15m", since=None, limit=100):
+        if self.fail_after is not None and since >= self.fail_after:
+            raise RuntimeError("connection reset")
+        self.calls.append((symbol, since))
+        return [
+            [since + i * STEP, 1.0, 2.0, 0.5, 1.5, 10.0]
+            for i in range(limit)
+            if since + i * STEP != HOLE
+        ]
+
+
+def test_plan_chunks_cover_range():
+    chunks = plan_chunks(DAY0, DAY0 + 10 * 86_400_000, chunk_days=4)
+    assert [hi - lo for lo, hi in chunks] == [4 * 86_400_000, 4 * 86_400_000, 2 * 86_400_000]
+    assert chunks[0][0] == DAY0 and chunks[-1][1] == DAY0 + 10 * 86_400_000
+
+
+def test_backfill_many_symbols_validates_gaps(tmp_path):
+    store = BarStore(str(tmp_path))
+    reports = backfill(
+        ["BTC/USDT:USDT", "ETH/USDT:USDT"], ["15m"], "2024-01-01", "2024-01-10",
+        client=HistoryClient(), store=store, chunk_days=3, max_workers=4,
+    )
+
+    for symbol in ("BTC/USDT:USDT", "ETH/USDT:USDT"):
+        report = reports[(symbol, "15m")]
+        assert report["expected"] == 10 * 96
+        assert report["bars"] == 10 * 96 - 1
+        assert report["duplicates"] == 0 and report["unordered"] == 0
+        assert report["gaps"] == [(HOLE, 1)]
+        assert store.covered_since(symbol, "15m") == DAY0
+
+
+def test_backfill_resumes_from_checkpoint(tmp_path):
+    store = BarStore(str(tmp_path))
+    checkpoint = str(tmp_path / "ckpt.json")
+    with pytest.raises(RuntimeError):
+        backfill(["BTC/USDT:USDT"], ["15m"], "2024-01-01", "2024-01-08", client=HistoryClient(
+            fail_after=DAY0 + 4 * 86_400_000), store=store, checkpoint_path=checkpoint, chunk_days=2, max_workers=1)
+    assert store.length("BTC/USDT:USDT", "15m") == 4 * 96 - 1
+
+    client = HistoryClient()
+    reports = backfill(["BTC/USDT:USDT"], ["15m"], "2024-01-01", "2024-01-08", client=client,
+                       store=store, checkpoint_path=checkpoint, chunk_days=2, max_workers=2)
+    assert min(since for _, since in client.calls) == DAY0 + 4 * 86_400_000
+    assert reports[("BTC/USDT:USDT", "15m")]["bars"] == 8 * 96 - 1
+
+
+def test_validate_reports_missing_tail(tmp_path):
+    store = BarStore(str(tmp_path))
+    backfill(["BTC/USDT:USDT"], ["15m"], "2024-01-01", "2024-01-01", client=HistoryClient(), store=store)
+    report = validate_series(store, "BTC/USDT:USDT", "15m", DAY0, DAY0 + 2 * 86_400_000)
+    assert report["gaps"] == [(DAY0 + 86_400_000, 96)]
+
+
+def test_cli_strict_exit_code(tmp_path, monkeypatch, capsys):
+    from tradingagents.dataflows import backfill as backfill_module
+
+    monkeypatch.setattr(backfill_module, "_ensure_client", lambda: HistoryClient())
+    monkeypatch.setattr(backfill_module, "get_bar_store", lambda: BarStore(str(tmp_path)))
+    code = main(["--symbols", "BTC/USDT:USDT", "--start", "2024-01-04", "--end", "2024-01-04", "--strict"])
+    assert code == 1
+    assert "BTC/USDT:USDT,15m,95,96,0,0,1,1" in capsys.readouterr().out
+
+
+class ListedClient(HistoryClient):
+    def __init__(self, listed_ms):
+        super().__init__()
+        self.listed_ms = listed_ms
+
+    def fetch_ohlcv(self, symbol, timeframe="15m", since=None, limit=100):
+        return [bar for bar in super().fetch_ohlcv(symbol, timeframe, since, limit) if bar[0] >= self.listed_ms]
+
+
+def test_symbol_listed_after_start_has_no_head_gap(tmp_path):
+    listed = DAY0 + 5 * 86_400_000 + 7 * STEP
+    market = {"id": "NEWUSDT", "base": "NEW", "quote": "USDT", "type": "swap", "linear": True, "created": listed}
+    set_market_catalogue(MarketCatalogue.from_ccxt_markets({"NEW/USDT:USDT": market}))
+    reports = backfill(["NEW/USDT:USDT"], ["15m"], "2024-01-01", "2024-01-07",
+                       client=ListedClient(listed), store=BarStore(str(tmp_path)), chunk_days=2)
+    report = reports[("NEW/USDT:USDT", "15m")]
+    assert report["bars"] == report["expected"] == 2 * 96 - 7
+    assert report["gaps"] == []
+
+
+def test_missing_head_is_reported_without_listing_time(tmp_path):
+    late = DAY0 + 86_400_000
+    reports = backfill(["BTC/USDT:USDT"], ["15m"], "2024-01-01", "2024-01-03",
+                       client=ListedClient(late), store=BarStore(str(tmp_path)))
+    assert reports[("BTC/USDT:USDT", "15m")]["gaps"][0] == (DAY0, 96)
+
+
+def test_backwards_backfill_resumes_without_refetching(tmp_path):
+    store = BarStore(str(tmp_path))
+    recent = DAY0 + 8 * 86_400_000
+    store.append("BTC/USDT:USDT", "15m", bars_frame(recent, 1))
+    checkpoint = str(tmp_path / "ckpt.json")
+
+    with pytest.raises(RuntimeError):
+        backfill(["BTC/USDT:USDT"], ["15m"], "2024-01-01", "2024-01-08", client=HistoryClient(
+            fail_after=DAY0 + 4 * 86_400_000), store=store, checkpoint_path=checkpoint, chunk_days=2, max_workers=1)
+    # Finished chunks are kept on disk and checkpointed although they predate the stored bar
+    assert Path(checkpoint).exists()
+
+    client = HistoryClient()
+    reports = backfill(["BTC/USDT:USDT"], ["15m"], "2024-01-01", "2024-01-08", client=client,
+                       store=store, checkpoint_path=checkpoint, chunk_days=2, max_workers=2)
+    assert min(since for _, since in client.calls) == DAY0 + 4 * 86_400_000
+    assert reports[("BTC/USDT:USDT", "15m")]["bars"] == 8 * 96 - 1
+    assert store.length("BTC/USDT:USDT", "15m") == 8 * 96
+    assert store.last_timestamp("BTC/USDT:USDT", "15m") == recent
+
+
+def test_older_chunks_are_merged_with_one_rewrite(tmp_path, monkeypatch):
+    store = BarStore(str(tmp_path))
+    backfill(["BTC/USDT:USDT"], ["15m"], "2024-01-09", "2024-01-10", client=HistoryClient(), store=store)
+    rewrites = []
+    original = BarStore.rewrite
+    monkeypatch.setattr(BarStore, "rewrite", lambda self, *a: rewrites.append(a[:2]) or original(self, *a))
+
+    reports = backfill(["BTC/USDT:USDT"], ["15m"], "2024-01-01", "2024-01-10", client=HistoryClient(),
+                       store=store, checkpoint_path=str(tmp_path / "older.json"), chunk_days=1, max_workers=2)
+    assert rewrites == [("BTC/USDT:USDT", "15m")]
+    report = reports[("BTC/USDT:USDT", "15m")]
+    assert report["bars"] == 10 * 96 - 1 and report["gaps"] == [(HOLE, 1)]
+    assert report["duplicates"] == 0 and report["unordered"] == 0
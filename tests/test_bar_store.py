@@ -0,0 +1,79 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows.bar_store import BarStore
+from tradingagents.dataflows.ccxt_bybit import get_ohlcv_bybit
+
+STEP = 15 * 60_000
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls = []
+
+    def fetch_ohlcv(self, symbol, timeframe="15m", since=None, limit=100):
+        self.calls.append((since, limit))
+        return [[since + i * STEP, 1, 2, 0.5, 1.5, 10] for i in range(limit)]
+
+
+def bars(start_ms, n):
+    return pd.DataFrame(
+        {
+            "timestamp": [start_ms + i * STEP for i in range(n)],
+            "open": 1.0,
+            "high": 2.0,
+            "low": 0.5,
+            "close": [float(i) for i in range(n)],
+            "volume": 10.0,
+        }
+    )
+
+
+def test_append_is_incremental_and_reads_window(tmp_path):
+    store = BarStore(str(tmp_path))
+    assert store.append("BTC/USDT", "15m", bars(0, 10)) == 10
+    # Overlapping rows are skipped, only newer bars are appended
+    assert store.append("BTC/USDT", "15m", bars(5 * STEP, 10)) == 5
+    assert store.length("BTC/USDT", "15m") == 15
+    assert store.last_timestamp("BTC/USDT", "15m") == 14 * STEP
+
+    window = store.read("BTC/USDT", "15m", since_ms=3 * STEP, until_ms=6 * STEP)
+    assert list(window["timestamp"]) == [3 * STEP, 4 * STEP, 5 * STEP]
+
+
+def test_second_sync_only_fetches_delta(tmp_path):
+    store = BarStore(str(tmp_path))
+    client = CountingClient()
+    first = get_ohlcv_bybit("BTC/USDT", "2024-01-01", "2024-01-02", client=client, store=store)
+    assert "rows=192" in first
+    n_calls = len(client.calls)
+
+    second = get_ohlcv_bybit("BTC/USDT", "2024-01-01", "2024-01-02", client=client, store=store)
+    assert second == first
+    # The whole window is already stored, so nothing is downloaded again
+    assert len(client.calls) == n_calls
+
+
+def test_distant_window_does_not_download_the_gap(tmp_path):
+    store = BarStore(str(tmp_path))
+    client = CountingClient()
+    get_ohlcv_bybit("BTC/USDT", "2024-01-01", "2024-01-01", client=client, store=store)
+    jan = store.coverage("BTC/USDT", "15m")
+
+    client.calls.clear()
+    later = get_ohlcv_bybit("BTC/USDT", "2024-06-01", "2024-06-01", client=client, store=store)
+    assert "rows=96" in later
+    june = 1717200000000  # 2024-06-01T00:00:00Z
+    # Only the requested day is fetched, not five months of bars in between
+    assert client.calls and all(since >= june for since, _ in client.calls)
+    assert store.coverage("BTC/USDT", "15m") == jan + [(june, june + 96 * STEP)]
+
+    # Filling part of the hole later goes in front of the June bars
+    get_ohlcv_bybit("BTC/USDT", "2024-03-01", "2024-03-01", client=client, store=store)
+    assert len(store.coverage("BTC/USDT", "15m")) == 3
+    ts = store.read("BTC/USDT", "15m")["timestamp"]
+    assert ts.is_monotonic_increasing and len(ts) == 3 * 96
@@ -16,10 +16,26 @@ class DummyClient:
             [dt.datetime(2024, 1, 1, 0, 30).timestamp() * 1000, 112, 118, 108, 115, 9],
         ]
 
-    def fetch_ohlcv(self, symbol, timeframe="15m", limit=100):
+    def fetch_ohlcv(self, symbol, timeframe="15m", since=None, limit=100):
         return self.data
 
 
+class PagedClient:
+    """Serves synthetic 15m bars and caps every response like the exchange does."""
+
+    page_cap = 200
+
+    def __init__(self):
+        self.calls = []
+
+    def fetch_ohlcv(self, symbol, timeframe="15m", since=None, limit=100):
+        self.calls.append((since, limit))
+        step = 15 * 60_000
+        n = min(limit, self.page_cap)
+        # Repeat the bar before `since` to exercise de-duplication
+        return [[since + i * step, 1, 2, 0.5, 1.5, 10] for i in range(-1, n)]
+
+
 def test_get_ohlcv_bybit_formats_csv():
     client = DummyClient()
     output = get_ohlcv_bybit("BTC/USDT", "2024-01-01", "2024-01-02", timeframe="15m", client=client)
@@ -28,3 +44,17 @@ def test_get_ohlcv_bybit_formats_csv():
     assert "Bybit OHLCV for BTC/USDT" in output
     assert "datetime,open,high,low,close,volume" in output
     assert "2024-01-01" in output
+
+
+def test_get_ohlcv_bybit_pages_exact_window(monkeypatch):
+    from tradingagents.dataflows import ccxt_bybit
+
+    monkeypatch.setattr(ccxt_bybit, "OHLCV_PAGE_LIMIT", PagedClient.page_cap)
+    client = PagedClient()
+    output = get_ohlcv_bybit("BTC/USDT", "2024-01-01", "2024-01-30", timeframe="15m", client=client)
+
+    # 30 full days of 15m bars, no duplicates, nothing outside the window
+    assert "rows=2880" in output
+    assert len(client.calls) == 15
+    assert "2023-12-31" not in output
+    assert "2024-01-31" not in output
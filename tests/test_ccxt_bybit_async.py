@@ -0,0 +1,59 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows.ccxt_bybit import get_ohlcv_bybit
+from tradingagents.dataflows.ccxt_bybit_async import aget_market_snapshot, aget_ohlcv_bybit
+
+STEP = 15 * 60_000
+
+
+class SyncClient:
+    def fetch_ohlcv(self, symbol, timeframe="15m", since=None, limit=100):
+        return [[since + i * STEP, 1, 2, 0.5, 1.5, 10] for i in range(limit)]
+
+
+class AsyncClient:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _track(self, value):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return value
+
+    async def fetch_ohlcv(self, symbol, timeframe="15m", since=None, limit=100):
+        return await self._track(SyncClient().fetch_ohlcv(symbol, timeframe, since, limit))
+
+    async def fetch_order_book(self, symbol):
+        return await self._track({"bids": [[99.0, 1.0]], "asks": [[101.0, 2.0]]})
+
+    async def fetch_funding_rate(self, symbol):
+        return await self._track({"fundingRate": 0.0001, "timestamp": 1704067200000})
+
+    async def fetch_open_interest_history(self, symbol, timeframe="1h", since=None, limit=30):
+        return await self._track([
+            {"timestamp": since, "openInterestAmount": 100.0},
+            {"timestamp": since + 3_600_000, "openInterestAmount": 110.0},
+        ])
+
+
+def test_async_ohlcv_matches_sync():
+    expected = get_ohlcv_bybit("BTC/USDT", "2024-01-01", "2024-01-02", client=SyncClient())
+    result = asyncio.run(aget_ohlcv_bybit("BTC/USDT", "2024-01-01", "2024-01-02", client=AsyncClient()))
+    assert result == expected
+
+
+def test_market_snapshot_fetches_concurrently():
+    client = AsyncClient()
+    snapshot = asyncio.run(aget_market_snapshot("BTC/USDT", "2024-01-01", "2024-01-01", client=client))
+
+    assert set(snapshot) == {"ohlcv", "orderbook", "funding_rate", "open_interest"}
+    assert "imbalance" in snapshot["orderbook"]
+    assert "change_pct=10.00%" in snapshot["open_interest"]
+    assert client.max_in_flight == 4
@@ -0,0 +1,121 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows import ccxt_pool
+from tradingagents.dataflows.ccxt_pool import ClientPool
+
+
+class DummyExchange:
+    def __init__(self):
+        self.market_loads = []
+
+    def load_markets(self, reload=False):
+        self.market_loads.append(reload)
+        return {}
+
+
+def test_pool_shares_one_client_across_threads():
+    built = []
+
+    def factory(exchange_id):
+        built.append(exchange_id)
+        return DummyExchange()
+
+    pool = ClientPool(factory=factory, markets_ttl=3600)
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(pool.get("bybit"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert built == ["bybit"]
+    assert len({id(c) for c in seen}) == 1
+    assert seen[0].market_loads == [False]
+
+
+def test_pool_refreshes_markets_after_ttl(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(ccxt_pool.time, "monotonic", lambda: clock[0])
+    pool = ClientPool(factory=lambda _: DummyExchange(), markets_ttl=60)
+
+    client = pool.get()
+    clock[0] += 30
+    pool.get()
+    clock[0] += 31
+    pool.get()
+    assert client.market_loads == [False, True]
+
+
+def test_injected_client_is_returned():
+    pool = ClientPool(factory=lambda _: DummyExchange())
+    injected = object()
+    pool.set(injected)
+    assert pool.get() is injected
+
+
+def test_periodic_reload_runs_outside_the_pool_lock(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(ccxt_pool.time, "monotonic", lambda: clock[0])
+    started, release = threading.Event(), threading.Event()
+
+    class SlowReloadExchange(DummyExchange):
+        def load_markets(self, reload=False):
+            super().load_markets(reload)
+            if reload:
+                started.set()
+                release.wait(5)
+            return {}
+
+    pool = ClientPool(factory=lambda _: SlowReloadExchange(), markets_ttl=60)
+    client = pool.get()
+    clock[0] += 61
+    refresher = threading.Thread(target=pool.get)
+    refresher.start()
+    assert started.wait(5)
+
+    # While one caller reloads, others get the client at once and don't reload again
+    assert pool.get() is client
+    release.set()
+    refresher.join()
+    assert client.market_loads == [False, True]
+
+
+class AsyncDummyExchange:
+    def __init__(self):
+        self.market_loads = []
+        self.closed = False
+
+    async def load_markets(self, reload=False):
+        self.market_loads.append(reload)
+        return {}
+
+    async def close(self):
+        self.closed = True
+
+
+def test_async_pool_tracks_market_loads_per_loop_client(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(ccxt_pool.time, "monotonic", lambda: clock[0])
+    pool = ccxt_pool.AsyncClientPool(factory=lambda _: AsyncDummyExchange(), markets_ttl=60)
+
+    async def session():
+        client = await pool.get()
+        assert await pool.get() is client
+        clock[0] += 61
+        await pool.get()
+        await pool.close()
+        return client
+
+    first = asyncio.run(session())
+    second = asyncio.run(session())
+
+    # A new loop gets a new client that loads its own markets, never inheriting a timestamp
+    assert first is not second
+    assert first.market_loads == second.market_loads == [False, True]
+    assert first.closed and second.closed
+    assert len(pool._per_loop) == 0
@@ -0,0 +1,123 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows import ccxt_bybit
+from tradingagents.dataflows.bar_store import BarStore
+from tradingagents.dataflows.derivatives_stats import (
+    VALUE_COLUMNS,
+    funding_stats,
+    horizon_changes,
+    open_interest_stats,
+    records_frame,
+    trailing_zscore,
+)
+
+HOUR = 3_600_000
+NOW = 1704067200000 + 40 * 86_400_000
+
+
+def test_horizon_changes_use_last_point_at_or_before_horizon():
+    ts = np.arange(6) * HOUR
+    values = np.array([100.0, 110.0, 120.0, 90.0, 100.0, 150.0])
+    change, pct = horizon_changes(ts, values, [HOUR, 4 * HOUR])
+
+    assert change[0, -1] == 50.0 and pct[0, -1] == 50.0
+    assert change[1, -1] == 150.0 - 110.0
+    assert np.isnan(change[1, :4]).all()
+
+
+def test_trailing_zscore_matches_numpy():
+    x = np.array([1.0, 2.0, 4.0, 3.0, 10.0])
+    expected = (10.0 - x.mean()) / x.std(ddof=1)
+    assert np.isclose(trailing_zscore(x, 5)[0], expected)
+    assert np.isnan(trailing_zscore(np.array([1.0, 1.0, 1.0]), 3)[0])
+
+
+def test_records_frame_picks_one_value_key_per_batch():
+    keys = ["openInterestAmount", "openInterestValue"]
+    mixed = [
+        {"timestamp": 1, "openInterestAmount": 10.0, "openInterestValue": 400_000.0},
+        {"timestamp": 2, "openInterestAmount": None, "openInterestValue": 410_000.0},
+        {"timestamp": 3, "openInterestAmount": 11.0, "openInterestValue": 420_000.0},
+    ]
+    # Amount is missing once, so the batch uses value throughout rather than mixing units
+    assert records_frame(mixed, keys)["value"].tolist() == [400_000.0, 410_000.0, 420_000.0]
+
+    partial = [{"timestamp": 1, "openInterestAmount": 10.0}, {"timestamp": 2}, {"timestamp": 3, "openInterestAmount": 12.0}]
+    assert records_frame(partial, keys)["timestamp"].tolist() == [1, 3]
+    assert records_frame([], keys).empty
+
+
+def test_stats_shapes():
+    ts = np.arange(48) * HOUR
+    oi = open_interest_stats(ts, np.linspace(100, 147, 48))
+    assert set(oi["horizons"]) == {"1h", "4h", "24h"}
+    assert np.isclose(oi["horizons"]["24h"]["change"], 24.0)
+
+    settled_ts = np.arange(21) * 8 * HOUR
+    stats = funding_stats(settled_ts, np.full(21, 0.0001), ts, np.linspace(0.0001, 0.0003, 48))
+    assert np.isclose(stats["annualized_pct"], 0.0001 * 3 * 365 * 100)
+    assert stats["predicted_trend"]["24h"] > 0
+
+
+class HistoryClient:
+    def __init__(self):
+        self.requests = []
+
+    def _points(self, endpoint, since, step, key, limit):
+        self.requests.append((endpoint, since))
+        first = -(-since // step) * step
+        stamps = [t for t in range(first, NOW + 1, step)][:limit]
+        return [{"timestamp": t, key: 100.0 + (t // step) % 7} for t in stamps]
+
+    def fetch_open_interest_history(self, symbol, timeframe="1h", since=None, limit=None):
+        return self._points("oi", since, HOUR, "openInterestAmount", limit)
+
+    def fetch_funding_rate_history(self, symbol, since=None, limit=None):
+        return self._points("funding", since, 8 * HOUR, "fundingRate", limit)
+
+    def fetch_funding_rate(self, symbol):
+        return {"fundingRate": 0.0002, "timestamp": NOW}
+
+
+def test_history_is_synced_incrementally(tmp_path, monkeypatch):
+    monkeypatch.setattr(ccxt_bybit, "_now_ms", lambda: NOW)
+    store = BarStore(str(tmp_path), columns=VALUE_COLUMNS, kind="derivatives")
+    client = HistoryClient()
+
+    first = ccxt_bybit.get_open_interest_change("BTC/USDT", client=client, store=store)
+    pages = len(client.requests)
+    assert pages == 4  # 30 days of hourly points at 200 per page
+    assert "horizon,change,change_pct,zscore" in first and "\n24h," in first
+
+    client.requests.clear()
+    again = ccxt_bybit.get_open_interest_change("BTC/USDT", client=client, store=store)
+    assert client.requests == [("oi", NOW + 1)]
+    assert again == first
+
+    funding = ccxt_bybit.get_funding_rate("BTC/USDT", client=client, store=store)
+    assert funding.startswith("# Funding rate for BTC/USDT: 0.0002")
+    assert "# Funding history: settled=91" in funding
+    assert "# Predicted funding trend: predicted=0.0002" in funding
+
+
+def test_stored_open_interest_keeps_its_units(tmp_path, monkeypatch):
+    store = BarStore(str(tmp_path), columns=VALUE_COLUMNS, kind="derivatives")
+    clock = [NOW]
+    monkeypatch.setattr(ccxt_bybit, "_now_ms", lambda: clock[0])
+    client = HistoryClient()
+    ts, _ = ccxt_bybit.sync_open_interest_history(client, "BTC/USDT", "1h", store)
+    assert store.meta("BTC/USDT", "open_interest_1h")["value_key"] == "openInterestAmount"
+
+    class QuoteOnlyClient:
+        def fetch_open_interest_history(self, symbol, timeframe="1h", since=None, limit=None):
+            return [{"timestamp": NOW + HOUR, "openInterestAmount": None, "openInterestValue": 5e9}]
+
+    clock[0] = NOW + HOUR
+    # A page without the series' key is dropped rather than appended in quote units
+    later_ts, later = ccxt_bybit.sync_open_interest_history(QuoteOnlyClient(), "BTC/USDT", "1h", store)
+    assert later_ts[-1] == ts[-1] and later.max() < 200
@@ -0,0 +1,118 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows import interface
+from tradingagents.dataflows.indicator_cache import IndicatorCache, indicator_key
+
+
+def bars(rows=120, last_close=None):
+    close = [100 + i * 0.1 for i in range(rows)]
+    if last_close is not None:
+        close[-1] = last_close
+    ts = [1704067200000 + i * 900_000 for i in range(rows)]
+    return pd.DataFrame(
+        {
+            "timestamp": ts,
+            "open": close,
+            "high": [c + 1 for c in close],
+            "low": [c - 1 for c in close],
+            "close": close,
+            "volume": [10.0] * rows,
+            "datetime": pd.to_datetime(ts, unit="ms"),
+        }
+    )
+
+
+def test_lru_evicts_least_recently_used():
+    cache = IndicatorCache(max_entries=2)
+    keys = [indicator_key("BTC/USDT", "15m", ts, 1.0, {"tail": 5}) for ts in (1, 2, 3)]
+    cache.set(keys[0], "a")
+    cache.set(keys[1], "b")
+    assert cache.get(keys[0]) == (True, "a")
+    cache.set(keys[2], "c")
+
+    assert cache.get(keys[1]) == (False, None)
+    assert cache.get(keys[0]) == (True, "a")
+    assert cache.stats()["entries"] == 2
+
+
+def test_persisted_entries_are_shared_between_caches(tmp_path):
+    key = indicator_key("ETH/USDT", "1h", 1704067200000, 2300.5, {"bundle": "default", "tail": 5})
+    IndicatorCache(persist_dir=str(tmp_path)).set(key, "# Indicators summary")
+
+    other = IndicatorCache(persist_dir=str(tmp_path))
+    assert other.get(key) == (True, "# Indicators summary")
+    assert other.stats()["disk_hits"] == 1
+    other_params = indicator_key("ETH/USDT", "1h", 1704067200000, 2300.5, {"bundle": "default", "tail": 10})
+    assert other.get(other_params) == (False, None)
+
+
+def test_indicator_tool_reuses_result_until_bars_change(monkeypatch):
+    frames = [bars(), bars(), bars(last_close=150.0)]
+    computed = []
+    real_compute = interface.compute_indicators
+
+    def counting_compute(df, columns=None):
+        computed.append(len(df))
+        return real_compute(df, columns)
+
+    monkeypatch.setattr(interface, "load_ohlcv_window", lambda *a, **k: frames.pop(0))
+    monkeypatch.setattr(interface, "compute_indicators", counting_compute)
+    cache = IndicatorCache()
+    monkeypatch.setattr(interface, "get_indicator_cache", lambda: cache)
+
+    first = interface._ccxt_indicators("BTC/USDT", "all", "2024-01-02", 30)
+    # A different look-back that yields the same bars is served from the cache
+    second = interface._ccxt_indicators("BTC/USDT", "all", "2024-01-02", 7)
+    # The forming bar ticked: same timestamp, new close, so recompute
+    third = interface._ccxt_indicators("BTC/USDT", "all", "2024-01-02", 7)
+
+    assert first == second != third
+    assert computed == [120, 120]
+    assert cache.stats()["hits"] == 1
+
+
+def test_forming_bar_results_stay_in_memory(tmp_path, monkeypatch):
+    cache = IndicatorCache(persist_dir=str(tmp_path))
+    monkeypatch.setattr(interface, "get_indicator_cache", lambda: cache)
+    closed = bars()
+    forming = closed.copy()
+    # Shift the bars so the last one opened a minute ago and is still forming
+    forming["timestamp"] += int(interface.time.time() * 1000) - 60_000 - int(closed["timestamp"].iloc[-1])
+
+    interface._cached_indicator_text("BTC/USDT", "15m", closed, {"tail": 5}, lambda: "closed")
+    interface._cached_indicator_text("BTC/USDT", "15m", forming, {"tail": 5}, lambda: "forming")
+
+    assert len(list(tmp_path.glob("*.json"))) == 1
+    assert cache.stats()["entries"] == 2
+
+
+def test_process_wide_cache_is_per_exchange(tmp_path, monkeypatch):
+    from tradingagents.dataflows import indicator_cache
+
+    monkeypatch.setattr(
+        indicator_cache, "get_config", lambda: {"data_cache_dir": str(tmp_path), "indicator_cache_persist": True}
+    )
+    indicator_cache.reset_indicator_cache()
+    try:
+        bybit, okx = indicator_cache.get_indicator_cache("bybit"), indicator_cache.get_indicator_cache("okx")
+        assert bybit is indicator_cache.get_indicator_cache() and bybit is not okx
+        assert okx.persist_dir == tmp_path / "indicators" / "okx"
+    finally:
+        indicator_cache.reset_indicator_cache()
+
+
+def test_forming_bar_volume_tick_misses_the_cache(monkeypatch):
+    cache = IndicatorCache()
+    monkeypatch.setattr(interface, "get_indicator_cache", lambda: cache)
+    first = bars()
+    ticked = first.copy()
+    ticked.loc[ticked.index[-1], ["high", "volume"]] = [200.0, 25.0]  # same close
+
+    assert interface._cached_indicator_text("BTC/USDT", "15m", first, {"tail": 5}, lambda: "first") == "first"
+    assert interface._cached_indicator_text("BTC/USDT", "15m", ticked, {"tail": 5}, lambda: "ticked") == "ticked"
+    assert interface._cached_indicator_text("BTC/USDT", "15m", first.copy(), {"tail": 5}, lambda: "x") == "first"
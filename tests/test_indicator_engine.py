@@ -0,0 +1,87 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows.crypto_indicators import compute_indicators
+from tradingagents.dataflows.indicator_engine import INDICATOR_COLUMNS, IndicatorEngine, IndicatorState
+from tradingagents.dataflows.kline_stream import KlineStreamHub
+
+
+def random_bars(rows=400, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 30000 + np.cumsum(rng.normal(0, 25, rows))
+    close[50:60] = close[49]  # flat stretch: zero losses and zero variance
+    return pd.DataFrame(
+        {
+            "timestamp": np.arange(rows, dtype=np.int64) * 60_000,
+            "open": close,
+            "high": close + 5,
+            "low": close - 5,
+            "close": close,
+            "volume": rng.uniform(1, 10, rows),
+        }
+    )
+
+
+def assert_matches(rows, expected):
+    got = pd.DataFrame(rows, columns=INDICATOR_COLUMNS).astype(float)
+    want = expected[INDICATOR_COLUMNS].astype(float).reset_index(drop=True)
+    for col in INDICATOR_COLUMNS:
+        np.testing.assert_allclose(got[col], want[col], rtol=1e-9, atol=1e-8, equal_nan=True, err_msg=col)
+
+
+def test_streamed_values_match_compute_indicators():
+    df = random_bars()
+    state = IndicatorState()
+    rows = [state.update(ts, c) for ts, c in zip(df["timestamp"], df["close"])]
+    assert_matches(rows, compute_indicators(df))
+
+
+def test_forming_bar_revisions_replace_the_newest_bar():
+    df = random_bars(200)
+    state = IndicatorState()
+    rows = []
+    for ts, c in zip(df["timestamp"], df["close"]):
+        state.update(ts, c + 40)  # early tick of the forming bar
+        state.update(ts, c - 15)
+        rows.append(state.update(ts, c))
+    assert_matches(rows, compute_indicators(df))
+    with pytest.raises(ValueError):
+        state.update(int(df["timestamp"].iloc[0]), 1.0)
+
+
+def test_saved_state_resumes_without_recompute(tmp_path):
+    df = random_bars(300)
+    head, tail = df.iloc[:180], df.iloc[180:]
+    engine = IndicatorEngine()
+    engine.seed("BTC/USDT:USDT", "1m", head)
+    engine.update("BTC/USDT:USDT", "1m", int(tail["timestamp"].iloc[0]), 1.0)  # forming bar
+    path = tmp_path / "indicator_state.json"
+    engine.save(str(path))
+    json.loads(path.read_text())
+
+    resumed = IndicatorEngine.load(str(path))
+    rows = [resumed.update("BTC/USDT:USDT", "1m", ts, c) for ts, c in zip(tail["timestamp"], tail["close"])]
+    assert_matches(rows, compute_indicators(df).iloc[180:])
+    assert resumed.latest("BTC/USDT:USDT", "1m")["timestamp"] == int(df["timestamp"].iloc[-1])
+    assert IndicatorEngine.load(str(tmp_path / "missing.json")).latest("BTC/USDT:USDT", "1m") is None
+
+
+def test_engine_follows_kline_hub_listener():
+    df = random_bars(120)
+    hub, engine = KlineStreamHub(capacity=500), IndicatorEngine()
+    hub.add_listener(engine.on_bar)
+    for bar in df[["timestamp", "open", "high", "low", "close", "volume"]].itertuples(index=False, name=None):
+        hub.on_bar("ETH/USDT:USDT", "1m", list(bar))
+
+    latest = engine.latest("ETH/USDT:USDT", "1m")
+    expected = compute_indicators(df).iloc[-1]
+    assert latest["close"] == df["close"].iloc[-1]
+    assert latest["sma_99"] == pytest.approx(expected["sma_99"])
+    assert latest["macd_hist"] == pytest.approx(expected["macd_hist"])
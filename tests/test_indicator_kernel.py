@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows.crypto_indicators import compute_indicators
+from tradingagents.dataflows.indicator_engine import INDICATOR_COLUMNS
+from tradingagents.dataflows.indicator_kernel import batch_indicators, latest_indicators, stack_closes
+
+
+def random_frames(count=12, seed=3):
+    rng = np.random.default_rng(seed)
+    frames = {}
+    for i in range(count):
+        rows = int(rng.integers(40, 400))
+        close = 100 * (i + 1) + np.cumsum(rng.normal(0, 0.5 * (i + 1), rows))
+        close[5:25] = close[4]  # flat stretch: zero-loss RSI windows and zero variance
+        frames[f"SYM{i}/USDT:USDT"] = pd.DataFrame({"close": close, "volume": rng.uniform(1, 5, rows)})
+    return frames
+
+
+def as_float(series):
+    return series.astype("Float64").to_numpy("float64", na_value=np.nan)
+
+
+def test_batch_matches_per_symbol_compute_indicators():
+    frames = random_frames()
+    symbols, close = stack_closes(frames)
+    result = batch_indicators(close)
+
+    for i, symbol in enumerate(symbols):
+        expected = compute_indicators(frames[symbol])
+        rows = len(expected)
+        for col in INDICATOR_COLUMNS:
+            np.testing.assert_allclose(
+                result[col][i, -rows:], as_float(expected[col]), rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=col
+            )
+            assert np.isnan(result[col][i, :-rows]).all()
+
+
+def test_single_series_and_latest_rows():
+    frames = random_frames(3)
+    symbol = next(iter(frames))
+    single = batch_indicators(frames[symbol]["close"].to_numpy())
+    assert single["macd"].shape == (len(frames[symbol]),)
+
+    latest = latest_indicators(frames)
+    assert list(latest.index) == list(frames)
+    expected = compute_indicators(frames[symbol]).iloc[-1]
+    assert np.isclose(latest.loc[symbol, "sma_25"], expected["sma_25"])
+    assert np.isclose(latest.loc[symbol, "macd_signal"], expected["macd_signal"])
+
+
+def test_stack_closes_truncates_to_requested_bars():
+    symbols, close = stack_closes({"A": pd.DataFrame({"close": [1.0, 2.0, 3.0]}), "B": pd.DataFrame({"close": [4.0]})}, bars=2)
+    assert symbols == ["A", "B"]
+    np.testing.assert_array_equal(close, [[2.0, 3.0], [np.nan, 4.0]])
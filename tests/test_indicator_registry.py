@@ -0,0 +1,149 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows import indicator_registry
+from tradingagents.dataflows.crypto_indicators import compute_indicators
+from tradingagents.dataflows.indicator_registry import LazyIndicators, plan, required_inputs
+
+
+def random_ohlcv(rows=500, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 2000 + np.cumsum(rng.normal(0, 4, rows))
+    close[100:118] = close[99]
+    ts = 1704067200000 + np.arange(rows, dtype=np.int64) * 900_000
+    return pd.DataFrame(
+        {
+            "timestamp": ts,
+            "datetime": pd.to_datetime(ts, unit="ms"),
+            "open": close + rng.normal(0, 1, rows),
+            "high": close + rng.uniform(0.5, 3, rows),
+            "low": close - rng.uniform(0.5, 3, rows),
+            "close": close,
+            "volume": rng.uniform(1, 50, rows),
+        }
+    )
+
+
+def reference_indicators(df):
+    """Plain pandas definitions of every registered column."""
+    close = df["close"]
+    out = pd.DataFrame(index=df.index)
+    for n in (7, 25, 99):
+        out[f"sma_{n}"] = close.rolling(n, min_periods=n).mean()
+    delta = close.diff()
+    gain = delta.clip(lower=0).rolling(14, min_periods=14).mean()
+    loss = (-delta.clip(upper=0)).rolling(14, min_periods=14).mean()
+    out["rsi_14"] = (100 - 100 / (1 + gain / loss.where(loss != 0))).astype(float)
+    mid, std = close.rolling(20, min_periods=20).mean(), close.rolling(20, min_periods=20).std()
+    out["bb_mid_20"], out["bb_upper_20_2"], out["bb_lower_20_2"] = mid, mid + 2 * std, mid - 2 * std
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    out["macd"], out["macd_signal"] = macd, macd.ewm(span=9, adjust=False).mean()
+    out["macd_hist"] = out["macd"] - out["macd_signal"]
+
+    prev = close.shift()
+    tr = pd.concat([df["high"] - df["low"], (df["high"] - prev).abs(), (df["low"] - prev).abs()], axis=1).max(axis=1)
+    out["atr_14"] = tr.ewm(alpha=1 / 14, adjust=False).mean()
+    typical = (df["high"] + df["low"] + close) / 3
+    day = df["timestamp"] // 86_400_000
+    out["vwap"] = (typical * df["volume"]).groupby(day).cumsum() / df["volume"].groupby(day).cumsum()
+    out["obv"] = (np.sign(delta).fillna(0) * df["volume"]).cumsum()
+    out["obv_delta_20"] = out["obv"].diff(20)
+    return out
+
+
+def test_registry_matches_pandas_definitions():
+    df = random_ohlcv()
+    columns = indicator_registry.INDICATOR_COLUMNS + indicator_registry.EXTRA_COLUMNS + ["obv"]
+    out = compute_indicators(df, columns)
+    expected = reference_indicators(df)
+    for col in columns:
+        np.testing.assert_allclose(out[col], expected[col], rtol=1e-9, atol=1e-8, equal_nan=True, err_msg=col)
+
+
+def test_only_requested_columns_and_their_intermediates_are_computed():
+    df = random_ohlcv(200)
+    lazy = LazyIndicators({"close": df["close"].to_numpy()[None, :]})
+    lazy["rsi_14"]
+    assert set(lazy.computed()) == {"_delta", "_losses", "rsi_14"}
+
+    out = compute_indicators(df[["datetime", "close"]], ["rsi_14"])
+    assert list(out.columns) == ["datetime", "close", "rsi_14"]
+    assert required_inputs(["rsi_14", "sma_7"]) == {"close"}
+    assert required_inputs(["atr_14"]) == {"high", "low", "close"}
+
+
+def test_shared_intermediates_are_planned_once():
+    order = plan(["sma_7", "sma_99", "bb_upper_20_2", "bb_mid_20", "macd_hist"])
+    assert order.count("_close_sums") == 1
+    assert order.count("sma_20") == 1
+    assert order.index("_close_sums") < order.index("sma_7")
+    assert order.index("macd") < order.index("macd_signal") < order.index("macd_hist")
+    with pytest.raises(KeyError):
+        plan(["supertrend"])
+
+
+def test_missing_base_input_is_reported():
+    lazy = LazyIndicators({"close": np.ones((1, 30))})
+    with pytest.raises(KeyError, match="high"):
+        lazy["atr_14"]
+
+
+def test_default_bundle_unchanged_and_timestamp_derived_from_datetime():
+    df = random_ohlcv(150).drop(columns=["timestamp"])
+    out = compute_indicators(df)
+    assert "atr_14" not in out.columns and "rsi_14" in out.columns
+    vwap = compute_indicators(df, ["vwap"])["vwap"]
+    assert vwap.notna().all()
+
+
+def test_warmup_chains_through_the_graph():
+    from tradingagents.dataflows.indicator_registry import ema_warmup, warmup_bars
+
+    assert warmup_bars(["sma_99"]) == 98
+    assert warmup_bars(["rsi_14"]) == 14
+    assert warmup_bars(["bb_upper_20_2"]) == 19
+    assert warmup_bars(["macd_signal"]) == ema_warmup(2 / 27) + ema_warmup(2 / 10)
+    assert warmup_bars(["vwap"], "15m") == 95 and warmup_bars(["vwap"], "1d") == 0
+
+
+def test_bounded_history_converges_to_full_history():
+    from tradingagents.dataflows.interface import SUMMARY_COLUMNS
+    from tradingagents.dataflows.indicator_registry import warmup_bars
+
+    df = random_ohlcv(2900)
+    bars = warmup_bars(SUMMARY_COLUMNS, "15m") + 5
+    assert len(df) / bars > 10
+    full = compute_indicators(df, SUMMARY_COLUMNS).tail(5)
+    bounded = compute_indicators(df.tail(bars).reset_index(drop=True), SUMMARY_COLUMNS).tail(5)
+    for col in SUMMARY_COLUMNS:
+        np.testing.assert_allclose(bounded[col], full[col], rtol=0, atol=1e-3, err_msg=col)
+
+
+def test_indicator_tool_requests_only_the_warmup_window(monkeypatch):
+    from tradingagents.dataflows import interface
+    from tradingagents.dataflows.indicator_cache import IndicatorCache
+    from tradingagents.dataflows.indicator_registry import warmup_bars
+
+    requested = []
+
+    def fake_window(symbol, since_ms, until_ms, timeframe="15m"):
+        requested.append((since_ms, until_ms))
+        df = random_ohlcv(3000)
+        return df[(df["timestamp"] >= since_ms) & (df["timestamp"] < until_ms)].reset_index(drop=True)
+
+    monkeypatch.setattr(interface, "load_ohlcv_window", fake_window)
+    monkeypatch.setattr(interface, "get_indicator_cache", lambda: IndicatorCache())
+    text = interface._ccxt_indicators("BTC/USDT", "all", "2024-01-20", 30)
+
+    since_ms, until_ms = requested[0]
+    assert until_ms == 1705795200000  # end of 2024-01-20 UTC
+    # The window also covers the swing/S-R look-back when that is longer
+    expected = max(warmup_bars(interface.SUMMARY_COLUMNS, "15m") + 5, interface._levels_lookback())
+    assert (until_ms - since_ms) // 900_000 == expected
+    assert "Indicators summary" in text and "obv_delta20=" in text and "# Levels" in text
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import sys
+import types
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows import ccxt_bybit, kline_stream
+from tradingagents.dataflows.kline_stream import BarRingBuffer, CcxtProKlineFeed, KlineStreamHub, ReplayKlineFeed
+
+STEP = 15 * 60_000
+DAY0 = 1704067200000  # 2024-01-01T00:00:00Z
+
+
+class OfflineClient:
+    def fetch_ohlcv(self, *args, **kwargs):
+        raise AssertionError("network must not be used when the stream covers the window")
+
+
+def test_ring_buffer_upserts_forming_bar_and_wraps():
+    buf = BarRingBuffer(capacity=3)
+    buf.update([0, 1, 1, 1, 1, 1])
+    buf.update([STEP, 2, 2, 2, 2, 1])
+    buf.update([STEP, 2, 3, 2, 3, 5])  # forming bar ticks
+    buf.update([0, 9, 9, 9, 9, 9])  # stale update ignored
+    buf.extend([[2 * STEP, 3, 3, 3, 3, 1], [3 * STEP, 4, 4, 4, 4, 1]])
+
+    assert len(buf) == 3
+    assert buf.bounds() == (STEP, 3 * STEP)
+    df = buf.window(0, 10 * STEP)
+    assert df["timestamp"].tolist() == [STEP, 2 * STEP, 3 * STEP]
+    assert df.loc[0, "close"] == 3 and df.loc[0, "volume"] == 5
+
+
+def test_hub_covers_only_up_to_current_bar():
+    hub = KlineStreamHub()
+    hub.seed("BTC/USDT", "15m", ccxt_bybit._stitch_pages(
+        [[[DAY0 + i * STEP, 1, 2, 0.5, 1.5, 10] for i in range(10)]], DAY0, DAY0 + 10 * STEP))
+    now = DAY0 + 9 * STEP + 1000
+    assert hub.covers("BTC/USDT", "15m", DAY0, DAY0 + 96 * STEP, now)
+    # One bar later the feed has not delivered the new bar: stale, not covered
+    assert not hub.covers("BTC/USDT", "15m", DAY0, DAY0 + 96 * STEP, now + STEP)
+    assert not hub.covers("BTC/USDT", "15m", DAY0 - STEP, DAY0 + 96 * STEP, now)
+    assert not hub.covers("ETH/USDT", "15m", DAY0, DAY0 + 96 * STEP, now)
+
+
+def test_get_ohlcv_reads_replayed_stream_without_network(tmp_path, monkeypatch):
+    path = tmp_path / "klines.jsonl"
+    with open(path, "w", encoding="utf-8") as fh:
+        for i in range(96):
+            fh.write(json.dumps({"symbol": "BTC/USDT", "timeframe": "15m",
+                                 "bar": [DAY0 + i * STEP, 1.0, 2.0, 0.5, 1.5 + i, 10.0]}) + "\n")
+        # Forming bar update for the last slot
+        fh.write(json.dumps({"symbol": "BTC/USDT", "timeframe": "15m",
+                             "bar": [DAY0 + 95 * STEP, 1.0, 3.0, 0.5, 2.5, 12.0]}) + "\n")
+
+    kline_stream.reset_stream_hub()
+    monkeypatch.setattr(ccxt_bybit, "_now_ms", lambda: DAY0 + 95 * STEP + 60_000)
+    monkeypatch.setattr(ccxt_bybit, "_ensure_client", OfflineClient)
+    monkeypatch.setattr(ccxt_bybit, "get_bar_store", lambda: None)
+    try:
+        kline_stream.get_stream_hub().attach(ReplayKlineFeed(str(path)))
+        out = ccxt_bybit.get_ohlcv_bybit("BTC/USDT", "2024-01-01", "2024-01-01")
+        # An injected client is always asked, even when the stream covers the window
+        injected = SeedClient()
+        ccxt_bybit.get_ohlcv_bybit("BTC/USDT", "2024-01-01", "2024-01-01", client=injected)
+    finally:
+        kline_stream.reset_stream_hub()
+
+    assert "rows=96" in out
+    assert out.strip().splitlines()[-1].split(",")[4:6] == ["2.5", "12.0"]
+    assert injected.calls > 0
+
+
+class SeedClient:
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_ohlcv(self, symbol, timeframe="15m", since=None, limit=1000):
+        self.calls += 1
+        return [[since + i * STEP, 1.0, 2.0, 0.5, 1.5, 10.0] for i in range(limit)]
+
+
+def test_start_kline_stream_seeds_from_store_then_attaches_feed(tmp_path, monkeypatch):
+    from tradingagents.dataflows.bar_store import BarStore
+
+    now = DAY0 + 200 * STEP + 60_000
+    path = tmp_path / "klines.jsonl"
+    path.write_text(json.dumps({"symbol": "BTC/USDT", "timeframe": "15m",
+                                "bar": [DAY0 + 200 * STEP, 1.0, 9.0, 0.5, 8.0, 3.0]}) + "\n")
+    store = BarStore(str(tmp_path))
+    monkeypatch.setattr(ccxt_bybit, "_now_ms", lambda: now)
+    monkeypatch.setattr(kline_stream, "get_config", lambda: {"kline_buffer_capacity": 100})
+    kline_stream.reset_stream_hub()
+    try:
+        hub = ccxt_bybit.start_kline_stream(
+            [("BTC/USDT", "15m")], feed=ReplayKlineFeed(str(path)), client=SeedClient(), store=store
+        )
+        assert len(hub.buffer("BTC/USDT", "15m")) == 100
+        assert store.last_timestamp("BTC/USDT", "15m") == DAY0 + 199 * STEP  # closed bars persisted
+        assert hub.covers("BTC/USDT", "15m", DAY0 + 150 * STEP, DAY0 + 300 * STEP, now)
+        assert hub.window("BTC/USDT", "15m", DAY0 + 200 * STEP, now)["close"].tolist() == [8.0]
+    finally:
+        kline_stream.reset_stream_hub()
+
+
+def test_hub_rejects_window_with_gap_after_reconnect():
+    hub = KlineStreamHub()
+    bars = [[DAY0 + i * STEP, 1, 2, 0.5, 1.5, 10] for i in range(10) if i not in (4, 5)]
+    hub.buffer("BTC/USDT", "15m").extend(bars)
+    now = DAY0 + 9 * STEP + 1000
+    # Both ends are buffered but bars 4 and 5 were missed
+    assert not hub.covers("BTC/USDT", "15m", DAY0, DAY0 + 96 * STEP, now)
+    assert hub.covers("BTC/USDT", "15m", DAY0 + 6 * STEP, DAY0 + 96 * STEP, now)
+
+
+def test_ccxt_pro_feed_stop_cancels_blocked_watchers(monkeypatch):
+    closed = []
+
+    class BlockingExchange:
+        def __init__(self, config):
+            pass
+
+        async def watch_ohlcv(self, symbol, timeframe):
+            await asyncio.Event().wait()  # no bar ever arrives
+
+        async def close(self):
+            closed.append(True)
+
+    pro = types.ModuleType("ccxt.pro")
+    pro.bybit = BlockingExchange
+    ccxt = types.ModuleType("ccxt")
+    ccxt.pro = pro
+    monkeypatch.setitem(sys.modules, "ccxt", ccxt)
+    monkeypatch.setitem(sys.modules, "ccxt.pro", pro)
+
+    feed = CcxtProKlineFeed([("BTC/USDT", "15m"), ("ETH/USDT", "1h")])
+    feed.start(lambda *args: None)
+    feed.stop()
+
+    assert not feed._thread.is_alive()
+    assert closed == [True]
@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows import interface
+from tradingagents.dataflows.market_cache import MarketDataCache, next_bar_close
+
+
+def test_next_bar_close_aligns_to_timeframe():
+    # 2024-01-01 00:07:30 UTC -> 15m bar closes at 00:15, 1h bar at 01:00
+    now = 1704067200 + 450
+    assert next_bar_close("15m", now) == 1704067200 + 900
+    assert next_bar_close("1h", now) == 1704067200 + 3600
+
+
+def test_ohlcv_entries_expire_at_bar_close():
+    clock = [1704067200.0 + 450]
+    cache = MarketDataCache(clock=lambda: clock[0])
+
+    def impl(symbol, start_date, end_date, timeframe="15m", client=None):
+        pass
+
+    expires_at = cache.expiry_for("get_stock_data", impl, ("BTC/USDT", "2024-01-01", "2024-01-01"), {})
+    cache.set("k", "# Bybit OHLCV ...", expires_at)
+
+    clock[0] += 449
+    assert cache.get("get_stock_data", "k") == (True, "# Bybit OHLCV ...")
+    clock[0] += 1
+    assert cache.get("get_stock_data", "k") == (False, None)
+    assert cache.stats()["get_stock_data"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_error_results_are_not_cached():
+    cache = MarketDataCache()
+    cache.set("k", "# Funding rate unavailable for BTC/USDT: timeout", expires_at=1e12)
+    assert cache.get("get_funding_rate", "k") == (False, None)
+
+
+def test_route_serves_repeat_calls_from_cache(monkeypatch):
+    calls = []
+
+    def oi(symbol, timeframe="1h", client=None):
+        calls.append(symbol)
+        return f"# Open interest change for {symbol} ({timeframe}):"
+
+    cache = MarketDataCache()
+    monkeypatch.setattr(interface, "get_market_cache", lambda: cache)
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_open_interest_change", {"ccxt": oi})
+
+    for _ in range(3):
+        interface.route_to_vendor("get_open_interest_change", "BTC/USDT")
+
+    assert calls == ["BTC/USDT"]
+    assert cache.stats()["get_open_interest_change"]["hits"] == 2
@@ -0,0 +1,145 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows import market_catalogue
+from tradingagents.dataflows.ccxt_pool import ClientPool
+from tradingagents.dataflows.market_catalogue import (
+    MarketCatalogue,
+    UnknownSymbolError,
+    normalize_symbol,
+    set_market_catalogue,
+)
+
+
+def _market(symbol, id, type, base, quote, settle=None, active=True):
+    return {
+        "symbol": symbol,
+        "id": id,
+        "base": base,
+        "quote": quote,
+        "settle": settle,
+        "type": type,
+        "linear": True if type == "swap" else None,
+        "active": active,
+        "contractSize": 1.0 if type == "swap" else None,
+        "precision": {"price": 0.1, "amount": 0.001},
+        "limits": {"amount": {"min": 0.001}},
+        "info": {"raw": "payload"},
+    }
+
+
+MARKETS = {
+    "BTC/USDT": _market("BTC/USDT", "BTCUSDT", "spot", "BTC", "USDT"),
+    "BTC/USDT:USDT": _market("BTC/USDT:USDT", "BTCUSDT", "swap", "BTC", "USDT", "USDT"),
+    "ETH/USDT:USDT": _market("ETH/USDT:USDT", "ETHUSDT", "swap", "ETH", "USDT", "USDT"),
+    "LUNA/USDT:USDT": _market("LUNA/USDT:USDT", "LUNAUSDT", "swap", "LUNA", "USDT", "USDT", active=False),
+}
+
+
+@pytest.fixture(autouse=True)
+def isolated_catalogue(monkeypatch, tmp_path):
+    monkeypatch.setattr(market_catalogue, "get_config", lambda: {"data_cache_dir": str(tmp_path)})
+    set_market_catalogue(None)
+    yield
+    set_market_catalogue(None)
+
+
+def test_normalize_maps_every_spelling_to_one_canonical_market():
+    cat = MarketCatalogue.from_ccxt_markets(MARKETS)
+
+    # The listed spot symbol resolves like its aliases, to the linear perp
+    assert cat.normalize("BTC/USDT") == "BTC/USDT:USDT"
+    assert cat.normalize("btcusdt") == "BTC/USDT:USDT"
+    assert cat.normalize("BTC/USDT:USDT") == "BTC/USDT:USDT"
+    assert cat.normalize(" eth-usdt ") == "ETH/USDT:USDT"
+    assert cat.info("ETHUSDT")["tick_size"] == 0.1
+
+
+def test_unknown_and_inactive_symbols_raise_with_suggestions():
+    cat = MarketCatalogue.from_ccxt_markets(MARKETS)
+
+    with pytest.raises(UnknownSymbolError) as exc:
+        cat.normalize("ETH/USDT:USD")
+    assert "ETH/USDT:USDT" in exc.value.suggestions
+    with pytest.raises(UnknownSymbolError):
+        cat.normalize("LUNAUSDT")
+
+
+def test_snapshot_round_trips_and_drops_raw_info(tmp_path):
+    cat = MarketCatalogue.from_ccxt_markets(MARKETS, fetched_at=123.0)
+    path = tmp_path / "markets" / "bybit.json"
+    cat.save(str(path))
+
+    loaded = MarketCatalogue.load(str(path))
+    assert loaded.fetched_at == 123.0
+    assert loaded.markets == cat.markets
+    assert "info" not in loaded.raw_markets["BTC/USDT:USDT"]
+    assert loaded.normalize("BTCUSDT") == "BTC/USDT:USDT"
+    assert MarketCatalogue.load(str(tmp_path / "missing.json")) is None
+
+
+def test_normalize_symbol_uses_disk_snapshot_without_network(monkeypatch):
+    market_catalogue.save_market_catalogue(MARKETS)
+    set_market_catalogue(None)
+
+    def no_network(exchange_id="bybit"):
+        raise AssertionError("catalogue should come from disk")
+
+    monkeypatch.setattr("tradingagents.dataflows.ccxt_pool.get_client", no_network)
+    assert normalize_symbol("ethusdt") == "ETH/USDT:USDT"
+
+
+def test_normalize_symbol_without_refresh_keeps_expired_snapshot(monkeypatch):
+    set_market_catalogue(MarketCatalogue.from_ccxt_markets(MARKETS, fetched_at=time.time() - 10 * 86400))
+
+    def no_network(exchange_id="bybit"):
+        raise AssertionError("request-time validation must not refresh")
+
+    monkeypatch.setattr("tradingagents.dataflows.ccxt_pool.get_client", no_network)
+    assert normalize_symbol("BTC/USDT", refresh=False) == "BTC/USDT:USDT"
+
+
+def test_pool_seeds_new_clients_from_fresh_snapshot():
+    market_catalogue.save_market_catalogue(MARKETS)
+
+    class SeedableExchange:
+        def __init__(self):
+            self.market_loads = []
+            self.seeded = None
+
+        def load_markets(self, reload=False):
+            self.market_loads.append(reload)
+            return MARKETS
+
+        def set_markets(self, markets):
+            self.seeded = markets
+
+    client = ClientPool(factory=lambda _id: SeedableExchange(), markets_ttl=3600).get("bybit")
+    assert client.market_loads == []
+    assert set(client.seeded) == set(MARKETS)
+
+
+def test_pool_refreshes_stale_snapshot():
+    stale = MarketCatalogue.from_ccxt_markets(MARKETS, fetched_at=time.time() - 10 * 86400)
+    set_market_catalogue(stale)
+
+    class Exchange:
+        def __init__(self):
+            self.market_loads = []
+
+        def load_markets(self, reload=False):
+            self.market_loads.append(reload)
+            return MARKETS
+
+        def set_markets(self, markets):
+            raise AssertionError("stale snapshot must not seed clients")
+
+    client = ClientPool(factory=lambda _id: Exchange(), markets_ttl=3600).get("bybit")
+    assert client.market_loads == [False]
+    assert market_catalogue.load_market_catalogue().age() < 60
+    assert (Path(market_catalogue.catalogue_path())).exists()
@@ -0,0 +1,100 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows import interface
+from tradingagents.dataflows.crypto_indicators import compute_indicators
+from tradingagents.dataflows.indicator_cache import IndicatorCache
+from tradingagents.dataflows.indicator_registry import SUMMARY_COLUMNS
+from tradingagents.dataflows.mtf_indicators import (
+    bundle_window,
+    cross_timeframe_fields,
+    format_bundle,
+    multi_timeframe_bundle,
+    parse_timeframes,
+)
+from tradingagents.dataflows.resample import resample_ohlcv
+
+DAY_MS = 86_400_000
+START_MS = 1704067200000  # 2024-01-01 UTC
+
+
+def trending_15m(rows=2976, drift=0.5, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 40000 + np.cumsum(drift + rng.normal(0, 5, rows))
+    ts = START_MS + np.arange(rows, dtype=np.int64) * 900_000
+    return pd.DataFrame(
+        {
+            "timestamp": ts,
+            "open": close - drift,
+            "high": close + 10,
+            "low": close - 10,
+            "close": close,
+            "volume": rng.uniform(1, 20, rows),
+        }
+    )
+
+
+def test_parse_timeframes_orders_and_validates():
+    assert parse_timeframes("4h, 15m,1h,1h") == ["15m", "1h", "4h"]
+    with pytest.raises(ValueError):
+        parse_timeframes("5m,3m")
+
+
+def test_higher_timeframes_are_resampled_from_one_base_frame():
+    base = trending_15m()
+    bundles = multi_timeframe_bundle(base, ["15m", "1h", "4h"])
+
+    expected_1h = compute_indicators(resample_ohlcv(base, "15m", "1h"), SUMMARY_COLUMNS)
+    pd.testing.assert_series_equal(bundles["1h"]["macd"], expected_1h["macd"])
+    assert bundles["15m"]["timestamp"].iloc[-1] + 900_000 == bundles["4h"]["timestamp"].iloc[-1] + 4 * 3_600_000
+
+
+def test_cross_fields_flag_aligned_uptrend():
+    bundles = multi_timeframe_bundle(trending_15m(), ["15m", "1h", "4h"])
+    cross = cross_timeframe_fields({tf: df.iloc[-1] for tf, df in bundles.items()})
+
+    assert cross["bullish_stacks"] == 3
+    for tf in ("1h", "4h"):
+        assert cross["higher"][tf]["stack"] == "bullish"
+        assert cross["higher"][tf]["position"] == "above_all"
+        assert cross["higher"][tf]["alignment"] == "aligned_bullish"
+        assert cross["higher"][tf]["price_vs_pct"]["sma_99"] > 0
+
+    text = format_bundle("BTC/USDT:USDT", bundles)
+    rows = [line for line in text.splitlines() if line.startswith(("15m,", "1h,", "4h,"))]
+    assert len(rows) == 3 and all(row.endswith(",bullish") for row in rows)
+    assert "4h: stack=bullish position=above_all alignment=aligned_bullish" in text
+    assert "bullish_stacks=3/3" in text
+    assert "# Levels" in text and "# Levels" not in format_bundle("BTC/USDT:USDT", bundles, levels_lookback=None)
+
+
+def test_bundle_window_covers_the_longest_warmup():
+    since, until = bundle_window(["15m", "1h", "4h"], START_MS + 40 * DAY_MS, now_ms=START_MS + 60 * DAY_MS)
+    assert until == START_MS + 40 * DAY_MS
+    assert since % (4 * 3_600_000) == 0
+    # 4h needs 162 warmup + 5 tail bars -> about 28 days of 15m bars
+    assert 27 * DAY_MS < until - since < 29 * DAY_MS
+
+
+def test_tool_loads_base_timeframe_once(monkeypatch):
+    base = trending_15m()
+    calls = []
+
+    def fake_window(symbol, since_ms, until_ms, timeframe="15m"):
+        calls.append(timeframe)
+        return base[(base["timestamp"] >= since_ms) & (base["timestamp"] < until_ms)].reset_index(drop=True)
+
+    monkeypatch.setattr(interface, "load_ohlcv_window", fake_window)
+    monkeypatch.setattr(interface, "get_indicator_cache", lambda: IndicatorCache())
+    text = interface._ccxt_indicator_bundle("BTC/USDT", "2024-01-31", "15m,1h,4h")
+
+    assert calls == ["15m"]
+    assert text.startswith("# Multi-timeframe indicators for BTC/USDT")
+    assert "# Cross-timeframe: 15m close vs higher-timeframe SMA stacks" in text
+    assert interface._ccxt_indicator_bundle("BTC/USDT", "2024-01-31", "15m,7m").startswith("# Failed")
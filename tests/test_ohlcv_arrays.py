@@ -0,0 +1,133 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows.crypto_indicators import _base_arrays, compute_indicator_arrays, compute_indicators
+from tradingagents.dataflows.indicator_kernel import batch_indicators, stack_closes
+from tradingagents.dataflows.indicator_registry import SUMMARY_COLUMNS
+from tradingagents.dataflows.ohlcv_arrays import OhlcvArrays
+
+STEP = 15 * 60_000
+
+
+def ohlcv_frame(rows=600, seed=5, start=1_704_067_200_000):
+    rng = np.random.default_rng(seed)
+    close = 30_000 * np.exp(np.cumsum(rng.normal(0, 0.002, rows)))
+    ts = start + STEP * np.arange(rows, dtype=np.int64)
+    return pd.DataFrame(
+        {
+            "timestamp": ts,
+            "open": close * (1 + rng.normal(0, 0.0005, rows)),
+            "high": close * 1.002,
+            "low": close * 0.998,
+            "close": close,
+            "volume": rng.uniform(1, 50, rows),
+            "datetime": pd.to_datetime(ts, unit="ms"),
+        }
+    )
+
+
+def test_from_frame_is_compact_and_round_trips():
+    df = ohlcv_frame()
+    bars = OhlcvArrays.from_frame(df)
+
+    assert len(bars) == len(df)
+    assert bars.dtype == np.float32 and bars["timestamp"].dtype == np.int64
+    assert bars.nbytes == len(df) * (8 + 5 * 4)
+    assert bars.nbytes < 0.6 * df.memory_usage(index=False).sum()
+
+    back = bars.to_frame()
+    np.testing.assert_array_equal(back["timestamp"], df["timestamp"])
+    assert (back["datetime"] == df["datetime"]).all()
+    np.testing.assert_allclose(back["close"], df["close"], rtol=1e-7)
+
+    # datetime-only frames derive the timestamps
+    assert (OhlcvArrays.from_frame(df.drop(columns="timestamp"))["timestamp"] == bars["timestamp"]).all()
+
+
+def test_tail_and_window_are_views():
+    bars = OhlcvArrays.from_frame(ohlcv_frame(100))
+    tail = bars.tail(10)
+    assert len(tail) == 10 and np.shares_memory(tail["close"], bars["close"])
+
+    ts = bars["timestamp"]
+    window = bars.window(int(ts[20]), int(ts[30]))
+    assert len(window) == 10 and window["timestamp"][0] == ts[20]
+    assert np.shares_memory(window["volume"], bars["volume"])
+    assert len(bars.tail(500)) == 100
+
+
+def test_mismatched_column_lengths_are_rejected():
+    with pytest.raises(ValueError):
+        OhlcvArrays([0, 1], {"open": [1, 2], "high": [1, 2], "low": [1, 2], "close": [1], "volume": [1, 2]})
+
+
+def test_indicators_consume_arrays_without_copying():
+    bars = OhlcvArrays.from_frame(ohlcv_frame())
+    inputs = _base_arrays(bars, SUMMARY_COLUMNS)
+    assert set(inputs) == {"high", "low", "close", "volume", "timestamp"}
+    assert all(np.shares_memory(inputs[name], bars[name]) for name in inputs)
+
+    values = compute_indicator_arrays(bars, SUMMARY_COLUMNS)
+    assert all(v.dtype == np.float64 and v.shape == (len(bars),) for v in values.values())
+
+
+def test_float64_arrays_match_frames_and_float32_stays_close():
+    df = ohlcv_frame()
+    expected = compute_indicators(df, SUMMARY_COLUMNS)
+
+    exact = compute_indicators(OhlcvArrays.from_frame(df, dtype=np.float64), SUMMARY_COLUMNS)
+    compact = compute_indicators(OhlcvArrays.from_frame(df), SUMMARY_COLUMNS)
+    assert list(compact["datetime"]) == list(df["datetime"])
+    for col in SUMMARY_COLUMNS:
+        np.testing.assert_array_equal(exact[col], expected[col], err_msg=col)
+        # float32 prices carry ~7 significant digits; accumulation stays float64
+        scale = np.nanmax(np.abs(expected[col]))
+        np.testing.assert_allclose(compact[col], expected[col], rtol=1e-5, atol=1e-5 * scale, equal_nan=True, err_msg=col)
+
+
+def test_stack_closes_keeps_float32():
+    frames = {s: OhlcvArrays.from_frame(ohlcv_frame(rows, seed)) for s, rows, seed in (("A", 300, 1), ("B", 200, 2))}
+    symbols, close = stack_closes(frames)
+    assert symbols == ["A", "B"] and close.dtype == np.float32
+    assert np.isnan(close[1, :100]).all()
+
+    result = batch_indicators(close)
+    reference = batch_indicators(close.astype(np.float64))
+    for col, values in result.items():
+        assert values.dtype == np.float64
+        np.testing.assert_allclose(values, reference[col], rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=col)
+
+    mixed = stack_closes({"A": frames["A"], "C": ohlcv_frame(50)})[1]
+    assert mixed.dtype == np.float64
+
+
+class StoreClient:
+    def fetch_ohlcv(self, symbol, timeframe="15m", since=None, limit=100):
+        return [[since + i * STEP, 1.0, 2.0, 0.5, 1.5 + i, 10.0] for i in range(limit)]
+
+
+def test_store_windows_load_from_memmaps_with_forming_bar(tmp_path):
+    from tradingagents.dataflows.bar_store import BarStore
+    from tradingagents.dataflows.ccxt_bybit import _current_bar_open, load_ohlcv_arrays, load_ohlcv_window
+
+    store, client = BarStore(str(tmp_path)), StoreClient()
+    until = _current_bar_open("15m") + STEP
+    since = until - 20 * STEP
+
+    bars = load_ohlcv_arrays("BTC/USDT", since, until, client=client, store=store)
+    frame = load_ohlcv_window("BTC/USDT", since, until, client=client, store=store)
+    assert len(bars) == 20 and bars.dtype == np.float32
+    np.testing.assert_array_equal(bars["timestamp"], frame["timestamp"])
+    np.testing.assert_allclose(bars["close"][:-1], frame["close"][:-1], rtol=1e-7)
+    # The forming bar is returned but never stored
+    assert bars["timestamp"][-1] == until - STEP and store.length("BTC/USDT", "15m") == 19
+
+    # A closed window at the store's dtype is a view of the memory-mapped columns
+    closed = load_ohlcv_arrays("BTC/USDT", since, until - STEP, client=client, store=store, dtype=np.float64)
+    assert len(closed) == 19 and isinstance(closed["close"].base, np.memmap)
@@ -0,0 +1,45 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows.ccxt_bybit import get_orderbook_window
+from tradingagents.dataflows.orderbook_analytics import analyze_orderbook
+
+BOOK = {
+    # mid = 100.0
+    "bids": [[99.95, 1.0], [99.8, 2.0], [99.5, 1.0], [99.0, 20.0], [97.0, 5.0]],
+    "asks": [[100.05, 1.0], [100.2, 1.0], [100.4, 3.0], [101.0, 1.0], [103.0, 5.0]],
+}
+
+
+def test_windows_match_naive_sums():
+    stats = analyze_orderbook(BOOK, windows_pct=(0.0025, 0.005, 0.01))
+    for w in stats["windows"]:
+        frac = w["window_pct"] / 100
+        lower, upper = 100 * (1 - frac), 100 * (1 + frac)
+        bid = sum(v for p, v in BOOK["bids"] if lower <= p <= upper)
+        ask = sum(v for p, v in BOOK["asks"] if lower <= p <= upper)
+        assert w["bid_volume"] == pytest.approx(bid)
+        assert w["ask_volume"] == pytest.approx(ask)
+        assert w["imbalance"] == pytest.approx((bid - ask) / (bid + ask))
+
+    half = stats["windows"][1]
+    assert half["buy_vwap"] == pytest.approx((100.05 + 100.2 + 3 * 100.4) / 5)
+
+
+def test_wall_detection_and_tool_output():
+    stats = analyze_orderbook(BOOK, windows_pct=(0.01,), wall_multiple=5.0)
+    assert [w["price"] for w in stats["bid_walls"]] == [99.0]
+    assert stats["ask_walls"] == []
+
+    class Client:
+        def fetch_order_book(self, symbol):
+            return BOOK
+
+    text = get_orderbook_window("BTC/USDT", client=Client())
+    assert "imbalance=" in text
+    assert "window_pct,bid_volume,ask_volume" in text
+    assert "bid_walls=99.0x20.0" in text
@@ -0,0 +1,86 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows import ccxt_bybit
+from tradingagents.dataflows.orderbook_sampler import OrderbookSampler, set_orderbook_sampler
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def book(bid_size):
+    return {"bids": [[99.9, bid_size], [99.5, 1.0]], "asks": [[100.1, 1.0], [100.4, 1.0]]}
+
+
+def test_ring_is_bounded_and_stats_are_time_averaged():
+    clock = Clock()
+    sizes = iter([1.0, 3.0, 5.0, 7.0])
+    sampler = OrderbookSampler(lambda s: book(next(sizes)), ["BTC/USDT"], interval=1.0, capacity=3, clock=clock)
+    for _ in range(4):
+        sampler.sample_once()
+        clock.now += 1.0
+
+    stats = sampler.rolling_stats("BTC/USDT")
+    assert stats["samples"] == 3 and stats["span_s"] == 2.0
+    w = next(w for w in stats["windows"] if w["window_pct"] == 0.5)
+    assert w["bid_volume_mean"] == 6.0  # (3+1, 5+1, 7+1) averaged; first sample evicted
+    assert sampler.latest("BTC/USDT")["windows"][2]["bid_volume"] == 8.0
+    assert sampler.rolling_stats("BTC/USDT", horizon_s=1.5)["samples"] == 1
+
+
+def test_failed_fetch_keeps_history():
+    calls = iter([book(1.0), RuntimeError("timeout")])
+
+    def fetch(symbol):
+        item = next(calls)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    sampler = OrderbookSampler(fetch, ["BTC/USDT"])
+    sampler.sample_once()
+    sampler.sample_once()
+    assert sampler.rolling_stats("BTC/USDT")["samples"] == 1
+
+
+def test_tool_answers_from_fresh_sampler_without_fetch(monkeypatch):
+    def no_network():
+        raise AssertionError("tool must not fetch while the sampler is fresh")
+
+    monkeypatch.setattr(ccxt_bybit, "_ensure_client", no_network)
+    sampler = OrderbookSampler(lambda s: book(2.0), ["BTC/USDT"], interval=60.0)
+    sampler.sample_once()
+    sampler.sample_once()
+    set_orderbook_sampler(sampler)
+    try:
+        out = ccxt_bybit.get_orderbook_window("BTC/USDT")
+    finally:
+        set_orderbook_sampler(None)
+
+    assert out.startswith("# Orderbook window +/-0.50% for BTC/USDT")
+    assert "# Rolling over 2 samples" in out
+    assert "window_pct,imbalance_mean,imbalance_std,bid_volume_mean,ask_volume_mean" in out
+
+
+def test_background_thread_samples_until_stopped():
+    sampler = OrderbookSampler(lambda s: book(1.0), ["BTC/USDT"], interval=0.01)
+    sampler.start()
+    try:
+        for _ in range(200):
+            if (sampler.rolling_stats("BTC/USDT") or {}).get("samples", 0) >= 3:
+                break
+            time.sleep(0.01)
+    finally:
+        sampler.stop()
+    samples = sampler.rolling_stats("BTC/USDT")["samples"]
+    assert samples >= 3
+    time.sleep(0.05)
+    assert sampler.rolling_stats("BTC/USDT")["samples"] == samples
@@ -0,0 +1,91 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows.crypto_indicators import compute_indicators, indicators_summary
+from tradingagents.dataflows.ohlcv_arrays import OhlcvArrays
+from tradingagents.dataflows.price_levels import cluster_zones, detect_levels, format_levels, swing_points
+
+STEP = 15 * 60_000
+
+
+def ranging_frame(rows=240, low=100.0, high=106.0, period=20):
+    """Closes oscillating between `low` and `high` with a little noise."""
+    rng = np.random.default_rng(7)
+    phase = 2 * np.pi * np.arange(rows) / period
+    close = (low + high) / 2 + (high - low) / 2 * 0.9 * np.sin(phase) + rng.normal(0, 0.05, rows)
+    ts = 1_704_067_200_000 + STEP * np.arange(rows, dtype=np.int64)
+    return pd.DataFrame(
+        {
+            "timestamp": ts,
+            "datetime": pd.to_datetime(ts, unit="ms"),
+            "open": close,
+            "high": close + 0.3,
+            "low": close - 0.3,
+            "close": close,
+            "volume": rng.uniform(1, 5, rows),
+        }
+    )
+
+
+def test_swing_points_mark_confirmed_extremes_only():
+    high = np.array([1, 2, 5, 2, 1, 3, 3, 1, 0, 4, 6], dtype=float)
+    low = high - 1
+    is_high, is_low = swing_points(high, low, swing_bars=2)
+    assert np.flatnonzero(is_high).tolist() == [2, 5]  # flat top: first bar; bar 10 is unconfirmed
+    assert np.flatnonzero(is_low).tolist() == [4, 8]
+
+    # Rows of a (symbols x bars) matrix are independent
+    rows_high, _ = swing_points(np.vstack([high, high[::-1]]), np.vstack([low, low[::-1]]), swing_bars=2)
+    np.testing.assert_array_equal(rows_high[0], is_high)
+    assert rows_high[1].sum() == 2
+
+    assert not swing_points(high[:4], low[:4], swing_bars=2)[0].any()
+
+
+def test_cluster_zones_single_linkage():
+    prices = np.array([105.2, 100.0, 110.0, 100.4, 105.0])
+    zones = cluster_zones(prices, np.arange(5), np.array([True, False, True, False, True]), tolerance=0.5)
+    assert [(z["low"], z["high"], z["touches"]) for z in zones] == [(100.0, 100.4, 2), (105.0, 105.2, 2), (110.0, 110.0, 1)]
+    assert zones[0]["swing_lows"] == 2 and zones[1]["swing_highs"] == 2
+    assert zones[1]["last_index"] == 4
+    assert cluster_zones(np.array([]), np.array([], dtype=int), np.array([], dtype=bool), 1.0) == []
+
+
+def test_detect_levels_finds_range_edges_and_breakout():
+    df = ranging_frame()
+    levels = detect_levels(df)
+    rng = levels["range"]
+    assert rng["is_range"] and rng["state"] == "inside"
+    assert abs(rng["high"] - 106) < 0.5 and abs(rng["low"] - 100) < 0.5
+    assert rng["touches_high"] >= 2 and rng["touches_low"] >= 2
+
+    top = max(levels["resistances"] + levels["supports"], key=lambda z: z["mid"])
+    bottom = min(levels["resistances"] + levels["supports"], key=lambda z: z["mid"])
+    assert top["touches"] >= 4 and abs(top["mid"] - 106) < 0.5
+    assert bottom["touches"] >= 4 and abs(bottom["mid"] - 100) < 0.5
+    # Nearest first on both sides
+    assert all(a["mid"] > b["mid"] for a, b in zip(levels["supports"], levels["supports"][1:]))
+    assert all(z["distance_pct"] <= 0 for z in levels["supports"])
+    assert all(z["distance_pct"] >= 0 for z in levels["resistances"])
+
+    breakout = pd.concat([df, df.tail(1).assign(timestamp=df["timestamp"].iloc[-1] + STEP, close=108.0, high=108.2)])
+    assert detect_levels(breakout)["range"]["state"] == "breakout_up"
+
+
+def test_levels_from_arrays_match_frames_and_reach_the_summary():
+    df = ranging_frame()
+    from_arrays = detect_levels(OhlcvArrays.from_frame(df, dtype=np.float64))
+    assert from_arrays["supports"] == detect_levels(df)["supports"]
+
+    lines = format_levels(from_arrays)
+    assert lines[0].startswith("# Levels") and lines[-1].startswith("range_48bars:")
+    assert "range_bound=yes state=inside" in lines[-1]
+
+    text = indicators_summary(compute_indicators(df.drop(columns="timestamp")))
+    assert "# Levels" in text and "support=" in text and "resistance=" in text
+    assert "# Levels" not in indicators_summary(compute_indicators(df), levels_lookback=None)
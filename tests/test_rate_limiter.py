@@ -0,0 +1,92 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows.rate_limiter import (
+    LocalBucketBackend,
+    RateLimiter,
+    RateLimitTimeout,
+)
+
+
+def make_limiter(clock):
+    limits = {"bybit": {"rate": 10, "capacity": 2, "weights": {"fetch_tickers": 5}}}
+    return RateLimiter(limits, backend=LocalBucketBackend(clock=lambda: clock[0]), sleep=lambda s: None)
+
+
+def test_burst_then_queue_reports_waits():
+    clock = [0.0]
+    limiter = make_limiter(clock)
+
+    waits = [limiter.acquire("bybit", "fetch_ohlcv") for _ in range(4)]
+    # Two tokens of burst, then callers queue 0.1s apart at 10 tokens/s
+    assert waits == pytest.approx([0.0, 0.0, 0.1, 0.2])
+    stats = limiter.stats()["bybit"]
+    assert stats["calls"] == 4
+    assert stats["waited_calls"] == 2
+    assert stats["total_wait_s"] == pytest.approx(0.3)
+
+
+def test_endpoint_weight_and_max_wait():
+    clock = [0.0]
+    limiter = make_limiter(clock)
+
+    assert limiter.acquire("bybit", "fetch_tickers") == pytest.approx(0.3)
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire("bybit", "fetch_tickers", max_wait=0.1)
+    # The rejected reservation was refunded
+    assert limiter.acquire("bybit") == pytest.approx(0.4)
+
+
+def test_unknown_vendor_is_not_limited():
+    limiter = make_limiter([0.0])
+    assert limiter.acquire("other") == 0.0
+
+
+def test_threads_and_tasks_share_one_bucket():
+    clock = [0.0]
+    limiter = make_limiter(clock)
+    waits = []
+
+    threads = [threading.Thread(target=lambda: waits.append(limiter.acquire("bybit"))) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    async def run_tasks():
+        return await asyncio.gather(*(limiter.aacquire("bybit") for _ in range(2)))
+
+    waits.extend(asyncio.run(run_tasks()))
+    assert sorted(waits) == pytest.approx([0.0, 0.0, 0.1, 0.2, 0.3])
+
+
+class NetworkBackend(LocalBucketBackend):
+    """Local buckets posing as a remote store, recording which thread reserves."""
+
+    blocking = True
+
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def reserve(self, key, rate, capacity, cost):
+        self.threads.append(threading.get_ident())
+        return super().reserve(key, rate, capacity, cost)
+
+
+def test_blocking_backend_reserves_off_the_event_loop():
+    backend = NetworkBackend()
+    limiter = RateLimiter({"bybit": {"rate": 1000, "capacity": 5}}, backend=backend)
+
+    async def run():
+        await limiter.aacquire("bybit")
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+    assert backend.threads and loop_thread not in backend.threads
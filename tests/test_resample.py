@@ -0,0 +1,81 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows import ccxt_bybit
+from tradingagents.dataflows.bar_store import BarStore
+from tradingagents.dataflows.ccxt_bybit import get_ohlcv_bybit
+from tradingagents.dataflows.resample import resample_ohlcv
+
+STEP = 15 * 60_000
+HOUR = 60 * 60_000
+
+
+def base_bars(start_ms, n):
+    return pd.DataFrame(
+        {
+            "timestamp": [start_ms + i * STEP for i in range(n)],
+            "open": [float(i) for i in range(n)],
+            "high": [float(i) + 10 for i in range(n)],
+            "low": [float(i) - 10 for i in range(n)],
+            "close": [float(i) + 0.5 for i in range(n)],
+            "volume": [1.0] * n,
+        }
+    )
+
+
+def test_resample_aggregates_closed_hours_only():
+    # Starts at :15 and ends at :15, so the first and last hours are incomplete
+    df = base_bars(STEP, 11)
+    out = resample_ohlcv(df, "15m", "1h")
+
+    assert list(out["timestamp"]) == [HOUR, 2 * HOUR]
+    first = out.iloc[0]
+    assert (first["open"], first["close"]) == (3.0, 6.5)
+    assert (first["high"], first["low"]) == (16.0, -7.0)
+    assert first["volume"] == 4.0
+
+
+class Client:
+    def __init__(self):
+        self.timeframes = set()
+
+    def fetch_ohlcv(self, symbol, timeframe="15m", since=None, limit=100):
+        self.timeframes.add(timeframe)
+        step = ccxt_bybit._timeframe_to_ms(timeframe)
+        return [[since + i * step, 1, 2, 0.5, 1.5, 10] for i in range(limit)]
+
+
+def test_higher_timeframe_is_derived_from_base_fetch():
+    client = Client()
+    output = get_ohlcv_bybit("BTC/USDT", "2024-01-01", "2024-01-01", timeframe="1h", client=client)
+
+    assert client.timeframes == {"15m"}
+    assert "timeframe=1h rows=24" in output
+
+
+def test_cold_long_window_is_fetched_natively(tmp_path, monkeypatch):
+    monkeypatch.setattr(ccxt_bybit, "_now_ms", lambda: 1735689600000)  # 2025-01-01
+    store = BarStore(str(tmp_path))
+    client = Client()
+    output = get_ohlcv_bybit("BTC/USDT", "2024-01-01", "2024-12-30", timeframe="1d", client=client, store=store)
+
+    # ~35k 15m bars would be needed to derive a year of 1d; ask for 1d directly
+    assert client.timeframes == {"1d"}
+    assert "timeframe=1d rows=365" in output
+
+
+def test_stored_base_is_resampled_without_native_fetch(tmp_path, monkeypatch):
+    now = 1704067200000 + 20 * 24 * HOUR
+    monkeypatch.setattr(ccxt_bybit, "_now_ms", lambda: now)
+    store = BarStore(str(tmp_path))
+    ccxt_bybit.load_ohlcv_window("BTC/USDT", now - 20 * 24 * HOUR, now, "15m", client=Client(), store=store)
+
+    client = Client()
+    output = get_ohlcv_bybit("BTC/USDT", "2024-01-01", "2024-01-19", timeframe="1d", client=client, store=store)
+
+    assert client.timeframes == set()
+    assert "timeframe=1d rows=19" in output
@@ -0,0 +1,100 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows import interface
+from tradingagents.dataflows.market_cache import get_market_cache
+from tradingagents.dataflows.singleflight import SingleFlight, make_call_key
+
+
+def test_concurrent_identical_routes_share_one_fetch(monkeypatch):
+    calls = []
+
+    def slow_funding(symbol, client=None):
+        calls.append(symbol)
+        time.sleep(0.2)
+        return f"# Funding rate for {symbol}: 0.0001"
+
+    monkeypatch.setitem(interface.VENDOR_METHODS, "get_funding_rate", {"ccxt": slow_funding})
+    get_market_cache().clear()
+    results = []
+    start = threading.Barrier(5)
+
+    # positional, keyword and explicit-default forms must coalesce together
+    forms = [
+        (("BTC/USDT",), {}),
+        ((), {"symbol": "BTC/USDT"}),
+        (("BTC/USDT",), {"client": None}),
+    ]
+
+    def worker(i):
+        args, kwargs = forms[i % len(forms)]
+        start.wait()
+        results.append(interface.route_to_vendor("get_funding_rate", *args, **kwargs))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == ["BTC/USDT"]
+    assert results == ["# Funding rate for BTC/USDT: 0.0001"] * 5
+    get_market_cache().clear()
+
+
+def test_followers_receive_leader_error():
+    flight = SingleFlight()
+    gate = threading.Event()
+    errors = []
+
+    def failing():
+        gate.wait()
+        raise ValueError("upstream down")
+
+    def worker():
+        try:
+            flight.do("k", failing)
+        except ValueError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    gate.set()
+    for t in threads:
+        t.join()
+
+    assert errors == ["upstream down"] * 3
+    assert flight.stats() == {"executed": 1, "shared": 2}
+
+
+def test_async_calls_coalesce():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "ohlcv"
+
+    async def run():
+        return await asyncio.gather(*(flight.ado("k", fetch) for _ in range(4)))
+
+    assert asyncio.run(run()) == ["ohlcv"] * 4
+    assert calls == [1]
+
+
+def test_call_key_normalizes_defaults():
+    def impl(symbol, timeframe="1h", client=None):
+        pass
+
+    assert make_call_key("m", impl, ("BTC/USDT",), {}) == make_call_key(
+        "m", impl, (), {"symbol": "BTC/USDT", "timeframe": "1h"}
+    )
+    assert make_call_key("m", impl, ("BTC/USDT",), {}) != make_call_key("m", impl, ("ETH/USDT",), {})
@@ -0,0 +1,158 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows.trade_tape import (
+    BarBuilder,
+    TradeTape,
+    aggressor_ratios,
+    cumulative_volume_delta,
+    get_trade_flow,
+    read_trades_file,
+    time_bars,
+    volume_bars,
+)
+
+T0 = 1704067200000
+MIN = 60_000
+
+
+def make_trades(n, start=0):
+    rng = np.random.default_rng(7)
+    return [
+        {
+            "id": str(start + i),
+            "timestamp": T0 + (start + i) * 7_000,
+            "price": float(100 + rng.normal()),
+            "amount": float(rng.uniform(0.1, 2.0)),
+            "side": "buy" if rng.random() < 0.6 else "sell",
+        }
+        for i in range(n)
+    ]
+
+
+def reference_time_bars(trades, bar_ms):
+    df = pd.DataFrame(trades)
+    df["signed"] = np.where(df["side"] == "buy", df["amount"], -df["amount"])
+    g = df.groupby(df["timestamp"] // bar_ms * bar_ms)
+    return pd.DataFrame({
+        "open": g["price"].first(), "high": g["price"].max(), "low": g["price"].min(),
+        "close": g["price"].last(), "volume": g["amount"].sum(), "delta": g["signed"].sum(),
+    })
+
+
+def test_ingest_skips_redelivered_trades():
+    tape = TradeTape("BTC/USDT")
+    trades = make_trades(50)
+    assert tape.ingest(trades[:30]) == 30
+    assert tape.ingest(trades[20:]) == 20  # overlapping poll
+    assert len(tape) == 50
+    signed = [t["amount"] * (1 if t["side"] == "buy" else -1) for t in trades]
+    assert np.allclose(cumulative_volume_delta(tape), np.cumsum(signed))
+
+
+def test_arrays_snapshot_survives_eviction():
+    tape = TradeTape("BTC/USDT", max_trades=10)
+    tape.ingest(make_trades(10))
+    snapshot = tape.arrays()
+    tape.ingest(make_trades(5, start=10))  # evicts the 5 oldest, shifting the columns
+    assert snapshot["timestamp"].tolist() == [T0 + i * 7_000 for i in range(10)]
+    assert tape.arrays(8)["timestamp"].tolist() == [T0 + i * 7_000 for i in range(13, 15)]
+
+
+def test_time_bars_match_groupby_reference():
+    trades = make_trades(500)
+    tape = TradeTape()
+    tape.ingest(trades)
+    bars = time_bars(tape, "3m").set_index("timestamp")
+    ref = reference_time_bars(trades, 3 * MIN)
+    for col in ref.columns:
+        assert np.allclose(bars[col].to_numpy(), ref[col].to_numpy())
+
+
+def test_aggressor_ratio_windows():
+    tape = TradeTape()
+    tape.ingest([
+        {"id": "1", "timestamp": T0, "price": 100, "amount": 3.0, "side": "sell"},
+        {"id": "2", "timestamp": T0 + 4 * MIN, "price": 100, "amount": 1.0, "side": "sell"},
+        {"id": "3", "timestamp": T0 + 5 * MIN, "price": 100, "amount": 3.0, "side": "buy"},
+    ])
+    ratios = aggressor_ratios(tape, ["1m", "5m", "15m"])
+    assert ratios["1m"]["buy_ratio"] == 0.75 and ratios["1m"]["trades"] == 2
+    assert ratios["5m"]["delta"] == -1.0 and ratios["5m"]["trades"] == 3
+    assert ratios["5m"]["covered_ms"] == 5 * MIN and not ratios["5m"]["partial"]
+    # The tape starts at T0, so only five of the fifteen minutes are covered
+    assert ratios["15m"]["covered_ms"] == 5 * MIN and ratios["15m"]["partial"]
+
+
+def test_incremental_builders_match_full_recompute():
+    trades = make_trades(900)
+    tape = TradeTape()
+    by_time, by_volume = BarBuilder(tape, duration="10m"), BarBuilder(tape, bar_volume=25.0)
+    for lo in range(0, 900, 137):
+        tape.ingest(trades[lo:lo + 137])
+        incremental_time, incremental_volume = by_time.update(), by_volume.update()
+
+    pd.testing.assert_frame_equal(incremental_time, time_bars(tape, "10m"), check_dtype=False)
+    pd.testing.assert_frame_equal(incremental_volume, volume_bars(tape, 25.0), check_dtype=False)
+    closed = volume_bars(tape, 25.0)["volume"].iloc[:-1]
+    # Bars are cut on a cumulative-volume grid, so each holds about one bar_volume
+    assert abs(closed.mean() - 25.0) < 1.0 and (closed < 25.0 + 2.0).all()
+
+
+class TradesClient:
+    def __init__(self, trades):
+        self.trades = trades
+        self.since = []
+
+    def fetch_trades(self, symbol, since=None, limit=None):
+        self.since.append(since)
+        return [t for t in self.trades if since is None or t["timestamp"] >= since][:limit]
+
+
+def test_trade_flow_from_replayed_file(tmp_path):
+    path = tmp_path / "trades.jsonl"
+    path.write_text("\n".join(json.dumps(t) for t in make_trades(300)) + "\n")
+    client = TradesClient(read_trades_file(str(path)))
+    tape = TradeTape("BTC/USDT")
+
+    out = get_trade_flow("BTC/USDT", client=client, tape=tape)
+    get_trade_flow("BTC/USDT", client=client, tape=tape)
+
+    assert client.since == [None, T0 + 299 * 7_000]
+    assert len(tape) == 300
+    assert out.startswith("# Trade flow for BTC/USDT trades=300")
+    assert "window,volume,delta,buy_ratio,trades,covered_s,partial" in out and "# Last 5 3m trade bars" in out
+    # 300 trades 7s apart span ~35 minutes, so all default windows are fully covered
+    assert ",900,no\n" in out
+
+
+class RecentTradesClient:
+    """Returns only the newest `limit` trades, ignoring `since`, like Bybit's public endpoint."""
+
+    def __init__(self, trades):
+        self.trades = trades
+
+    def fetch_trades(self, symbol, since=None, limit=None):
+        return self.trades[-limit:]
+
+
+def test_full_page_past_the_last_poll_marks_a_gap(monkeypatch):
+    from tradingagents.dataflows import trade_tape
+
+    monkeypatch.setattr(trade_tape, "TRADES_PAGE_LIMIT", 100)
+    trades = make_trades(400)
+    tape = TradeTape("BTC/USDT")
+    tape.ingest(trades[:50])
+    assert tape.covered_since == T0
+
+    trade_tape.sync_trades("BTC/USDT", client=RecentTradesClient(trades), tape=tape)
+    assert len(tape) == 150 and tape.covered_since == trades[300]["timestamp"]
+    ratios = aggressor_ratios(tape, ["5m", "15m"])
+    assert not ratios["5m"]["partial"] and ratios["15m"]["partial"]
+    assert ratios["15m"]["covered_ms"] == trades[-1]["timestamp"] - trades[300]["timestamp"]
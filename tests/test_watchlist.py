@@ -0,0 +1,109 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tradingagents.dataflows.watchlist import format_watchlist_snapshot, get_market_snapshots
+
+STEP = 15 * 60_000
+HOUR = 3_600_000
+
+
+class BulkClient:
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _log(self, name):
+        with self._lock:
+            self.calls.append(name)
+
+    def fetch_tickers(self, symbols):
+        self._log("fetch_tickers")
+        return {s: {"bid": 99.0, "ask": 101.0, "last": 100.0} for s in symbols}
+
+    def fetch_funding_rates(self, symbols):
+        self._log("fetch_funding_rates")
+        return {s: {"fundingRate": 0.0001} for s in symbols}
+
+    def fetch_ohlcv(self, symbol, timeframe="15m", since=None, limit=100):
+        self._log("fetch_ohlcv")
+        if symbol == "BAD/USDT":
+            raise ValueError("bad symbol")
+        return [[since + i * STEP, 100.0, 101.0, 99.0, 100.0 + i, 1.0] for i in range(limit)]
+
+    def fetch_open_interest_history(self, symbol, timeframe="1h", since=None, limit=30):
+        self._log("fetch_open_interest_history")
+        now = int(time.time() * 1000)
+        return [
+            {"timestamp": now - 2 * HOUR, "openInterestAmount": 100.0},
+            {"timestamp": now - HOUR, "openInterestAmount": 105.0},
+        ]
+
+
+def test_snapshots_use_bulk_endpoints_once():
+    client = BulkClient()
+    symbols = ["BTC/USDT", "ETH/USDT", "SOL/USDT", "BAD/USDT"]
+    snaps = get_market_snapshots(symbols, "2024-01-01", "2024-01-01", client=client)
+
+    assert client.calls.count("fetch_tickers") == 1
+    assert client.calls.count("fetch_funding_rates") == 1
+    assert client.calls.count("fetch_ohlcv") == 4
+    assert len(snaps["BTC/USDT"]["ohlcv"]) == 96
+    assert snaps["ETH/USDT"]["oi_change_pct"] == 5.0
+    assert snaps["BAD/USDT"]["error"] == "bad symbol"
+    # Bulk fields and open interest are still filled for the failing symbol
+    assert snaps["BAD/USDT"]["funding_rate"] == 0.0001
+    assert snaps["BAD/USDT"]["oi_change_pct"] == 5.0
+
+    text = format_watchlist_snapshot(snaps)
+    assert "BTC/USDT,100.0,99.0,101.0,200.00,0.0001,5.00,195.0,95.00,96," in text
+
+
+def test_compact_snapshots_hold_float32_arrays():
+    snaps = get_market_snapshots(["BTC/USDT"], "2024-01-01", "2024-01-01", client=BulkClient(), compact=True)
+    bars = snaps["BTC/USDT"]["ohlcv"]
+    assert len(bars) == 96 and bars["close"].dtype == "float32"
+    assert "BTC/USDT,100.0,99.0,101.0,200.00,0.0001,5.00,195.0,95.00,96," in format_watchlist_snapshot(snaps)
+
+
+class DelistedClient(BulkClient):
+    """Bulk endpoints reject the whole list when one symbol is delisted."""
+
+    def fetch_tickers(self, symbols):
+        self._log("fetch_tickers")
+        raise ValueError("bybit does not have market symbol OLD/USDT")
+
+    def fetch_ticker(self, symbol):
+        self._log("fetch_ticker")
+        if symbol == "OLD/USDT":
+            raise ValueError("delisted")
+        return {"bid": 99.0, "ask": 101.0, "last": 100.0}
+
+
+def test_failed_bulk_call_falls_back_per_symbol_and_records_errors():
+    client = DelistedClient()
+    snaps = get_market_snapshots(["BTC/USDT", "OLD/USDT"], "2024-01-01", "2024-01-01", client=client)
+
+    assert client.calls.count("fetch_ticker") == 2
+    assert snaps["BTC/USDT"]["last"] == 100.0 and snaps["BTC/USDT"]["error"] is None
+    assert snaps["OLD/USDT"]["last"] is None and snaps["OLD/USDT"]["error"] == "fetch_ticker: delisted"
+    # The funding bulk call is unaffected, and OHLCV still loads for the failing symbol
+    assert snaps["OLD/USDT"]["funding_rate"] == 0.0001 and len(snaps["OLD/USDT"]["ohlcv"]) == 96
+
+
+class QuoteValueOIClient(BulkClient):
+    def fetch_open_interest_history(self, symbol, timeframe="1h", since=None, limit=30):
+        now = int(time.time() * 1000)
+        return [
+            {"timestamp": now - 2 * HOUR, "openInterestAmount": None, "openInterestValue": 2_000_000.0},
+            {"timestamp": now - HOUR, "openInterestAmount": None, "openInterestValue": 1_900_000.0},
+        ]
+
+
+def test_open_interest_change_uses_quote_value_when_amount_is_missing():
+    snaps = get_market_snapshots(["BTC/USDT"], "2024-01-01", "2024-01-01", client=QuoteValueOIClient())
+    assert snaps["BTC/USDT"]["error"] is None
+    assert round(snaps["BTC/USDT"]["oi_change_pct"], 6) == -5.0
@@ -1,7 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
-from tradingagents.agents.utils.agent_utils import get_stock_data, get_indicators
+from tradingagents.agents.utils.agent_utils import get_stock_data, get_indicators, get_indicator_bundle
 from tradingagents.dataflows.config import get_config
 
 
@@ -14,6 +14,7 @@ def create_market_analyst(llm):
 
         tools = [
             get_stock_data,
+            get_indicator_bundle,
             get_indicators,
         ]
 
@@ -21,15 +22,19 @@ def create_market_analyst(llm):
             "You are a crypto trading assistant focusing on Bybit USDT perpetuals. "
             "Analyze short-term price action with 15m trigger and 1h context. "
             "Use get_stock_data to fetch OHLCV (default 15m, you may also fetch 1h), "
-            "then get_indicators to retrieve the core bundle: SMA(7/25/99), RSI14, "
-            "Bollinger(20,2), MACD(12/26/9). Prioritize:\n"
-            "- 1h bias vs SMA99 and SMA stack (7/25/99)\n"
+            "then call get_indicator_bundle once (15m,1h,4h) for the core bundle on every "
+            "timeframe: SMA(7/25/99), RSI14, Bollinger(20,2), MACD(12/26/9), ATR14, VWAP, OBV change over 20 bars, "
+            "plus cross-timeframe SMA stack alignment. Use get_indicators only for a single "
+            "extra timeframe. Prioritize:\n"
+            "- 4h/1h bias vs SMA99 and SMA stack (7/25/99), from the cross-timeframe fields\n"
             "- 15m pattern type: trend pullback, range breakout, reversal at S/R, squeeze expansion\n"
             "- Momentum/divergence: RSI, MACD\n"
             "- Volatility state: Bollinger squeeze/expansion\n"
             "- Volume/impulse context from recent candles\n"
-            "Report actionable insights for LONG/SHORT/NEUTRAL with specific levels "
-            "(recent swing, band, or obvious liquidity zone). Do not hand-wave with 'mixed'; "
+            "Report actionable insights for LONG/SHORT/NEUTRAL with specific levels: take them "
+            "from the '# Levels' block of the indicator tools (nearest S/R zones with touches, "
+            "recent swings, range edges and breakout state) or the Bollinger bands instead of "
+            "deriving them from raw candles. Do not hand-wave with 'mixed'; "
             "be concrete and concise. Append a Markdown table summarizing bias, pattern, "
             "levels, momentum, volatility, and confidence."
         )
@@ -27,7 +27,7 @@ def create_bear_researcher(llm, memory):
 Key points to focus on:
 
 - Higher-timeframe bias: 1h SMA stack vs price; conflict between 15m and 1h.
-- Pattern/Level: weak breakouts, liquidity grabs, exhaustion at resistance, squeeze failing.
+- Pattern/Level: weak breakouts, liquidity grabs, exhaustion at resistance, squeeze failing, using the S/R zones, swings and range edges listed in the market report.
 - Momentum: RSI/MACD divergence against the move, loss of momentum.
 - Volatility/Order flow: expanding spreads, imbalanced orderbook against longs, unfavorable funding/OI shifts.
 - Bull Counterpoints: expose weak assumptions with specific data.
@@ -26,7 +26,7 @@ def create_bull_researcher(llm, memory):
 
 Key points to focus on:
 - Higher-timeframe bias: 1h vs SMA99 stack; alignment of 15m with 1h.
-- Pattern/Level: trend pullback, range breakout, or squeeze expansion with clear entry/invalid level.
+- Pattern/Level: trend pullback, range breakout, or squeeze expansion with clear entry/invalid level, using the S/R zones, swings and range edges listed in the market report.
 - Momentum: RSI/MACD agreement or bullish divergence.
 - Volatility/Order flow: BB squeeze/expansion, impulse strength; volume context.
 - Bear Counterpoints: Refute with data, not platitudes.
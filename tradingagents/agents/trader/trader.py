@@ -35,6 +35,7 @@ def create_trader(llm, memory):
                 "role": "system",
                 "content": f"""You are a trading agent analyzing crypto market data to make short-term decisions. Provide a specific recommendation: LONG, SHORT, or NEUTRAL. 
 Return one decision with entry idea, SL (~0.5-1% risk), TP for RR 1-10 (prefer 1.5-2.5). 
+Anchor entry, SL and TP to the S/R zones, swings and range edges reported in the plan (SL beyond a zone, not inside it). 
 Always conclude with 'FINAL TRANSACTION PROPOSAL: **LONG/SHORT/NEUTRAL**'. 
 Use lessons from past decisions to avoid repeating mistakes: {past_memory_str}""",
             },
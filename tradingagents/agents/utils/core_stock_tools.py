@@ -1,6 +1,6 @@
 from langchain_core.tools import tool
 from typing import Annotated
-from tradingagents.dataflows.interface import route_to_vendor
+from tradingagents.dataflows.interface import route_to_vendor, aroute_to_vendor
 
 
 @tool
@@ -21,3 +21,16 @@ def get_stock_data(
         str: A formatted CSV string containing OHLCV for the specified symbol/timeframe.
     """
     return route_to_vendor("get_stock_data", symbol, start_date, end_date, timeframe=timeframe)
+
+
+async def _aget_stock_data(
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    timeframe: str = "15m",
+) -> str:
+    return await aroute_to_vendor("get_stock_data", symbol, start_date, end_date, timeframe=timeframe)
+
+
+# Let async graph runs (ainvoke/astream) await the data path instead of using a thread
+get_stock_data.coroutine = _aget_stock_data
@@ -1,6 +1,6 @@
 from langchain_core.tools import tool
 from typing import Annotated
-from tradingagents.dataflows.interface import route_to_vendor
+from tradingagents.dataflows.interface import route_to_vendor, aroute_to_vendor
 
 @tool
 def get_indicators(
@@ -23,3 +23,45 @@ def get_indicators(
         str: A formatted textual summary of indicator values.
     """
     return route_to_vendor("get_indicators", symbol, indicator, curr_date, look_back_days, timeframe=timeframe)
+
+
+async def _aget_indicators(
+    symbol: str,
+    indicator: str,
+    curr_date: str,
+    look_back_days: int = 30,
+    timeframe: str = "15m",
+) -> str:
+    return await aroute_to_vendor("get_indicators", symbol, indicator, curr_date, look_back_days, timeframe=timeframe)
+
+
+# Let async graph runs (ainvoke/astream) await the data path instead of using a thread
+get_indicators.coroutine = _aget_indicators
+
+
+@tool
+def get_indicator_bundle(
+    symbol: Annotated[str, "symbol of the crypto perp contract, e.g. BTC/USDT"],
+    curr_date: Annotated[str, "The current trading date you are trading on, YYYY-mm-dd"],
+    timeframes: Annotated[str, "comma-separated timeframes, shortest first is the base (e.g. 15m,1h,4h)"] = "15m,1h,4h",
+) -> str:
+    """
+    Retrieve aligned indicator bundles for several timeframes in one call.
+    Higher timeframes are built from one load of the shortest one, and the result
+    adds cross-timeframe fields (price vs each higher-timeframe SMA stack, stack
+    and MACD agreement).
+    Args:
+        symbol (str): Perp symbol, e.g. BTC/USDT
+        curr_date (str): The current trading date you are trading on, YYYY-mm-dd
+        timeframes (str): Comma-separated timeframes, default "15m,1h,4h"
+    Returns:
+        str: One CSV row per timeframe plus cross-timeframe fields.
+    """
+    return route_to_vendor("get_indicator_bundle", symbol, curr_date, timeframes=timeframes)
+
+
+async def _aget_indicator_bundle(symbol: str, curr_date: str, timeframes: str = "15m,1h,4h") -> str:
+    return await aroute_to_vendor("get_indicator_bundle", symbol, curr_date, timeframes=timeframes)
+
+
+get_indicator_bundle.coroutine = _aget_indicator_bundle
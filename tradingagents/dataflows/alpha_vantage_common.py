@@ -5,6 +5,8 @@ import json
 from datetime import datetime
 from io import StringIO
 
+from .rate_limiter import get_rate_limiter
+
 API_BASE_URL = "https://www.alphavantage.co/query"
 
 def get_api_key() -> str:
@@ -63,6 +65,7 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
         # Remove entitlement if it's None or empty
         api_params.pop("entitlement", None)
     
+    get_rate_limiter().acquire("alpha_vantage", function_name)
     response = requests.get(API_BASE_URL, params=api_params)
     response.raise_for_status()
 
@@ -0,0 +1,265 @@
+"""
+Historical OHLCV backfill into the local bar store.
+
+Each (symbol, timeframe) range is split into fixed-size date chunks that are
+downloaded in parallel on one thread pool, sharing the Bybit rate limiter.
+Completed chunks are written to the store in chronological order and recorded
+in a JSON checkpoint, so an interrupted job resumes with the first chunk that
+was not persisted. Chunks newer than the stored bars are appended as they
+arrive. Chunks older than them (extending a series backwards) are appended to
+a staging series under `<data_cache_dir>/backfill` and checkpointed right
+away, so memory stays bounded by the chunks in flight and an interrupted run
+keeps them; the staging series is merged into the store with a single rewrite
+per series (each rewrite copies the whole series) when a run completes. After
+each series the stored bars are checked for duplicate timestamps and gaps from
+the start date, or from the listing time in the market catalogue snapshot for
+symbols listed later.
+
+    python -m tradingagents.dataflows.backfill \\
+        --symbols BTC/USDT:USDT ETH/USDT:USDT --timeframes 1m 15m \\
+        --start 2023-01-01 --end 2023-12-31
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .bar_store import BarStore
+from .ccxt_bybit import _current_bar_open, _date_window_ms, _ensure_client, fetch_ohlcv_range, get_bar_store
+from .market_catalogue import load_market_catalogue
+from .timeframes import timeframe_to_ms
+
+DEFAULT_CHUNK_DAYS = 7
+MAX_CHUNK_WORKERS = 8
+DAY_MS = 86_400_000
+
+
+def plan_chunks(since_ms: int, until_ms: int, chunk_days: int = DEFAULT_CHUNK_DAYS) -> List[Tuple[int, int]]:
+    """Split [since_ms, until_ms) into consecutive windows of `chunk_days` days."""
+    step = chunk_days * DAY_MS
+    return [(lo, min(lo + step, until_ms)) for lo in range(since_ms, until_ms, step)]
+
+
+class Checkpoint:
+    """Chunks already persisted per series, stored as JSON next to the bars."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._done: Dict[str, List[List[int]]] = {}
+        if self.path.exists():
+            self._done = json.loads(self.path.read_text()).get("done", {})
+
+    @staticmethod
+    def _key(symbol: str, timeframe: str) -> str:
+        return f"{symbol}|{timeframe}"
+
+    def is_done(self, symbol: str, timeframe: str, chunk: Tuple[int, int]) -> bool:
+        return list(chunk) in self._done.get(self._key(symbol, timeframe), [])
+
+    def mark_done(self, symbol: str, timeframe: str, chunk: Tuple[int, int]) -> None:
+        with self._lock:
+            self._done.setdefault(self._key(symbol, timeframe), []).append(list(chunk))
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps({"done": self._done}))
+            os.replace(tmp, self.path)
+
+
+def validate_series(
+    store: BarStore,
+    symbol: str,
+    timeframe: str,
+    since_ms: int,
+    until_ms: int,
+    listed_ms: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Check stored bars in [since_ms, until_ms) for duplicates, ordering and gaps.
+
+    Args:
+        listed_ms: first bar the exchange has for the symbol; no bars are
+            expected before it
+    Returns:
+        {"bars", "expected", "duplicates", "unordered", "gaps": [(first_missing_ms, missing_bars)]}
+    """
+    tf_ms = timeframe_to_ms(timeframe)
+    ts = np.asarray(store.read_arrays(symbol, timeframe, since_ms, until_ms)["timestamp"])
+    first = -(-max(since_ms, listed_ms or since_ms) // tf_ms) * tf_ms
+    last_open = min(until_ms - 1, _current_bar_open(timeframe) - 1) // tf_ms * tf_ms
+    expected = max(0, (last_open - first) // tf_ms + 1)
+    if ts.size == 0:
+        gaps = [(first, expected)] if expected else []
+        return {"bars": 0, "expected": expected, "duplicates": 0, "unordered": 0, "gaps": gaps}
+
+    # Bounds are included so missing head/tail bars count as gaps too
+    edges = np.r_[first - tf_ms, ts, last_open + tf_ms]
+    step = np.diff(edges)
+    missing = step // tf_ms - 1
+    gap_idx = np.flatnonzero(missing > 0)
+    return {
+        "bars": int(ts.size),
+        "expected": int(expected),
+        "duplicates": int(np.count_nonzero(step[1:-1] == 0)),
+        "unordered": int(np.count_nonzero(step[1:-1] < 0)),
+        "gaps": [(int(edges[i] + tf_ms), int(missing[i])) for i in gap_idx],
+    }
+
+
+def _closed_bars(frame: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    return frame[frame["timestamp"] < _current_bar_open(timeframe)]
+
+
+def _appendable(store: BarStore, symbol: str, timeframe: str, closed: pd.DataFrame) -> bool:
+    last = store.last_timestamp(symbol, timeframe)
+    return last is None or closed["timestamp"].iloc[0] > last
+
+
+def _listing_ms(symbol: str, exchange: str = "bybit") -> Optional[int]:
+    """Listing time from the market catalogue snapshot (no network), if known."""
+    catalogue = load_market_catalogue(exchange)
+    listed = (catalogue.markets.get(symbol) or {}).get("listed_at") if catalogue is not None else None
+    return int(listed) if listed else None
+
+
+def _merge_staged(store: BarStore, staging: BarStore, symbol: str, timeframe: str) -> None:
+    if staging.length(symbol, timeframe):
+        store.rewrite(symbol, timeframe, staging.read(symbol, timeframe))
+    staging.drop(symbol, timeframe)
+
+
+def backfill(
+    symbols: Sequence[str],
+    timeframes: Sequence[str],
+    start_date: str,
+    end_date: str,
+    client: Any = None,
+    store: Optional[BarStore] = None,
+    checkpoint_path: Optional[str] = None,
+    chunk_days: int = DEFAULT_CHUNK_DAYS,
+    max_workers: int = MAX_CHUNK_WORKERS,
+) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """
+    Download an inclusive date range for every symbol/timeframe into the store.
+
+    Args:
+        symbols: e.g. ["BTC/USDT:USDT", "ETH/USDT:USDT"]
+        timeframes: ccxt timeframes, e.g. ["1m", "15m"]
+        start_date / end_date: inclusive "YYYY-MM-DD" range (UTC)
+        client: optional ccxt client (for tests, pass a dummy)
+        store: target store (defaults to the shared bar store, see `get_bar_store`)
+        checkpoint_path: resume file (defaults to `backfill_checkpoint.json` in the store root)
+        chunk_days: days per downloaded chunk
+        max_workers: chunks downloaded concurrently across all series
+    Returns:
+        {(symbol, timeframe): validation report from `validate_series`}
+    """
+    store = store or get_bar_store()
+    if store is None:
+        raise RuntimeError("The bar store is disabled (bar_store_enabled=False); nothing to backfill into")
+    c = client or _ensure_client()
+    checkpoint = Checkpoint(checkpoint_path or str(store.root / "backfill_checkpoint.json"))
+    staging = BarStore(store.cache_dir, exchange=store.root.name, columns=store.columns, kind="backfill")
+    since_ms, until_ms = _date_window_ms(start_date, end_date)
+    chunks = plan_chunks(since_ms, until_ms, chunk_days)
+
+    series = [(s, tf) for s in symbols for tf in timeframes]
+    pending = {key: [ch for ch in chunks if not checkpoint.is_done(*key, ch)] for key in series}
+    # Per series: finished downloads waiting for their predecessors to be written
+    ready: Dict[Tuple[str, str], Dict[Tuple[int, int], pd.DataFrame]] = {key: {} for key in series}
+    write_locks = {key: threading.Lock() for key in series}
+
+    def mark_done(key: Tuple[str, str], chunk: Tuple[int, int]) -> None:
+        # A chunk still holding the forming bar is fetched again next run
+        if chunk[1] <= _current_bar_open(key[1]):
+            checkpoint.mark_done(*key, chunk)
+
+    def flush(key: Tuple[str, str]) -> None:
+        symbol, timeframe = key
+        with write_locks[key]:
+            queue = pending[key]
+            while queue and queue[0] in ready[key]:
+                chunk = queue.pop(0)
+                closed = _closed_bars(ready[key].pop(chunk), timeframe)
+                if not closed.empty:
+                    # Older than the stored bars: staged, merged in once the run completes
+                    target = store if _appendable(store, symbol, timeframe, closed) else staging
+                    target.append(symbol, timeframe, closed)
+                mark_done(key, chunk)
+
+    def download(key: Tuple[str, str], chunk: Tuple[int, int]) -> Tuple[Tuple[str, str], Tuple[int, int], pd.DataFrame]:
+        symbol, timeframe = key
+        # Parallelism comes from the chunk pool, so pages within a chunk run serially
+        return key, chunk, fetch_ohlcv_range(c, symbol, timeframe, chunk[0], chunk[1], max_workers=1)
+
+    tasks = [(key, ch) for key in series for ch in pending[key]]
+    if tasks:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks)))) as pool:
+            futures = [pool.submit(download, key, ch) for key, ch in tasks]
+            for future in as_completed(futures):
+                key, chunk, frame = future.result()
+                with write_locks[key]:
+                    ready[key][chunk] = frame
+                flush(key)
+
+    reports = {}
+    for symbol, timeframe in series:
+        _merge_staged(store, staging, symbol, timeframe)
+        store.add_coverage(symbol, timeframe, since_ms, min(until_ms, _current_bar_open(timeframe)))
+        reports[(symbol, timeframe)] = validate_series(
+            store, symbol, timeframe, since_ms, until_ms, listed_ms=_listing_ms(symbol, store.root.name)
+        )
+    return reports
+
+
+def format_report(reports: Dict[Tuple[str, str], Dict[str, Any]], max_gaps: int = 5) -> str:
+    lines = ["symbol,timeframe,bars,expected,duplicates,unordered,gaps,missing_bars"]
+    details = []
+    for (symbol, timeframe), r in reports.items():
+        missing = sum(n for _, n in r["gaps"])
+        lines.append(
+            f"{symbol},{timeframe},{r['bars']},{r['expected']},{r['duplicates']},"
+            f"{r['unordered']},{len(r['gaps'])},{missing}"
+        )
+        for start, n in r["gaps"][:max_gaps]:
+            details.append(f"# gap {symbol} {timeframe} from {pd.to_datetime(start, unit='ms')} missing={n}")
+    return "\n".join(lines + details) + "\n"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Backfill Bybit OHLCV into the local bar store.")
+    parser.add_argument("--symbols", nargs="+", required=True)
+    parser.add_argument("--timeframes", nargs="+", default=["15m"])
+    parser.add_argument("--start", required=True, help="YYYY-MM-DD (inclusive)")
+    parser.add_argument("--end", required=True, help="YYYY-MM-DD (inclusive)")
+    parser.add_argument("--chunk-days", type=int, default=DEFAULT_CHUNK_DAYS)
+    parser.add_argument("--workers", type=int, default=MAX_CHUNK_WORKERS)
+    parser.add_argument("--checkpoint", default=None, help="resume file path")
+    parser.add_argument("--strict", action="store_true", help="exit 1 if gaps or duplicates remain")
+    args = parser.parse_args(argv)
+
+    reports = backfill(
+        args.symbols,
+        args.timeframes,
+        args.start,
+        args.end,
+        checkpoint_path=args.checkpoint,
+        chunk_days=args.chunk_days,
+        max_workers=args.workers,
+    )
+    print(format_report(reports), end="")
+    clean = all(not r["gaps"] and not r["duplicates"] and not r["unordered"] for r in reports.values())
+    return 0 if clean or not args.strict else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,218 @@
+"""
+Append-only on-disk OHLCV bar store.
+
+Each (exchange, symbol, timeframe) series lives in its own directory with one raw
+little-endian file per column (`timestamp.i8`, `open.f8`, ...). New bars are
+appended to the end of every column file and reads go through `numpy.memmap`, so
+slicing a window never parses text and only touches the pages it needs.
+`meta.json` lists the synced [start, end) segments, so windows far apart can be
+stored without downloading the time between them, plus any series attributes
+set with `set_meta` (e.g. the units of a derivatives series).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+COLUMN_DTYPES = {
+    "timestamp": np.dtype("<i8"),
+    "open": np.dtype("<f8"),
+    "high": np.dtype("<f8"),
+    "low": np.dtype("<f8"),
+    "close": np.dtype("<f8"),
+    "volume": np.dtype("<f8"),
+}
+
+
+def _column_file(series_dir: Path, column: str, dtype: np.dtype) -> Path:
+    return series_dir / f"{column}.{dtype.kind}{dtype.itemsize}"
+
+
+def _safe_name(symbol: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", symbol).strip("_")
+
+
+class BarStore:
+    """
+    Columnar, append-only bar storage rooted at a cache directory.
+
+    `columns` and `kind` let other timestamped series (e.g. funding or open
+    interest history) reuse the same layout under `cache_dir/<kind>/<exchange>`.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        exchange: str = "bybit",
+        columns: Optional[Dict[str, np.dtype]] = None,
+        kind: str = "bars",
+    ):
+        self.cache_dir = cache_dir
+        self.columns = columns or COLUMN_DTYPES
+        self.root = Path(cache_dir) / kind / exchange
+        self._lock = threading.RLock()
+
+    def series_dir(self, symbol: str, timeframe: str) -> Path:
+        return self.root / _safe_name(symbol) / timeframe
+
+    def _meta_path(self, symbol: str, timeframe: str) -> Path:
+        return self.series_dir(symbol, timeframe) / "meta.json"
+
+    def length(self, symbol: str, timeframe: str) -> int:
+        """Number of complete rows (the shortest column wins after a torn write)."""
+        series_dir = self.series_dir(symbol, timeframe)
+        lengths = []
+        for column, dtype in self.columns.items():
+            path = _column_file(series_dir, column, dtype)
+            if not path.exists():
+                return 0
+            lengths.append(path.stat().st_size // dtype.itemsize)
+        return min(lengths)
+
+    def meta(self, symbol: str, timeframe: str) -> Dict[str, Any]:
+        """The series' `meta.json` contents ({} if none)."""
+        path = self._meta_path(symbol, timeframe)
+        return json.loads(path.read_text()) if path.exists() else {}
+
+    def set_meta(self, symbol: str, timeframe: str, **fields: Any) -> None:
+        """Merge `fields` into the series' `meta.json`."""
+        with self._lock:
+            meta = dict(self.meta(symbol, timeframe), **fields)
+            path = self._meta_path(symbol, timeframe)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(meta))
+
+    def coverage(self, symbol: str, timeframe: str) -> List[Tuple[int, int]]:
+        """
+        Synced [start, end) windows in ms, oldest first. Bars inside a segment are
+        complete; time between segments has never been downloaded.
+        """
+        meta = self.meta(symbol, timeframe)
+        if not meta:
+            return []
+        if "segments" in meta:
+            return [(int(lo), int(hi)) for lo, hi in meta["segments"]]
+        # Older meta: one segment from `covered_since` through the last stored bar
+        last = self.last_timestamp(symbol, timeframe)
+        if meta.get("covered_since") is None or last is None:
+            return []
+        return [(int(meta["covered_since"]), last + 1)]
+
+    def covered_since(self, symbol: str, timeframe: str) -> Optional[int]:
+        """Earliest timestamp (ms) the store has already been synced from."""
+        segments = self.coverage(symbol, timeframe)
+        return segments[0][0] if segments else None
+
+    def add_coverage(self, symbol: str, timeframe: str, since_ms: int, until_ms: int) -> None:
+        """Record [since_ms, until_ms) as synced, merging overlapping or touching segments."""
+        if until_ms <= since_ms:
+            return
+        with self._lock:
+            merged: List[List[int]] = []
+            for lo, hi in sorted(self.coverage(symbol, timeframe) + [(int(since_ms), int(until_ms))]):
+                if merged and lo <= merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], hi)
+                else:
+                    merged.append([lo, hi])
+            self.set_meta(symbol, timeframe, segments=merged)
+
+    def _column(self, symbol: str, timeframe: str, column: str, n: int) -> np.ndarray:
+        dtype = self.columns[column]
+        path = _column_file(self.series_dir(symbol, timeframe), column, dtype)
+        return np.memmap(path, dtype=dtype, mode="r", shape=(n,))
+
+    def first_timestamp(self, symbol: str, timeframe: str) -> Optional[int]:
+        n = self.length(symbol, timeframe)
+        return int(self._column(symbol, timeframe, "timestamp", n)[0]) if n else None
+
+    def last_timestamp(self, symbol: str, timeframe: str) -> Optional[int]:
+        n = self.length(symbol, timeframe)
+        return int(self._column(symbol, timeframe, "timestamp", n)[-1]) if n else None
+
+    def read_arrays(
+        self,
+        symbol: str,
+        timeframe: str,
+        since_ms: Optional[int] = None,
+        until_ms: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Return memory-mapped column slices for bars in [since_ms, until_ms).
+        """
+        n = self.length(symbol, timeframe)
+        if n == 0:
+            return {c: np.empty(0, dtype=d) for c, d in self.columns.items()}
+        ts = self._column(symbol, timeframe, "timestamp", n)
+        lo = 0 if since_ms is None else int(np.searchsorted(ts, since_ms, side="left"))
+        hi = n if until_ms is None else int(np.searchsorted(ts, until_ms, side="left"))
+        return {c: self._column(symbol, timeframe, c, n)[lo:hi] for c in self.columns}
+
+    def read(
+        self,
+        symbol: str,
+        timeframe: str,
+        since_ms: Optional[int] = None,
+        until_ms: Optional[int] = None,
+    ) -> pd.DataFrame:
+        arrays = self.read_arrays(symbol, timeframe, since_ms, until_ms)
+        return pd.DataFrame({c: np.asarray(a) for c, a in arrays.items()})
+
+    def append(self, symbol: str, timeframe: str, df: pd.DataFrame) -> int:
+        """
+        Append bars newer than the last stored timestamp. Returns rows written.
+        """
+        with self._lock:
+            series_dir = self.series_dir(symbol, timeframe)
+            series_dir.mkdir(parents=True, exist_ok=True)
+            n = self._repair(symbol, timeframe)
+            last = self.last_timestamp(symbol, timeframe) if n else None
+            new = df.sort_values("timestamp").drop_duplicates("timestamp", keep="last")
+            if last is not None:
+                new = new[new["timestamp"] > last]
+            if new.empty:
+                return 0
+            for column, dtype in self.columns.items():
+                with open(_column_file(series_dir, column, dtype), "ab") as fh:
+                    fh.write(new[column].to_numpy(dtype=dtype).tobytes())
+            return len(new)
+
+    def rewrite(self, symbol: str, timeframe: str, df: pd.DataFrame) -> None:
+        """
+        Replace the whole series, merged with what is stored. Used when older
+        history has to be placed in front of the existing bars.
+        """
+        with self._lock:
+            merged = pd.concat([df[list(self.columns)], self.read(symbol, timeframe)])
+            merged = merged.drop_duplicates("timestamp", keep="last").sort_values("timestamp")
+            series_dir = self.series_dir(symbol, timeframe)
+            series_dir.mkdir(parents=True, exist_ok=True)
+            for column, dtype in self.columns.items():
+                path = _column_file(series_dir, column, dtype)
+                tmp = path.with_suffix(path.suffix + ".tmp")
+                tmp.write_bytes(merged[column].to_numpy(dtype=dtype).tobytes())
+                os.replace(tmp, path)
+
+    def drop(self, symbol: str, timeframe: str) -> None:
+        """Delete the series (columns and coverage)."""
+        with self._lock:
+            shutil.rmtree(self.series_dir(symbol, timeframe), ignore_errors=True)
+
+    def _repair(self, symbol: str, timeframe: str) -> int:
+        """Truncate columns left uneven by an interrupted append."""
+        n = self.length(symbol, timeframe)
+        series_dir = self.series_dir(symbol, timeframe)
+        for column, dtype in self.columns.items():
+            path = _column_file(series_dir, column, dtype)
+            if path.exists() and path.stat().st_size != n * dtype.itemsize:
+                with open(path, "r+b") as fh:
+                    fh.truncate(n * dtype.itemsize)
+        return n
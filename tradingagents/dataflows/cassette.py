@@ -0,0 +1,197 @@
+"""
+Record/replay ("cassette") wrappers around a ccxt client.
+
+`RecordingClient` forwards to a real client and keeps every `fetch_ohlcv`,
+`fetch_order_book`, funding and open interest (history) response; `save()`
+writes them as gzip-compressed JSON lines. `ReplayClient` (and
+`AsyncReplayClient` for the asyncio path) serves those responses back with an
+optional artificial latency, so graph runs, benchmarks and incident
+reproductions need no network.
+
+OHLCV and funding / open interest history are replayed from the merged set of
+recorded points rather than by exact request, so a replay still works when the
+data layer pages the window differently (e.g. a store delta instead of a full
+download, or a look-back start that moved with the clock).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import gzip
+import inspect
+import json
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional
+
+from .ccxt_pool import reset_clients, set_async_client, set_client
+from .config import get_config, set_config
+from .market_cache import get_market_cache
+
+RECORDED_METHODS = (
+    "fetch_ohlcv",
+    "fetch_order_book",
+    "fetch_funding_rate",
+    "fetch_funding_rate_history",
+    "fetch_open_interest_history",
+)
+
+
+# Since-based endpoints replayed from merged records: method -> timestamp getter
+_SERIES_METHODS = {
+    "fetch_ohlcv": lambda row: int(row[0]),
+    "fetch_funding_rate_history": lambda row: int(row["timestamp"]),
+    "fetch_open_interest_history": lambda row: int(row["timestamp"]),
+}
+
+
+def _request_key(method: str, args: tuple, kwargs: dict) -> str:
+    return json.dumps([method, list(args), kwargs], sort_keys=True, default=str)
+
+
+class RecordingClient:
+    """Wraps a sync or async ccxt client and records the responses of data calls."""
+
+    def __init__(self, client: Any, path: Optional[str] = None):
+        self._client = client
+        self.path = path
+        self.records: List[Dict[str, Any]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if name not in RECORDED_METHODS:
+            return attr
+
+        if inspect.iscoroutinefunction(attr):
+            async def record_async(*args, **kwargs):
+                result = await attr(*args, **kwargs)
+                self._record(name, args, kwargs, result)
+                return result
+            return record_async
+
+        def record(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            self._record(name, args, kwargs, result)
+            return result
+        return record
+
+    def _record(self, method: str, args: tuple, kwargs: dict, result: Any) -> None:
+        self.records.append({"method": method, "args": list(args), "kwargs": kwargs, "result": result})
+
+    def save(self, path: Optional[str] = None) -> str:
+        path = path or self.path
+        if not path:
+            raise ValueError("No cassette path given")
+        with gzip.open(path, "wt", encoding="utf-8") as fh:
+            for record in self.records:
+                fh.write(json.dumps(record, default=str) + "\n")
+        return path
+
+
+class ReplayClient:
+    """
+    Serves recorded responses. Repeated identical requests are answered in
+    recording order and keep returning the last response once exhausted.
+
+    Args:
+        path: cassette written by `RecordingClient.save`
+        latency: seconds to sleep per call, to emulate exchange round trips
+    """
+
+    def __init__(self, path: str, latency: float = 0.0):
+        self.latency = latency
+        self._responses: Dict[str, List[Any]] = defaultdict(list)
+        self._served: Dict[str, int] = defaultdict(int)
+        self._series_rows: Dict[tuple, Dict[int, Any]] = defaultdict(dict)
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                record = json.loads(line)
+                method, args, kwargs = record["method"], tuple(record["args"]), record["kwargs"]
+                if method in _SERIES_METHODS:
+                    series = self._series_rows[self._series(method, args, kwargs)]
+                    for row in record["result"] or []:
+                        series[_SERIES_METHODS[method](row)] = row
+                else:
+                    self._responses[_request_key(method, args, kwargs)].append(record["result"])
+
+    @staticmethod
+    def _series(method: str, args: tuple, kwargs: dict) -> tuple:
+        symbol = args[0] if args else kwargs.get("symbol")
+        timeframe = args[1] if len(args) > 1 else kwargs.get("timeframe")
+        return method, symbol, timeframe
+
+    def load_markets(self, reload: bool = False) -> Dict[str, Any]:
+        return {}
+
+    def _series_slice(self, method: str, args: tuple, kwargs: dict) -> List[Any]:
+        series = self._series_rows.get(self._series(method, args, kwargs), {})
+        since = kwargs.get("since")
+        limit = kwargs.get("limit")
+        stamps = sorted(ts for ts in series if since is None or ts >= since)
+        if limit is not None:
+            stamps = stamps[:limit]
+        return [series[ts] for ts in stamps]
+
+    def _lookup(self, method: str, args: tuple, kwargs: dict) -> Any:
+        if method in _SERIES_METHODS:
+            return self._series_slice(method, args, kwargs)
+        key = _request_key(method, args, kwargs)
+        responses = self._responses.get(key)
+        if not responses:
+            raise KeyError(f"No recorded response for {method} args={list(args)} kwargs={kwargs}")
+        index = min(self._served[key], len(responses) - 1)
+        self._served[key] += 1
+        return responses[index]
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in RECORDED_METHODS:
+            raise AttributeError(name)
+
+        def replay(*args, **kwargs):
+            if self.latency:
+                time.sleep(self.latency)
+            return self._lookup(name, args, kwargs)
+        return replay
+
+
+class AsyncReplayClient(ReplayClient):
+    """`ReplayClient` with awaitable methods, for the `ccxt.async_support` path."""
+
+    async def load_markets(self, reload: bool = False) -> Dict[str, Any]:
+        return {}
+
+    async def close(self) -> None:
+        pass
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in RECORDED_METHODS:
+            raise AttributeError(name)
+
+        async def replay(*args, **kwargs):
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            return self._lookup(name, args, kwargs)
+        return replay
+
+
+@contextlib.contextmanager
+def use_cassette(path: str, latency: float = 0.0) -> Iterator[ReplayClient]:
+    """
+    Route every pooled (sync and async) Bybit client to a replay of `path`.
+
+    The shared bar store and kline stream are disabled and the market cache
+    cleared for the duration so replayed bars never mix with live data.
+    """
+    previous_config = get_config()
+    client = ReplayClient(path, latency=latency)
+    set_client(client)
+    set_async_client(AsyncReplayClient(path, latency=latency))
+    set_config({"bar_store_enabled": False, "kline_stream_enabled": False})
+    get_market_cache().clear()
+    try:
+        yield client
+    finally:
+        set_config(previous_config)
+        reset_clients()
+        get_market_cache().clear()
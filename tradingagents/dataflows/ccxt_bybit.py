@@ -2,48 +2,439 @@
 CCXT-based data access for Bybit USDT perpetual markets.
 
 Network calls are only made when no client is injected. In tests, pass a dummy
-client with a `fetch_ohlcv`/`fetch_order_book`/`fetch_funding_rate` method to
-avoid network usage.
+client with a `fetch_ohlcv(symbol, timeframe, since, limit)`/`fetch_order_book`/
+`fetch_funding_rate` method to avoid network usage.
 """
 
 from __future__ import annotations
 
 import datetime as dt
-from typing import Any, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
-try:
-    import ccxt  # type: ignore
-except ImportError:  # pragma: no cover - handled by test injection
-    ccxt = None
+from .bar_store import BarStore
+from .ccxt_pool import get_client
+from .config import get_config
+from .derivatives_stats import (
+    DEFAULT_HORIZONS,
+    FUNDING_SERIES,
+    OPEN_INTEREST_KEYS,
+    PREDICTED_FUNDING_SERIES,
+    VALUE_COLUMNS,
+    format_funding_stats,
+    format_open_interest_stats,
+    funding_stats,
+    open_interest_stats,
+    open_interest_series,
+    records_frame,
+)
+from .kline_stream import CcxtProKlineFeed, KlineFeed, KlineStreamHub, get_stream_hub
+from .ohlcv_arrays import COMPACT_DTYPE, PRICE_COLUMNS, OhlcvArrays
+from .orderbook_analytics import DEFAULT_WINDOWS_PCT, analyze_orderbook, format_orderbook_analytics
+from .orderbook_sampler import (
+    OrderbookSampler,
+    format_rolling_stats,
+    get_orderbook_sampler,
+    set_orderbook_sampler,
+)
+from .rate_limiter import get_rate_limiter
+from .resample import resample_ohlcv
+from .timeframes import timeframe_to_ms as _timeframe_to_ms
 
 
 def _ensure_client():
-    if ccxt is None:
-        raise RuntimeError(
-            "ccxt is required for live data. Install ccxt or inject a client in tests."
-        )
-    return ccxt.bybit()
-
-
-def _parse_dates_to_limit(start_date: str, end_date: str, timeframe: str) -> int:
-    """Convert date range to an approximate bar count."""
-    start = dt.datetime.strptime(start_date, "%Y-%m-%d")
-    end = dt.datetime.strptime(end_date, "%Y-%m-%d")
-    delta_minutes = (end - start).total_seconds() / 60.0
-    tf_map = {
-        "1m": 1,
-        "5m": 5,
-        "15m": 15,
-        "30m": 30,
-        "1h": 60,
-        "4h": 240,
-        "1d": 1440,
+    return get_client("bybit")
+
+
+def _call(client: Any, endpoint: str, *args, **kwargs) -> Any:
+    """Invoke a client endpoint after taking its weight from the shared Bybit budget."""
+    get_rate_limiter().acquire("bybit", endpoint)
+    return getattr(client, endpoint)(*args, **kwargs)
+
+
+# Bybit's kline endpoint returns at most this many bars per request.
+OHLCV_PAGE_LIMIT = 1000
+# Upper bound on concurrent page requests for a single OHLCV range.
+MAX_PAGE_WORKERS = 4
+# Bybit returns at most this many funding / open interest records per request.
+HISTORY_PAGE_LIMIT = 200
+
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _date_window_ms(start_date: str, end_date: str) -> Tuple[int, int]:
+    """
+    Convert an inclusive "YYYY-MM-DD" date range to a UTC [since, until) window in ms.
+    """
+    start = dt.datetime.strptime(start_date, "%Y-%m-%d").replace(tzinfo=dt.timezone.utc)
+    end = dt.datetime.strptime(end_date, "%Y-%m-%d").replace(tzinfo=dt.timezone.utc)
+    end += dt.timedelta(days=1)
+    return int(start.timestamp() * 1000), int(end.timestamp() * 1000)
+
+
+def _page_starts(since_ms: int, until_ms: int, tf_ms: int, page_limit: int) -> List[int]:
+    return list(range(since_ms, until_ms, tf_ms * page_limit))
+
+
+def _stitch_pages(pages: List[List[List[Any]]], since_ms: int, until_ms: int) -> pd.DataFrame:
+    """Concatenate pages, drop duplicate timestamps and clip to [since, until)."""
+    rows = [row[:6] for page in pages if page for row in page]
+    if not rows:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    df = pd.DataFrame(rows, columns=OHLCV_COLUMNS)
+    df = df.astype({c: "float64" for c in OHLCV_COLUMNS[1:]})
+    df["timestamp"] = df["timestamp"].astype("int64")
+    df = df[(df["timestamp"] >= since_ms) & (df["timestamp"] < until_ms)]
+    # Later pages carry the freshest copy of an overlapping bar
+    df = df.drop_duplicates(subset="timestamp", keep="last")
+    return df.sort_values("timestamp").reset_index(drop=True)
+
+
+def fetch_ohlcv_range(
+    client: Any,
+    symbol: str,
+    timeframe: str,
+    since_ms: int,
+    until_ms: int,
+    page_limit: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Fetch every bar in [since_ms, until_ms) by paging `fetch_ohlcv` with `since`.
+
+    Page boundaries are known up front from the timeframe, so pages are requested
+    concurrently (bounded by `max_workers` and the shared Bybit rate limiter)
+    and then stitched in order.
+    """
+    page_limit = page_limit or OHLCV_PAGE_LIMIT
+    max_workers = max_workers or MAX_PAGE_WORKERS
+    tf_ms = _timeframe_to_ms(timeframe)
+    until_ms = min(until_ms, _now_ms() + tf_ms)
+    starts = _page_starts(since_ms, until_ms, tf_ms, page_limit)
+    if not starts:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+    def fetch_page(page_since: int) -> List[List[Any]]:
+        remaining = -(-(until_ms - page_since) // tf_ms)
+        limit = min(page_limit, remaining)
+        return _call(client, "fetch_ohlcv", symbol, timeframe=timeframe, since=page_since, limit=limit)
+
+    if len(starts) == 1 or max_workers == 1:
+        pages = [fetch_page(s) for s in starts]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(starts))) as pool:
+            pages = list(pool.map(fetch_page, starts))
+    return _stitch_pages(pages, since_ms, until_ms)
+
+
+def _format_ohlcv(df: pd.DataFrame, symbol: str, timeframe: str) -> str:
+    if df.empty:
+        return f"# No data returned for {symbol} {timeframe}\n"
+    out = df[OHLCV_COLUMNS].copy()
+    out["datetime"] = pd.to_datetime(out["timestamp"], unit="ms")
+    out = out[["datetime", "open", "high", "low", "close", "volume"]]
+    header = f"# Bybit OHLCV for {symbol} timeframe={timeframe} rows={len(out)}\n"
+    return header + out.to_csv(index=False)
+
+
+_default_store: Optional[BarStore] = None
+
+
+def get_bar_store() -> Optional[BarStore]:
+    """Return the shared bar store under `data_cache_dir`, or None if disabled."""
+    global _default_store
+    config = get_config()
+    if not config.get("bar_store_enabled", True):
+        return None
+    root = config["data_cache_dir"]
+    if _default_store is None or _default_store.cache_dir != root:
+        _default_store = BarStore(root)
+    return _default_store
+
+
+_default_derivatives_store: Optional[BarStore] = None
+
+
+def get_derivatives_store() -> Optional[BarStore]:
+    """Shared funding/open-interest history store, or None if the bar store is disabled."""
+    global _default_derivatives_store
+    config = get_config()
+    if not config.get("bar_store_enabled", True):
+        return None
+    root = config["data_cache_dir"]
+    if _default_derivatives_store is None or _default_derivatives_store.cache_dir != root:
+        _default_derivatives_store = BarStore(root, columns=VALUE_COLUMNS, kind="derivatives")
+    return _default_derivatives_store
+
+
+def _current_bar_open(timeframe: str) -> int:
+    tf_ms = _timeframe_to_ms(timeframe)
+    return _now_ms() // tf_ms * tf_ms
+
+
+def _missing_ranges(
+    store: BarStore, symbol: str, timeframe: str, since_ms: int, until_ms: int
+) -> List[Tuple[int, int]]:
+    """
+    Ranges that must be downloaded to serve [since_ms, until_ms) from the store.
+
+    Only the parts of the window outside the store's coverage segments are
+    returned, so a store last synced long ago never pulls the whole gap up to
+    the requested window; that gap stays uncovered until a window needs it.
+    The forming bar is never stored and is always fetched.
+    """
+    tf_ms = _timeframe_to_ms(timeframe)
+    end = min(until_ms, _current_bar_open(timeframe) + tf_ms)
+    ranges = []
+    cursor = since_ms
+    for lo, hi in store.coverage(symbol, timeframe):
+        if hi <= cursor:
+            continue
+        if lo >= end:
+            break
+        if lo > cursor:
+            ranges.append((cursor, lo))
+        cursor = max(cursor, hi)
+    if cursor < end:
+        ranges.append((cursor, end))
+    # Skip slivers that contain no bar open time
+    return [(lo, hi) for lo, hi in ranges if -(-lo // tf_ms) * tf_ms < hi]
+
+
+def _persist_fetched(
+    store: BarStore,
+    symbol: str,
+    timeframe: str,
+    since_ms: int,
+    until_ms: int,
+    fetched: List[pd.DataFrame],
+) -> List[pd.DataFrame]:
+    """Persist closed bars from `fetched`; returns the non-empty forming-bar frames."""
+    current_open = _current_bar_open(timeframe)
+    live = []
+    for frame in fetched:
+        closed = frame[frame["timestamp"] < current_open]
+        last = store.last_timestamp(symbol, timeframe)
+        if last is None or closed.empty or closed["timestamp"].iloc[0] > last:
+            store.append(symbol, timeframe, closed)
+        else:
+            store.rewrite(symbol, timeframe, closed)
+        live.append(frame[frame["timestamp"] >= current_open])
+
+    store.add_coverage(symbol, timeframe, since_ms, min(until_ms, current_open))
+    return [f for f in live if not f.empty]
+
+
+def _apply_fetched(
+    store: BarStore,
+    symbol: str,
+    timeframe: str,
+    since_ms: int,
+    until_ms: int,
+    fetched: List[pd.DataFrame],
+) -> pd.DataFrame:
+    """Persist closed bars from `fetched` and return the requested window."""
+    live = _persist_fetched(store, symbol, timeframe, since_ms, until_ms, fetched)
+    stored = store.read(symbol, timeframe, since_ms, until_ms)
+    if not live:
+        return stored
+    return pd.concat([stored] + live, ignore_index=True)
+
+
+def _stored_arrays(
+    store: BarStore,
+    symbol: str,
+    timeframe: str,
+    since_ms: int,
+    until_ms: int,
+    live: List[pd.DataFrame],
+    dtype: Any,
+) -> OhlcvArrays:
+    """
+    The stored window plus `live` forming bars as `OhlcvArrays`, converted from
+    the store's memory-mapped columns straight into `dtype`.
+    """
+    arrays = store.read_arrays(symbol, timeframe, since_ms, until_ms)
+    if not live:
+        return OhlcvArrays(arrays["timestamp"], arrays, dtype)
+    tail = pd.concat(live, ignore_index=True)
+    timestamp = np.concatenate([arrays["timestamp"], tail["timestamp"].to_numpy(dtype=np.int64)])
+    columns = {
+        c: np.concatenate([np.asarray(arrays[c], dtype=dtype), tail[c].to_numpy(dtype=dtype)]) for c in PRICE_COLUMNS
     }
-    minutes_per_bar = tf_map.get(timeframe, 15)
-    limit = int(delta_minutes / minutes_per_bar) + 10  # small buffer
-    return max(limit, 50)
+    return OhlcvArrays(timestamp, columns, dtype)
+
+
+def sync_ohlcv(
+    store: BarStore,
+    client: Any,
+    symbol: str,
+    timeframe: str,
+    since_ms: int,
+    until_ms: int,
+) -> pd.DataFrame:
+    """
+    Bring the store up to date for [since_ms, until_ms) and return that window.
+
+    Only bars after the last stored timestamp (and, when an older window is
+    requested, bars before the first synced one) are downloaded. Closed bars are
+    persisted; the still-forming bar is returned but never written, so the store
+    only ever grows by appending final values.
+    """
+    fetched = [
+        fetch_ohlcv_range(client, symbol, timeframe, lo, hi)
+        for lo, hi in _missing_ranges(store, symbol, timeframe, since_ms, until_ms)
+    ]
+    return _apply_fetched(store, symbol, timeframe, since_ms, until_ms, fetched)
+
+
+def _resample_base(
+    symbol: str,
+    timeframe: str,
+    since_ms: int,
+    until_ms: int,
+    client: Any = None,
+    store: Optional[BarStore] = None,
+) -> Optional[str]:
+    """
+    Base timeframe `timeframe` is derived from locally, or None to fetch it directly.
+
+    Deriving only pays off when the base bars are already at hand: buffered by
+    the live stream, or stored apart from at most one page to top up. A cold
+    window (a year of 1d is ~35k 15m bars) is fetched at its own timeframe.
+    """
+    config = get_config()
+    base = config.get("ohlcv_base_timeframe")
+    if not base or timeframe == base or timeframe not in config.get("resampled_timeframes", []):
+        return None
+    if _stream_covers(symbol, base, since_ms, until_ms, client):
+        return base
+    if store is not None:
+        missing = sum(hi - lo for lo, hi in _missing_ranges(store, symbol, base, since_ms, until_ms))
+    else:
+        missing = min(until_ms, _current_bar_open(base) + _timeframe_to_ms(base)) - since_ms
+    return base if missing <= OHLCV_PAGE_LIMIT * _timeframe_to_ms(base) else None
+
+
+def _derive_timeframe(df: pd.DataFrame, base: str, timeframe: str) -> pd.DataFrame:
+    out = resample_ohlcv(df, base, timeframe, keep_partial_last=True, now_ms=_now_ms())
+    out["datetime"] = pd.to_datetime(out["timestamp"], unit="ms")
+    return out
+
+
+def _stream_covers(symbol: str, timeframe: str, since_ms: int, until_ms: int, client: Any = None) -> bool:
+    if client is not None or not get_config().get("kline_stream_enabled", True):
+        return False
+    return get_stream_hub().covers(symbol, timeframe, since_ms, until_ms, _now_ms())
+
+
+def _streamed_window(
+    symbol: str, timeframe: str, since_ms: int, until_ms: int, client: Any = None
+) -> Optional[pd.DataFrame]:
+    """
+    The window from the live kline buffer if it covers it up to the current bar.
+    An injected client (replay, tests) is always answered from that client instead.
+    """
+    if not _stream_covers(symbol, timeframe, since_ms, until_ms, client):
+        return None
+    df = get_stream_hub().window(symbol, timeframe, since_ms, until_ms)
+    df["datetime"] = pd.to_datetime(df["timestamp"], unit="ms")
+    return df
+
+
+def load_ohlcv_df(
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    timeframe: str = "15m",
+    client: Any = None,
+    store: Optional[BarStore] = None,
+) -> pd.DataFrame:
+    """
+    Load OHLCV bars for an inclusive date range as a DataFrame.
+
+    With the default client the shared bar store is used, so repeated calls only
+    download the delta since the last stored bar. An injected client is only
+    paired with an explicitly injected store, which keeps dummy or replayed data
+    out of the shared cache.
+
+    Timeframes listed in `resampled_timeframes` are built from the configured
+    `ohlcv_base_timeframe` series instead of being downloaded separately. A live
+    kline stream covering the window (see `kline_stream`) answers without any
+    request.
+    """
+    since_ms, until_ms = _date_window_ms(start_date, end_date)
+    return load_ohlcv_window(symbol, since_ms, until_ms, timeframe, client=client, store=store)
+
+
+def load_ohlcv_window(
+    symbol: str,
+    since_ms: int,
+    until_ms: int,
+    timeframe: str = "15m",
+    client: Any = None,
+    store: Optional[BarStore] = None,
+) -> pd.DataFrame:
+    """`load_ohlcv_df` for an exact [since_ms, until_ms) window instead of whole days."""
+    if client is None:
+        store = store or get_bar_store()
+    base = _resample_base(symbol, timeframe, since_ms, until_ms, client, store)
+    if base is not None:
+        df = load_ohlcv_window(symbol, since_ms, until_ms, base, client=client, store=store)
+        return _derive_timeframe(df, base, timeframe)
+
+    streamed = _streamed_window(symbol, timeframe, since_ms, until_ms, client)
+    if streamed is not None:
+        return streamed
+    c = client or _ensure_client()
+    if store is not None:
+        df = sync_ohlcv(store, c, symbol, timeframe, since_ms, until_ms)
+    else:
+        df = fetch_ohlcv_range(c, symbol, timeframe, since_ms, until_ms)
+    df = df.reset_index(drop=True)
+    df["datetime"] = pd.to_datetime(df["timestamp"], unit="ms")
+    return df
+
+
+def load_ohlcv_arrays(
+    symbol: str,
+    since_ms: int,
+    until_ms: int,
+    timeframe: str = "15m",
+    client: Any = None,
+    store: Optional[BarStore] = None,
+    dtype: Any = COMPACT_DTYPE,
+) -> OhlcvArrays:
+    """
+    `load_ohlcv_window` as compact `OhlcvArrays` (float32 prices by default) for long histories.
+
+    A window served from the bar store is read from its memory-mapped columns
+    straight into `dtype`, without the float64 DataFrame in between. Resampled
+    timeframes, live-stream windows and loads without a store are converted
+    from the `load_ohlcv_window` frame.
+    """
+    if client is None:
+        store = store or get_bar_store()
+    if store is None or _resample_base(symbol, timeframe, since_ms, until_ms, client, store) is not None:
+        return OhlcvArrays.from_frame(load_ohlcv_window(symbol, since_ms, until_ms, timeframe, client, store), dtype)
+    streamed = _streamed_window(symbol, timeframe, since_ms, until_ms, client)
+    if streamed is not None:
+        return OhlcvArrays.from_frame(streamed, dtype)
+    c = client or _ensure_client()
+    fetched = [
+        fetch_ohlcv_range(c, symbol, timeframe, lo, hi)
+        for lo, hi in _missing_ranges(store, symbol, timeframe, since_ms, until_ms)
+    ]
+    live = _persist_fetched(store, symbol, timeframe, since_ms, until_ms, fetched)
+    return _stored_arrays(store, symbol, timeframe, since_ms, until_ms, live, dtype)
 
 
 def get_ohlcv_bybit(
@@ -52,102 +443,312 @@ def get_ohlcv_bybit(
     end_date: str,
     timeframe: str = "15m",
     client: Any = None,
+    store: Optional[BarStore] = None,
 ) -> str:
     """
-    Fetch OHLCV for a symbol between dates (approximate by limit) from Bybit.
+    Fetch OHLCV for a symbol between dates (inclusive, UTC) from Bybit.
+
+    The range is paged with `since` so windows longer than one exchange page
+    are returned in full, and served from the local bar store when enabled.
 
     Args:
         symbol: e.g., "BTC/USDT"
         start_date: "YYYY-MM-DD"
-        end_date: "YYYY-MM-DD"
+        end_date: "YYYY-MM-DD" (the whole day is included)
         timeframe: ccxt timeframe, default 15m
         client: optional ccxt.bybit instance (for tests, pass a dummy)
+        store: optional BarStore (defaults to the shared store for live clients)
     Returns:
         CSV-formatted string with header
     """
-    limit = _parse_dates_to_limit(start_date, end_date, timeframe)
-    c = client or _ensure_client()
-    ohlcv: List[List[Any]] = c.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
+    df = load_ohlcv_df(symbol, start_date, end_date, timeframe, client=client, store=store)
+    return _format_ohlcv(df, symbol, timeframe)
+
+
+def _summarize_orderbook(ob: Any, symbol: str, price_window_pct: float) -> str:
+    if not ob or "bids" not in ob or "asks" not in ob or not ob["bids"] or not ob["asks"]:
+        return f"# No orderbook data for {symbol}\n"
+
+    windows = sorted(set(DEFAULT_WINDOWS_PCT) | {price_window_pct})
+    return _format_orderbook_stats(analyze_orderbook(ob, windows_pct=windows), symbol, price_window_pct)
 
-    if not ohlcv:
-        return f"# No data returned for {symbol} {timeframe}\n"
 
-    df = pd.DataFrame(
-        ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"]
+def _format_orderbook_stats(stats: Any, symbol: str, price_window_pct: float) -> str:
+    primary = next(w for w in stats["windows"] if abs(w["window_pct"] - price_window_pct * 100) < 1e-9)
+    return (
+        f"# Orderbook window +/-{price_window_pct*100:.2f}% for {symbol}\n"
+        f"best_bid={stats['best_bid']}, best_ask={stats['best_ask']}, mid={stats['mid']}\n"
+        f"bid_volume={primary['bid_volume']}, ask_volume={primary['ask_volume']}, "
+        f"imbalance={primary['imbalance']:.3f}\n"
+        f"# Depth by window (+/-% around mid)\n" + format_orderbook_analytics(stats)
     )
-    df["datetime"] = pd.to_datetime(df["timestamp"], unit="ms")
-    df = df[["datetime", "open", "high", "low", "close", "volume"]]
 
-    header = f"# Bybit OHLCV for {symbol} timeframe={timeframe} rows={len(df)}\n"
-    return header + df.to_csv(index=False)
 
+def _history_lookback_start() -> int:
+    return _now_ms() - int(get_config().get("derivatives_history_days", 30)) * 86_400_000
 
-def get_orderbook_window(
+
+def _history_since(store: Optional[BarStore], symbol: str, series: str, start: int) -> int:
+    """First timestamp to download: right after the stored history, or the look-back start."""
+    last = store.last_timestamp(symbol, series) if store is not None else None
+    return start if last is None else max(start, last + 1)
+
+
+def _next_history_cursor(page: Any, cursor: int) -> Optional[int]:
+    """`since` for the following page, or None once the history is exhausted."""
+    if not page or len(page) < HISTORY_PAGE_LIMIT:
+        return None
+    nxt = max(int(r["timestamp"]) for r in page) + 1
+    return nxt if nxt > cursor else None
+
+
+def _history_window(
+    store: Optional[BarStore], symbol: str, series: str, fetched: pd.DataFrame, start: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Persist newly fetched points and return the window from `start` as arrays.
+    The first stored batch records its value key as the series' units.
+    """
+    if store is None:
+        window = fetched[fetched["timestamp"] >= start]
+        return window["timestamp"].to_numpy(), window["value"].to_numpy()
+    if store.append(symbol, series, fetched) and "value_key" not in store.meta(symbol, series):
+        store.set_meta(symbol, series, value_key=fetched.attrs.get("value_key"))
+    arrays = store.read_arrays(symbol, series, since_ms=start)
+    return np.asarray(arrays["timestamp"]), np.asarray(arrays["value"])
+
+
+def _series_value_keys(
+    store: Optional[BarStore], symbol: str, series: str, value_keys: Sequence[str]
+) -> List[str]:
+    """
+    Value keys to accept for `series`: only its recorded key once it holds data
+    (so a batch without it is dropped rather than mixing units), else all of
+    `value_keys`. Series stored before keys were recorded used the first one.
+    """
+    if store is None or not store.length(symbol, series):
+        return list(value_keys)
+    return [store.meta(symbol, series).get("value_key") or value_keys[0]]
+
+
+def fetch_history(
+    client: Any, endpoint: str, symbol: str, since_ms: int, value_keys: Sequence[str], **kwargs
+) -> pd.DataFrame:
+    """Page a since-based history endpoint forward from `since_ms` into a (timestamp, value) frame."""
+    records: List[Any] = []
+    cursor: Optional[int] = since_ms
+    while cursor is not None:
+        page = _call(client, endpoint, symbol, since=cursor, limit=HISTORY_PAGE_LIMIT, **kwargs)
+        records.extend(page or [])
+        cursor = _next_history_cursor(page, cursor)
+    return records_frame(records, value_keys)
+
+
+def sync_funding_history(
+    client: Any, symbol: str, store: Optional[BarStore] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Settled funding rates over the look-back window; only new settlements are downloaded."""
+    start = _history_lookback_start()
+    since = _history_since(store, symbol, FUNDING_SERIES, start)
+    fetched = fetch_history(client, "fetch_funding_rate_history", symbol, since, ["fundingRate"])
+    return _history_window(store, symbol, FUNDING_SERIES, fetched, start)
+
+
+def sync_open_interest_history(
+    client: Any, symbol: str, timeframe: str, store: Optional[BarStore] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Open interest over the look-back window; only points after the stored ones are downloaded."""
+    series = open_interest_series(timeframe)
+    start = _history_lookback_start()
+    fetched = fetch_history(
+        client, "fetch_open_interest_history", symbol, _history_since(store, symbol, series, start),
+        _series_value_keys(store, symbol, series, OPEN_INTEREST_KEYS), timeframe=timeframe,
+    )
+    return _history_window(store, symbol, series, fetched, start)
+
+
+def _predicted_funding_window(
+    store: Optional[BarStore], symbol: str, funding: Any
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Record the current predicted rate as a sample and return the sampled window."""
+    sample = records_frame(
+        [{"timestamp": funding.get("timestamp") or _now_ms(), "fundingRate": funding.get("fundingRate")}],
+        ["fundingRate"],
+    )
+    return _history_window(store, symbol, PREDICTED_FUNDING_SERIES, sample, _history_lookback_start())
+
+
+def _horizons() -> List[str]:
+    return list(get_config().get("derivatives_horizons", DEFAULT_HORIZONS))
+
+
+def _format_funding(
+    funding: Any,
     symbol: str,
-    client: Any = None,
-    price_window_pct: float = 0.005,
+    settled: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    predicted: Optional[Tuple[np.ndarray, np.ndarray]] = None,
 ) -> str:
+    rate = funding.get("fundingRate")
+    ts = funding.get("timestamp")
+    ts_str = pd.to_datetime(ts, unit="ms") if ts else "unknown"
+    head = f"# Funding rate for {symbol}: {rate} at {ts_str}"
+    if settled is None and predicted is None:
+        return head
+    empty = (np.empty(0, dtype=np.int64), np.empty(0))
+    stats = funding_stats(*(settled or empty), *(predicted or empty), horizons=_horizons())
+    return head + "\n" + format_funding_stats(stats)
+
+
+def _format_open_interest_change(
+    history: Tuple[np.ndarray, np.ndarray], symbol: str, timeframe: str
+) -> str:
+    ts, values = history
+    if len(values) < 2:
+        return f"# Open interest insufficient data for {symbol}\n"
+
+    latest = float(values[-1])
+    prev = float(values[-2])
+    change = latest - prev
+    pct = (change / prev) * 100 if prev else 0.0
+    stats = open_interest_stats(ts, values, horizons=_horizons())
+    return (
+        f"# Open interest change for {symbol} ({timeframe}):\n"
+        f"latest={latest}, previous={prev}, change={change}, change_pct={pct:.2f}%\n"
+        "# Multi-horizon changes (z-score of the latest change vs its trailing distribution)\n"
+        + format_open_interest_stats(stats)
+    )
+
+
+def start_kline_stream(
+    subscriptions: Sequence[Tuple[str, str]],
+    feed: Optional[KlineFeed] = None,
+    client: Any = None,
+    store: Optional[BarStore] = None,
+) -> KlineStreamHub:
     """
-    Fetch orderbook and summarize imbalance within +/- price_window_pct.
+    Seed the process-wide kline buffers and attach a live feed to them.
+
+    Each (symbol, timeframe) buffer is first filled with up to
+    `kline_buffer_capacity` bars through the bar store (only the delta since the
+    last stored bar is downloaded), so the feed continues a contiguous series.
+    `feed` defaults to websocket klines via ccxt.pro. Stop it with
+    `get_stream_hub().stop()`.
     """
+    subscriptions = [(symbol, timeframe) for symbol, timeframe in subscriptions]
+    hub = get_stream_hub()
+    if client is None:
+        store = store or get_bar_store()
     c = client or _ensure_client()
-    ob = c.fetch_order_book(symbol)
-    if not ob or "bids" not in ob or "asks" not in ob or not ob["bids"] or not ob["asks"]:
-        return f"# No orderbook data for {symbol}\n"
+    for symbol, timeframe in subscriptions:
+        until_ms = _current_bar_open(timeframe) + _timeframe_to_ms(timeframe)
+        since_ms = until_ms - hub.capacity * _timeframe_to_ms(timeframe)
+        if store is not None:
+            df = sync_ohlcv(store, c, symbol, timeframe, since_ms, until_ms)
+        else:
+            df = fetch_ohlcv_range(c, symbol, timeframe, since_ms, until_ms)
+        hub.seed(symbol, timeframe, df)
+    hub.attach(feed or CcxtProKlineFeed(subscriptions))
+    return hub
+
+
+def start_orderbook_sampler(
+    symbols: List[str],
+    interval: Optional[float] = None,
+    client: Any = None,
+) -> OrderbookSampler:
+    """
+    Start (or replace) the process-wide background orderbook sampler.
 
-    best_bid = ob["bids"][0][0]
-    best_ask = ob["asks"][0][0]
-    mid = (best_bid + best_ask) / 2.0
-    lower = mid * (1 - price_window_pct)
-    upper = mid * (1 + price_window_pct)
+    Interval and ring size default to `orderbook_sampler_interval_seconds` and
+    `orderbook_sampler_capacity`; fetches share the Bybit rate limiter.
+    """
+    config = get_config()
+    c = client or _ensure_client()
+    sampler = OrderbookSampler(
+        lambda symbol: _call(c, "fetch_order_book", symbol),
+        symbols,
+        interval=interval or float(config.get("orderbook_sampler_interval_seconds", 2.0)),
+        capacity=int(config.get("orderbook_sampler_capacity", 900)),
+    )
+    set_orderbook_sampler(sampler)
+    sampler.start()
+    return sampler
 
-    bid_vol = sum(v for p, v in ob["bids"] if lower <= p <= upper)
-    ask_vol = sum(v for p, v in ob["asks"] if lower <= p <= upper)
-    imbalance = (bid_vol - ask_vol) / max(bid_vol + ask_vol, 1e-9)
 
+def _sampled_orderbook(symbol: str, price_window_pct: float) -> Optional[str]:
+    """Answer from the background sampler when it holds a fresh sample for `symbol`."""
+    sampler = get_orderbook_sampler()
+    if sampler is None or not sampler.is_fresh(symbol):
+        return None
+    if not any(abs(w - price_window_pct) < 1e-12 for w in sampler.windows_pct):
+        return None
+    latest = sampler.latest(symbol)
+    rolling = sampler.rolling_stats(symbol)
+    if latest is None or rolling is None:
+        return None
+    age = max(0.0, time.time() - latest["sampled_at"])
     return (
-        f"# Orderbook window +/-{price_window_pct*100:.2f}% for {symbol}\n"
-        f"best_bid={best_bid}, best_ask={best_ask}, mid={mid}\n"
-        f"bid_volume={bid_vol}, ask_volume={ask_vol}, imbalance={imbalance:.3f}\n"
+        _format_orderbook_stats(latest, symbol, price_window_pct)
+        + f"# Latest sample {age:.1f}s old\n"
+        + format_rolling_stats(rolling, sampler.interval)
     )
 
 
-def get_funding_rate(symbol: str, client: Any = None) -> str:
-    """Fetch latest funding rate if supported by ccxt."""
+def get_orderbook_window(
+    symbol: str,
+    client: Any = None,
+    price_window_pct: float = 0.005,
+) -> str:
+    """
+    Fetch orderbook and summarize imbalance within +/- price_window_pct, plus
+    depth, imbalance, sweep VWAP and walls for the standard set of windows.
+
+    When the background sampler watches the symbol, the latest sample and the
+    rolling averages are returned from memory without a request.
+    """
+    if client is None:
+        sampled = _sampled_orderbook(symbol, price_window_pct)
+        if sampled is not None:
+            return sampled
+    c = client or _ensure_client()
+    ob = _call(c, "fetch_order_book", symbol)
+    return _summarize_orderbook(ob, symbol, price_window_pct)
+
+
+def get_funding_rate(symbol: str, client: Any = None, store: Optional[BarStore] = None) -> str:
+    """
+    Fetch the current (predicted) funding rate, plus settled-history level and
+    z-score and the predicted-rate trend from the local funding history.
+    """
     c = client or _ensure_client()
+    if client is None:
+        store = store or get_derivatives_store()
     try:
-        funding = c.fetch_funding_rate(symbol)
+        funding = _call(c, "fetch_funding_rate", symbol)
     except Exception as e:  # pragma: no cover - ccxt specific
         return f"# Funding rate unavailable for {symbol}: {e}"
-
-    rate = funding.get("fundingRate")
-    ts = funding.get("timestamp")
-    ts_str = pd.to_datetime(ts, unit="ms") if ts else "unknown"
-    return f"# Funding rate for {symbol}: {rate} at {ts_str}"
+    try:
+        settled = sync_funding_history(c, symbol, store)
+    except Exception as e:
+        return _format_funding(funding, symbol) + f"\n# Funding history unavailable: {e}\n"
+    return _format_funding(funding, symbol, settled, _predicted_funding_window(store, symbol, funding))
 
 
 def get_open_interest_change(
     symbol: str,
     timeframe: str = "1h",
     client: Any = None,
+    store: Optional[BarStore] = None,
 ) -> str:
     """
-    Fetch open interest history and compute last change.
+    Sync open interest history (delta only when a store is used) and report the
+    last change plus 1h/4h/24h changes with z-scores.
     """
     c = client or _ensure_client()
+    if client is None:
+        store = store or get_derivatives_store()
     try:
-        history = c.fetch_open_interest_history(symbol, timeframe=timeframe, limit=30)
+        history = sync_open_interest_history(c, symbol, timeframe, store)
     except Exception as e:  # pragma: no cover - ccxt specific
         return f"# Open interest unavailable for {symbol}: {e}"
-
-    if not history or len(history) < 2:
-        return f"# Open interest insufficient data for {symbol}\n"
-
-    latest = history[-1]["openInterestAmount"]
-    prev = history[-2]["openInterestAmount"]
-    change = latest - prev
-    pct = (change / prev) * 100 if prev else 0.0
-    return (
-        f"# Open interest change for {symbol} ({timeframe}):\n"
-        f"latest={latest}, previous={prev}, change={change}, change_pct={pct:.2f}%"
-    )
+    return _format_open_interest_change(history, symbol, timeframe)
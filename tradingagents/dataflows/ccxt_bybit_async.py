@@ -0,0 +1,291 @@
+"""
+Asyncio counterparts of the Bybit dataflows in `ccxt_bybit`, built on
+`ccxt.async_support`.
+
+The functions return exactly what their blocking versions return; they share the
+same paging, bar-store and formatting helpers and only differ in how the exchange
+is awaited. `aget_market_snapshot` fetches OHLCV, orderbook, funding and open
+interest for one symbol concurrently.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from .bar_store import BarStore
+from .ccxt_bybit import (
+    MAX_PAGE_WORKERS,
+    OHLCV_COLUMNS,
+    OHLCV_PAGE_LIMIT,
+    FUNDING_SERIES,
+    HISTORY_PAGE_LIMIT,
+    PREDICTED_FUNDING_SERIES,
+    _apply_fetched,
+    _date_window_ms,
+    _derive_timeframe,
+    _format_funding,
+    _format_ohlcv,
+    _format_open_interest_change,
+    _history_lookback_start,
+    _history_since,
+    _history_window,
+    _missing_ranges,
+    _next_history_cursor,
+    _now_ms,
+    _page_starts,
+    _persist_fetched,
+    _predicted_funding_window,
+    _resample_base,
+    _sampled_orderbook,
+    _series_value_keys,
+    _stitch_pages,
+    _stored_arrays,
+    _streamed_window,
+    _summarize_orderbook,
+    _timeframe_to_ms,
+    get_bar_store,
+    get_derivatives_store,
+)
+from .derivatives_stats import OPEN_INTEREST_KEYS, open_interest_series, records_frame
+from .ccxt_pool import get_async_client
+from .ohlcv_arrays import COMPACT_DTYPE, OhlcvArrays
+from .rate_limiter import get_rate_limiter
+
+
+async def _ensure_client():
+    return await get_async_client("bybit")
+
+
+async def _acall(client: Any, endpoint: str, *args, **kwargs) -> Any:
+    """Await a client endpoint after taking its weight from the shared Bybit budget."""
+    await get_rate_limiter().aacquire("bybit", endpoint)
+    return await getattr(client, endpoint)(*args, **kwargs)
+
+
+async def afetch_ohlcv_range(
+    client: Any,
+    symbol: str,
+    timeframe: str,
+    since_ms: int,
+    until_ms: int,
+    page_limit: Optional[int] = None,
+    max_concurrency: Optional[int] = None,
+) -> pd.DataFrame:
+    """Async version of `ccxt_bybit.fetch_ohlcv_range`; pages are gathered concurrently."""
+    page_limit = page_limit or OHLCV_PAGE_LIMIT
+    semaphore = asyncio.Semaphore(max_concurrency or MAX_PAGE_WORKERS)
+    tf_ms = _timeframe_to_ms(timeframe)
+    until_ms = min(until_ms, _now_ms() + tf_ms)
+    starts = _page_starts(since_ms, until_ms, tf_ms, page_limit)
+    if not starts:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+    async def fetch_page(page_since: int) -> List[List[Any]]:
+        remaining = -(-(until_ms - page_since) // tf_ms)
+        async with semaphore:
+            return await _acall(
+                client, "fetch_ohlcv", symbol, timeframe=timeframe, since=page_since,
+                limit=min(page_limit, remaining),
+            )
+
+    pages = await asyncio.gather(*(fetch_page(s) for s in starts))
+    return _stitch_pages(list(pages), since_ms, until_ms)
+
+
+async def async_sync_ohlcv(
+    store: BarStore,
+    client: Any,
+    symbol: str,
+    timeframe: str,
+    since_ms: int,
+    until_ms: int,
+) -> pd.DataFrame:
+    """Async version of `ccxt_bybit.sync_ohlcv`."""
+    ranges = _missing_ranges(store, symbol, timeframe, since_ms, until_ms)
+    fetched = await asyncio.gather(
+        *(afetch_ohlcv_range(client, symbol, timeframe, lo, hi) for lo, hi in ranges)
+    )
+    return _apply_fetched(store, symbol, timeframe, since_ms, until_ms, list(fetched))
+
+
+async def aload_ohlcv_df(
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    timeframe: str = "15m",
+    client: Any = None,
+    store: Optional[BarStore] = None,
+) -> pd.DataFrame:
+    """Async version of `ccxt_bybit.load_ohlcv_df`."""
+    since_ms, until_ms = _date_window_ms(start_date, end_date)
+    return await aload_ohlcv_window(symbol, since_ms, until_ms, timeframe, client=client, store=store)
+
+
+async def aload_ohlcv_window(
+    symbol: str,
+    since_ms: int,
+    until_ms: int,
+    timeframe: str = "15m",
+    client: Any = None,
+    store: Optional[BarStore] = None,
+) -> pd.DataFrame:
+    """Async version of `ccxt_bybit.load_ohlcv_window`."""
+    if client is None:
+        store = store or get_bar_store()
+    base = _resample_base(symbol, timeframe, since_ms, until_ms, client, store)
+    if base is not None:
+        df = await aload_ohlcv_window(symbol, since_ms, until_ms, base, client=client, store=store)
+        return _derive_timeframe(df, base, timeframe)
+
+    streamed = _streamed_window(symbol, timeframe, since_ms, until_ms, client)
+    if streamed is not None:
+        return streamed
+    c = client or await _ensure_client()
+    if store is not None:
+        df = await async_sync_ohlcv(store, c, symbol, timeframe, since_ms, until_ms)
+    else:
+        df = await afetch_ohlcv_range(c, symbol, timeframe, since_ms, until_ms)
+    df = df.reset_index(drop=True)
+    df["datetime"] = pd.to_datetime(df["timestamp"], unit="ms")
+    return df
+
+
+async def aload_ohlcv_arrays(
+    symbol: str,
+    since_ms: int,
+    until_ms: int,
+    timeframe: str = "15m",
+    client: Any = None,
+    store: Optional[BarStore] = None,
+    dtype: Any = COMPACT_DTYPE,
+) -> OhlcvArrays:
+    """Async version of `ccxt_bybit.load_ohlcv_arrays`."""
+    if client is None:
+        store = store or get_bar_store()
+    if store is None or _resample_base(symbol, timeframe, since_ms, until_ms, client, store) is not None:
+        df = await aload_ohlcv_window(symbol, since_ms, until_ms, timeframe, client=client, store=store)
+        return OhlcvArrays.from_frame(df, dtype)
+    streamed = _streamed_window(symbol, timeframe, since_ms, until_ms, client)
+    if streamed is not None:
+        return OhlcvArrays.from_frame(streamed, dtype)
+    c = client or await _ensure_client()
+    ranges = _missing_ranges(store, symbol, timeframe, since_ms, until_ms)
+    fetched = await asyncio.gather(
+        *(afetch_ohlcv_range(c, symbol, timeframe, lo, hi) for lo, hi in ranges)
+    )
+    live = _persist_fetched(store, symbol, timeframe, since_ms, until_ms, list(fetched))
+    return _stored_arrays(store, symbol, timeframe, since_ms, until_ms, live, dtype)
+
+
+async def aget_ohlcv_bybit(
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    timeframe: str = "15m",
+    client: Any = None,
+    store: Optional[BarStore] = None,
+) -> str:
+    """Async version of `ccxt_bybit.get_ohlcv_bybit`."""
+    df = await aload_ohlcv_df(symbol, start_date, end_date, timeframe, client=client, store=store)
+    return _format_ohlcv(df, symbol, timeframe)
+
+
+async def aget_orderbook_window(
+    symbol: str,
+    client: Any = None,
+    price_window_pct: float = 0.005,
+) -> str:
+    """Async version of `ccxt_bybit.get_orderbook_window`."""
+    if client is None:
+        sampled = _sampled_orderbook(symbol, price_window_pct)
+        if sampled is not None:
+            return sampled
+    c = client or await _ensure_client()
+    ob = await _acall(c, "fetch_order_book", symbol)
+    return _summarize_orderbook(ob, symbol, price_window_pct)
+
+
+async def afetch_history(
+    client: Any, endpoint: str, symbol: str, since_ms: int, value_keys: Sequence[str], **kwargs
+) -> pd.DataFrame:
+    """Async version of `ccxt_bybit.fetch_history`."""
+    records: List[Any] = []
+    cursor: Optional[int] = since_ms
+    while cursor is not None:
+        page = await _acall(client, endpoint, symbol, since=cursor, limit=HISTORY_PAGE_LIMIT, **kwargs)
+        records.extend(page or [])
+        cursor = _next_history_cursor(page, cursor)
+    return records_frame(records, value_keys)
+
+
+async def aget_funding_rate(symbol: str, client: Any = None, store: Optional[BarStore] = None) -> str:
+    """Async version of `ccxt_bybit.get_funding_rate`."""
+    c = client or await _ensure_client()
+    if client is None:
+        store = store or get_derivatives_store()
+    try:
+        funding = await _acall(c, "fetch_funding_rate", symbol)
+    except Exception as e:  # pragma: no cover - ccxt specific
+        return f"# Funding rate unavailable for {symbol}: {e}"
+    start = _history_lookback_start()
+    try:
+        since = _history_since(store, symbol, FUNDING_SERIES, start)
+        fetched = await afetch_history(c, "fetch_funding_rate_history", symbol, since, ["fundingRate"])
+    except Exception as e:
+        return _format_funding(funding, symbol) + f"\n# Funding history unavailable: {e}\n"
+    settled = _history_window(store, symbol, FUNDING_SERIES, fetched, start)
+    return _format_funding(funding, symbol, settled, _predicted_funding_window(store, symbol, funding))
+
+
+async def aget_open_interest_change(
+    symbol: str,
+    timeframe: str = "1h",
+    client: Any = None,
+    store: Optional[BarStore] = None,
+) -> str:
+    """Async version of `ccxt_bybit.get_open_interest_change`."""
+    c = client or await _ensure_client()
+    if client is None:
+        store = store or get_derivatives_store()
+    series = open_interest_series(timeframe)
+    start = _history_lookback_start()
+    try:
+        fetched = await afetch_history(
+            c, "fetch_open_interest_history", symbol, _history_since(store, symbol, series, start),
+            _series_value_keys(store, symbol, series, OPEN_INTEREST_KEYS), timeframe=timeframe,
+        )
+    except Exception as e:  # pragma: no cover - ccxt specific
+        return f"# Open interest unavailable for {symbol}: {e}"
+    history = _history_window(store, symbol, series, fetched, start)
+    return _format_open_interest_change(history, symbol, timeframe)
+
+
+async def aget_market_snapshot(
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    timeframe: str = "15m",
+    client: Any = None,
+    store: Optional[BarStore] = None,
+) -> Dict[str, str]:
+    """
+    Fetch OHLCV, orderbook, funding and open interest for `symbol` concurrently.
+
+    Returns:
+        Dict with "ohlcv", "orderbook", "funding_rate" and "open_interest" texts.
+        A failing component is reported inline instead of failing the snapshot.
+    """
+    parts = {
+        "ohlcv": aget_ohlcv_bybit(symbol, start_date, end_date, timeframe, client=client, store=store),
+        "orderbook": aget_orderbook_window(symbol, client=client),
+        "funding_rate": aget_funding_rate(symbol, client=client),
+        "open_interest": aget_open_interest_change(symbol, client=client),
+    }
+    results = await asyncio.gather(*parts.values(), return_exceptions=True)
+    return {
+        key: f"# {key} unavailable for {symbol}: {res}" if isinstance(res, Exception) else res
+        for key, res in zip(parts, results)
+    }
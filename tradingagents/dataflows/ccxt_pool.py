@@ -0,0 +1,243 @@
+"""
+Process-wide pool of long-lived ccxt clients.
+
+Building a ccxt exchange is cheap, but each fresh instance reloads the market list
+and opens new HTTP connections on its first request. The pool keeps one client
+per exchange id for the life of the process, loads markets once and refreshes
+them on an interval. Only the first load holds the pool lock; a periodic reload
+runs outside it in the one caller that finds it due, while other callers keep
+using the client with its current markets until the reloaded ones are swapped
+in. A fresh on-disk market catalogue (see `market_catalogue`)
+seeds new clients via `set_markets`, and every download refreshes that
+snapshot. Clients can be injected (e.g. a dummy in tests) with
+`set_client`, mirroring the `client=` argument of the dataflow functions.
+
+`ccxt.async_support` clients hold an aiohttp session bound to the event loop that
+created them, so the async pool keeps one set of clients per running loop, each
+next to the time its markets were loaded.
+
+Pooled clients are built with ccxt's own throttle off: every data call goes
+through the shared token bucket (`rate_limiter`), which spaces requests across
+threads, tasks and workers. ccxt's per-instance limiter would only add a second
+delay on top of it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, Optional, Set
+
+from .config import get_config
+from .market_catalogue import fresh_market_catalogue, save_market_catalogue
+
+try:
+    import ccxt  # type: ignore
+except ImportError:  # pragma: no cover - handled by test injection
+    ccxt = None
+
+try:
+    import ccxt.async_support as ccxt_async  # type: ignore
+except ImportError:  # pragma: no cover - handled by test injection
+    ccxt_async = None
+
+
+def _markets_ttl(override: Optional[float]) -> float:
+    if override is not None:
+        return override
+    return float(get_config().get("ccxt_markets_ttl_seconds", 3600))
+
+
+def _default_factory(exchange_id: str) -> Any:
+    if ccxt is None:
+        raise RuntimeError(
+            "ccxt is required for live data. Install ccxt or inject a client in tests."
+        )
+    return getattr(ccxt, exchange_id)({"enableRateLimit": False})  # the shared limiter paces calls
+
+
+class ClientPool:
+    """Thread-safe registry of shared exchange clients."""
+
+    def __init__(
+        self,
+        factory: Optional[Callable[[str], Any]] = None,
+        markets_ttl: Optional[float] = None,
+    ):
+        self._factory = factory or _default_factory
+        self._markets_ttl = markets_ttl
+        self._clients: Dict[str, Any] = {}
+        self._markets_loaded_at: Dict[str, float] = {}
+        # Exchanges whose markets are being reloaded outside the lock
+        self._refreshing: Set[str] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def markets_ttl(self) -> float:
+        return _markets_ttl(self._markets_ttl)
+
+    def get(self, exchange_id: str = "bybit") -> Any:
+        """Return the shared client, creating it or refreshing its markets if due."""
+        with self._lock:
+            client = self._clients.get(exchange_id)
+            if client is None:
+                client = self._factory(exchange_id)
+                self._clients[exchange_id] = client
+            if not hasattr(client, "load_markets"):
+                return client
+            loaded_at = self._markets_loaded_at.get(exchange_id)
+            if loaded_at is None:
+                # Nothing can use the client before its first load, so that one waits
+                self._load_markets(exchange_id, client)
+                return client
+            if time.monotonic() - loaded_at < self.markets_ttl or exchange_id in self._refreshing:
+                return client
+            self._refreshing.add(exchange_id)
+        try:
+            self._reload_markets(exchange_id, client)
+        finally:
+            with self._lock:
+                self._refreshing.discard(exchange_id)
+        return client
+
+    def set(self, client: Any, exchange_id: str = "bybit") -> None:
+        """Inject a client (live or dummy) to be shared under `exchange_id`."""
+        with self._lock:
+            self._clients[exchange_id] = client
+            self._markets_loaded_at.pop(exchange_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+            self._markets_loaded_at.clear()
+
+    def _load_markets(self, exchange_id: str, client: Any) -> None:
+        """First load, under the pool lock: from a fresh snapshot if any, else the exchange."""
+        if not _seed_markets(exchange_id, client):
+            save_market_catalogue(client.load_markets(), exchange_id)
+        self._markets_loaded_at[exchange_id] = time.monotonic()
+
+    def _reload_markets(self, exchange_id: str, client: Any) -> None:
+        """
+        Periodic reload, outside the pool lock. ccxt builds the new market dicts
+        and then assigns them, so concurrent requests see the old or the new
+        markets, never a mix. A failed reload keeps the current markets until
+        the next interval.
+        """
+        try:
+            markets = client.load_markets(reload=True)
+            save_market_catalogue(markets, exchange_id)
+        except Exception as e:
+            print(f"WARNING: {exchange_id} market reload failed ({e}); keeping the loaded markets")
+        with self._lock:
+            if self._clients.get(exchange_id) is client:
+                self._markets_loaded_at[exchange_id] = time.monotonic()
+
+
+def _seed_markets(exchange_id: str, client: Any) -> bool:
+    """Load markets from a fresh catalogue snapshot instead of the network."""
+    catalogue = fresh_market_catalogue(exchange_id)
+    if catalogue is None or not catalogue.raw_markets or not hasattr(client, "set_markets"):
+        return False
+    client.set_markets(catalogue.raw_markets)
+    return True
+
+
+def _default_async_factory(exchange_id: str) -> Any:
+    if ccxt_async is None:
+        raise RuntimeError(
+            "ccxt is required for live data. Install ccxt or inject a client in tests."
+        )
+    return getattr(ccxt_async, exchange_id)({"enableRateLimit": False})  # the shared limiter paces calls
+
+
+class AsyncClientPool:
+    """Shared `ccxt.async_support` clients, one set per running event loop."""
+
+    def __init__(
+        self,
+        factory: Optional[Callable[[str], Any]] = None,
+        markets_ttl: Optional[float] = None,
+    ):
+        self._factory = factory or _default_async_factory
+        self._markets_ttl = markets_ttl
+        self._injected: Dict[str, Any] = {}
+        # Keyed by event loop so clients die with the loop that owns them; each
+        # entry is (client, monotonic time its markets were loaded or None)
+        self._per_loop = weakref.WeakKeyDictionary()
+        self._locks = weakref.WeakKeyDictionary()
+
+    async def get(self, exchange_id: str = "bybit") -> Any:
+        """Return this loop's client, creating it or refreshing its markets if due."""
+        if exchange_id in self._injected:
+            return self._injected[exchange_id]
+        loop = asyncio.get_running_loop()
+        lock = self._locks.setdefault(loop, asyncio.Lock())
+        async with lock:
+            clients = self._per_loop.setdefault(loop, {})
+            client, loaded_at = clients.get(exchange_id, (None, None))
+            if client is None:
+                client = self._factory(exchange_id)
+                clients[exchange_id] = (client, None)
+            now = time.monotonic()
+            if loaded_at is None and _seed_markets(exchange_id, client):
+                clients[exchange_id] = (client, now)
+            elif loaded_at is None or now - loaded_at >= _markets_ttl(self._markets_ttl):
+                markets = await client.load_markets(reload=loaded_at is not None)
+                save_market_catalogue(markets, exchange_id)
+                clients[exchange_id] = (client, now)
+            return client
+
+    def set(self, client: Any, exchange_id: str = "bybit") -> None:
+        """Inject a client that is returned on every loop (tests, replays)."""
+        self._injected[exchange_id] = client
+
+    async def close(self) -> None:
+        """Close and drop the clients owned by the running loop."""
+        clients = self._per_loop.pop(asyncio.get_running_loop(), {})
+        for client, _ in clients.values():
+            await client.close()
+
+    def clear(self) -> None:
+        self._injected.clear()
+
+
+_pool = ClientPool()
+_async_pool = AsyncClientPool()
+
+
+def get_client_pool() -> ClientPool:
+    return _pool
+
+
+def get_client(exchange_id: str = "bybit") -> Any:
+    """Return the pooled client for `exchange_id`."""
+    return _pool.get(exchange_id)
+
+
+def set_client(client: Any, exchange_id: str = "bybit") -> None:
+    """Inject a client into the shared pool (useful for tests and replays)."""
+    _pool.set(client, exchange_id)
+
+
+def reset_clients() -> None:
+    """Drop all pooled clients so the next call builds fresh ones."""
+    _pool.clear()
+    _async_pool.clear()
+
+
+async def get_async_client(exchange_id: str = "bybit") -> Any:
+    """Return the pooled async client for `exchange_id` on the running loop."""
+    return await _async_pool.get(exchange_id)
+
+
+def set_async_client(client: Any, exchange_id: str = "bybit") -> None:
+    """Inject an async client into the shared pool."""
+    _async_pool.set(client, exchange_id)
+
+
+async def close_async_clients() -> None:
+    """Close the running loop's async clients (call on application shutdown)."""
+    await _async_pool.close()
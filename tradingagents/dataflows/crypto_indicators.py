@@ -2,58 +2,73 @@
 Indicator calculations from OHLCV dataframes for crypto short-term analysis.
 
 This module avoids external TA dependencies to keep tests offline-friendly.
+Columns are defined in `indicator_registry`; only the requested ones (and the
+intermediates they share) are computed. Bars may be a DataFrame or a compact
+`OhlcvArrays`; float32 columns are passed to the kernels as they are.
 """
 from __future__ import annotations
 
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
 import pandas as pd
 
+from .indicator_engine import INDICATOR_COLUMNS
+from .indicator_registry import compute_arrays, required_inputs
+from .ohlcv_arrays import OhlcvArrays
+from .price_levels import LEVELS_LOOKBACK, SWING_BARS, detect_levels, format_levels
+
+Bars = Union[pd.DataFrame, OhlcvArrays]
+
+
+def _base_arrays(bars: Bars, columns: Sequence[str]) -> Dict[str, np.ndarray]:
+    """(1 x bars) input arrays for `columns`, taking timestamps from `datetime` if needed."""
+    names = required_inputs(columns)
+    if isinstance(bars, OhlcvArrays):
+        return bars.inputs(names)
+    data = {}
+    for name in names:
+        if name == "timestamp":
+            if "timestamp" in bars:
+                values = bars["timestamp"].to_numpy(dtype=np.int64)
+            else:
+                values = pd.to_datetime(bars["datetime"]).to_numpy(dtype="datetime64[ms]").astype(np.int64)
+        else:
+            values = bars[name].to_numpy()
+            if values.dtype.kind != "f":
+                values = values.astype(np.float64)
+        data[name] = values[None, :]
+    return data
+
 
-def _ema(series: pd.Series, span: int) -> pd.Series:
-    return series.ewm(span=span, adjust=False).mean()
+def compute_indicator_arrays(bars: Bars, columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+    """{column: 1-D float64 array} for `bars`, without building or copying a frame."""
+    columns = list(INDICATOR_COLUMNS if columns is None else columns)
+    values = compute_arrays(_base_arrays(bars, columns), columns)
+    return {name: values[name][0] for name in columns}
 
 
-def compute_indicators(df: pd.DataFrame) -> pd.DataFrame:
+def compute_indicators(df: Bars, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
     """
-    Compute a bundle of indicators: SMA(7/25/99), RSI(14), Bollinger(20,2), MACD(12,26,9).
-    Assumes df has columns: datetime, open, high, low, close, volume.
+    Return `df` with indicator columns added.
+
+    By default the bundle SMA(7/25/99), RSI(14), Bollinger(20,2), MACD(12,26,9);
+    `columns` selects any registered indicators instead (e.g. ["rsi_14", "atr_14"]).
+    Assumes df has columns: datetime, open, high, low, close, volume. An
+    `OhlcvArrays` input is converted with `to_frame` once, after computing.
     """
-    out = df.copy()
-    close = out["close"]
-
-    # SMA
-    out["sma_7"] = close.rolling(window=7, min_periods=7).mean()
-    out["sma_25"] = close.rolling(window=25, min_periods=25).mean()
-    out["sma_99"] = close.rolling(window=99, min_periods=99).mean()
-
-    # RSI 14
-    delta = close.diff()
-    gain = delta.clip(lower=0).rolling(window=14, min_periods=14).mean()
-    loss = (-delta.clip(upper=0)).rolling(window=14, min_periods=14).mean()
-    rs = gain / loss.replace(0, pd.NA)
-    out["rsi_14"] = 100 - (100 / (1 + rs))
-
-    # Bollinger 20,2
-    rolling_mean = close.rolling(window=20, min_periods=20).mean()
-    rolling_std = close.rolling(window=20, min_periods=20).std()
-    out["bb_mid_20"] = rolling_mean
-    out["bb_upper_20_2"] = rolling_mean + 2 * rolling_std
-    out["bb_lower_20_2"] = rolling_mean - 2 * rolling_std
-
-    # MACD 12/26/9
-    ema12 = _ema(close, 12)
-    ema26 = _ema(close, 26)
-    macd = ema12 - ema26
-    signal = _ema(macd, 9)
-    out["macd"] = macd
-    out["macd_signal"] = signal
-    out["macd_hist"] = macd - signal
-
-    return out
-
-
-def indicators_summary(df: pd.DataFrame, tail: int = 5) -> str:
+    values = compute_indicator_arrays(df, columns)
+    if isinstance(df, OhlcvArrays):
+        return df.to_frame(values)
+    return df.assign(**values)
+
+
+def indicators_summary(df: pd.DataFrame, tail: int = 5, levels_lookback: Optional[int] = LEVELS_LOOKBACK) -> str:
     """
     Produce a compact textual summary of the latest indicator values.
+
+    With high/low columns, swing levels, S/R zones and the range state over the
+    last `levels_lookback` bars follow (see `price_levels`; None leaves them out).
     """
     tail_df = df.tail(tail)
     latest = tail_df.iloc[-1]
@@ -66,4 +81,10 @@ def indicators_summary(df: pd.DataFrame, tail: int = 5) -> str:
         f"bb_upper={latest.get('bb_upper_20_2')}, bb_mid={latest.get('bb_mid_20')}, bb_lower={latest.get('bb_lower_20_2')}",
         f"macd={latest.get('macd')}, macd_signal={latest.get('macd_signal')}, macd_hist={latest.get('macd_hist')}",
     ]
+    if any(col in df.columns for col in ("atr_14", "vwap", "obv_delta_20")):
+        summary_lines.append(
+            f"atr14={latest.get('atr_14')}, vwap={latest.get('vwap')}, obv_delta20={latest.get('obv_delta_20')}"
+        )
+    if levels_lookback and {"high", "low"} <= set(df.columns) and len(df) > 2 * SWING_BARS + 1:
+        summary_lines.extend(format_levels(detect_levels(df, lookback=levels_lookback)))
     return "\n".join(str(x) for x in summary_lines)
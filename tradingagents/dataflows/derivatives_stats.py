@@ -0,0 +1,179 @@
+"""
+Funding-rate and open-interest history statistics.
+
+Histories are stored as (timestamp, value) series in a `BarStore` under
+`data_cache_dir/derivatives/<exchange>`, one series per symbol and kind (settled
+funding, sampled predicted funding, open interest per timeframe). The stats are
+computed for every horizon at once: a single `searchsorted` over a
+(horizons x points) matrix of look-back timestamps gives the reference value of
+every point, so changes, their trailing z-scores and the predicted-funding trend
+come out of one vectorized pass.
+
+A series keeps the units of the value key it was first synced with (recorded
+as `value_key` in the series metadata): open interest comes as contracts
+(`openInterestAmount`) or quote value (`openInterestValue`), and later batches
+only contribute records that carry the recorded key.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .timeframes import duration_to_ms
+
+VALUE_COLUMNS = {"timestamp": np.dtype("<i8"), "value": np.dtype("<f8")}
+
+FUNDING_SERIES = "funding"
+PREDICTED_FUNDING_SERIES = "predicted_funding"
+# Open interest value keys in order of preference
+OPEN_INTEREST_KEYS = ("openInterestAmount", "openInterestValue")
+DEFAULT_HORIZONS = ("1h", "4h", "24h")
+YEAR_MS = 365 * 86_400_000
+
+
+def open_interest_series(timeframe: str) -> str:
+    return f"open_interest_{timeframe}"
+
+
+def horizon_changes(
+    ts: np.ndarray, values: np.ndarray, horizons_ms: Sequence[int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Change of every point against the last point at or before `ts - horizon`.
+
+    Returns:
+        (change, change_pct), each shaped (len(horizons_ms), len(ts)); NaN where
+        the history does not reach back far enough.
+    """
+    ts = np.asarray(ts, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    targets = ts[None, :] - np.asarray(horizons_ms, dtype=np.int64)[:, None]
+    idx = np.searchsorted(ts, targets, side="right") - 1
+    ref = np.where(idx >= 0, values[np.clip(idx, 0, None)], np.nan)
+    change = values[None, :] - ref
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct = np.where(ref != 0, change / ref * 100, np.nan)
+    return change, pct
+
+
+def trailing_zscore(x: np.ndarray, window: int) -> np.ndarray:
+    """z-score of the last value of each row against that row's last `window` finite values."""
+    x = np.atleast_2d(np.asarray(x, dtype=np.float64))[:, -window:]
+    finite = np.isfinite(x)
+    count = finite.sum(axis=1)
+    filled = np.where(finite, x, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = filled.sum(axis=1) / count
+        var = (np.where(finite, x - mean[:, None], 0.0) ** 2).sum(axis=1) / (count - 1)
+        z = (x[:, -1] - mean) / np.sqrt(var)
+    return np.where((count >= 3) & (var > 0), z, np.nan)
+
+
+def open_interest_stats(
+    ts: np.ndarray,
+    values: np.ndarray,
+    horizons: Sequence[str] = DEFAULT_HORIZONS,
+    z_window: int = 720,
+) -> Dict[str, Any]:
+    """Latest open interest plus change, change_pct and z-score per horizon."""
+    if len(ts) == 0:
+        return {"latest": None, "horizons": {}}
+    change, pct = horizon_changes(ts, values, [duration_to_ms(h) for h in horizons])
+    z = trailing_zscore(pct, z_window)
+    return {
+        "latest": float(values[-1]),
+        "latest_ts": int(ts[-1]),
+        "horizons": {
+            h: {"change": float(change[i, -1]), "change_pct": float(pct[i, -1]), "zscore": float(z[i])}
+            for i, h in enumerate(horizons)
+        },
+    }
+
+
+def funding_stats(
+    settled_ts: np.ndarray,
+    settled: np.ndarray,
+    predicted_ts: np.ndarray,
+    predicted: np.ndarray,
+    horizons: Sequence[str] = DEFAULT_HORIZONS,
+    z_window: int = 90,
+) -> Dict[str, Any]:
+    """
+    Settled funding level and z-score plus the predicted-rate trend.
+
+    Predicted changes are absolute rate differences over each horizon, taken
+    from the sampled predicted-funding series.
+    """
+    out: Dict[str, Any] = {"settled_count": int(len(settled)), "predicted_trend": {}}
+    if len(settled):
+        settled = np.asarray(settled, dtype=np.float64)
+        settled_ts = np.asarray(settled_ts, dtype=np.int64)
+        last_ts = settled_ts[-1]
+        interval = float(np.median(np.diff(settled_ts))) if len(settled_ts) > 1 else 8 * 3_600_000.0
+        out.update(
+            last_settled=float(settled[-1]),
+            mean_24h=float(settled[settled_ts > last_ts - 86_400_000].mean()),
+            mean_7d=float(settled[settled_ts > last_ts - 7 * 86_400_000].mean()),
+            zscore=float(trailing_zscore(settled, z_window)[0]),
+            annualized_pct=float(settled[-1] * YEAR_MS / interval * 100),
+        )
+    if len(predicted):
+        change, _ = horizon_changes(predicted_ts, predicted, [duration_to_ms(h) for h in horizons])
+        out["predicted"] = float(predicted[-1])
+        out["predicted_trend"] = {h: float(change[i, -1]) for i, h in enumerate(horizons)}
+        if "last_settled" in out:
+            out["predicted_vs_settled"] = float(predicted[-1] - out["last_settled"])
+    return out
+
+
+def _num(value: Optional[float], fmt: str) -> str:
+    if value is None or not np.isfinite(value):
+        return "n/a"
+    return format(value, fmt)
+
+
+def format_funding_stats(stats: Dict[str, Any]) -> str:
+    lines = []
+    if stats.get("settled_count"):
+        lines.append(
+            f"# Funding history: settled={stats['settled_count']} last={_num(stats['last_settled'], '.6g')} "
+            f"mean_24h={_num(stats['mean_24h'], '.6g')} mean_7d={_num(stats['mean_7d'], '.6g')} "
+            f"zscore={_num(stats['zscore'], '.2f')} annualized_pct={_num(stats['annualized_pct'], '.2f')}"
+        )
+    if "predicted" in stats:
+        trend = " ".join(f"change_{h}={_num(v, '.6g')}" for h, v in stats["predicted_trend"].items())
+        lines.append(
+            f"# Predicted funding trend: predicted={_num(stats['predicted'], '.6g')} "
+            f"vs_last_settled={_num(stats.get('predicted_vs_settled'), '.6g')} {trend}"
+        )
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+def format_open_interest_stats(stats: Dict[str, Any]) -> str:
+    lines = ["horizon,change,change_pct,zscore"]
+    for h, s in stats["horizons"].items():
+        lines.append(f"{h},{_num(s['change'], '.6g')},{_num(s['change_pct'], '.2f')},{_num(s['zscore'], '.2f')}")
+    return "\n".join(lines) + "\n"
+
+
+def records_frame(records: Any, value_keys: Sequence[str]) -> pd.DataFrame:
+    """
+    (timestamp, value) frame from ccxt history records.
+
+    The value key is chosen once for the batch: the first of `value_keys`
+    present in every record, else the first present in any, in which case
+    records without it are dropped. Pass a single key to keep a stored series'
+    units. The chosen key is returned in `frame.attrs["value_key"]`.
+    """
+    stamped = [r for r in records or [] if r.get("timestamp") is not None]
+    present = [k for k in value_keys if any(r.get(k) is not None for r in stamped)]
+    key = next((k for k in present if all(r.get(k) is not None for r in stamped)), present[0] if present else None)
+    rows = [(int(r["timestamp"]), float(r[key])) for r in stamped if key is not None and r.get(key) is not None]
+    df = pd.DataFrame(rows, columns=list(VALUE_COLUMNS))
+    df = df.astype({"timestamp": "int64", "value": "float64"})
+    df = df.drop_duplicates("timestamp", keep="last").sort_values("timestamp").reset_index(drop=True)
+    df.attrs["value_key"] = key
+    return df
@@ -2,8 +2,6 @@ import json
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
-import time
-import random
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -12,6 +10,8 @@ from tenacity import (
     retry_if_result,
 )
 
+from .rate_limiter import get_rate_limiter
+
 
 def is_rate_limited(response):
     """Check if the response indicates rate limiting (status code 429)"""
@@ -25,8 +25,8 @@ def is_rate_limited(response):
 )
 def make_request(url, headers):
     """Make a request with retry logic for rate limiting"""
-    # Random delay before each request to avoid detection
-    time.sleep(random.uniform(2, 6))
+    # Queue on the shared google_news budget instead of sleeping a random 2-6s
+    get_rate_limiter().acquire("google_news")
     response = requests.get(url, headers=headers)
     return response
 
@@ -0,0 +1,146 @@
+"""
+Indicator results keyed by the data they were computed from.
+
+The routed market cache keys on call arguments and expires at the next bar
+close; this cache keys on the bars themselves: (symbol, timeframe, last bar
+timestamp and close, indicator parameter set). Two calls that end up with the
+same bars - different `curr_date`/look-back arguments, repeated tool turns, or
+another process reading the same bar store - share one computation. Callers
+add the rest of the last bar (open/high/low/volume) to the parameter set, so a
+still-forming bar never serves values computed on an earlier tick.
+
+Entries live in an in-process LRU and, with `indicator_cache_persist`, also as
+small JSON files under `data_cache_dir/indicators/<exchange>` next to the bar
+store, so concurrent and later runs start warm. Only results whose last bar has
+closed are written to disk: a forming bar gets a new close (and key) on every
+tick, so persisting those would leave a file per tick that is never read again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, Mapping, Optional, Tuple
+
+from .config import get_config
+
+IndicatorKey = Tuple[Hashable, ...]
+
+
+def indicator_key(
+    symbol: str, timeframe: str, last_ts: int, last_close: float, params: Mapping[str, Any]
+) -> IndicatorKey:
+    """Cache key for an indicator result; `params` must be JSON-serializable."""
+    return (symbol, timeframe, int(last_ts), float(last_close), json.dumps(dict(params), sort_keys=True))
+
+
+class IndicatorCache:
+    """
+    Thread-safe LRU of indicator results with optional on-disk persistence.
+
+    Args:
+        max_entries: in-memory entries kept before evicting the least recently used
+        persist_dir: directory for JSON entries (None keeps the cache in memory only)
+    """
+
+    def __init__(self, max_entries: int = 512, persist_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.persist_dir = Path(persist_dir) if persist_dir else None
+        self._entries: "OrderedDict[IndicatorKey, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+
+    def _path(self, key: IndicatorKey) -> Path:
+        digest = hashlib.sha1(json.dumps(list(key)).encode()).hexdigest()
+        return self.persist_dir / f"{digest}.json"
+
+    def get(self, key: IndicatorKey) -> Tuple[bool, Any]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return True, self._entries[key]
+        value = self._read(key)
+        with self._lock:
+            if value is not None:
+                self._stats["disk_hits"] += 1
+                self._remember(key, value)
+                return True, value
+            self._stats["misses"] += 1
+            return False, None
+
+    def set(self, key: IndicatorKey, value: Any, persist: bool = True) -> None:
+        """Store `value`; with persist=False (e.g. the last bar is still forming) in memory only."""
+        with self._lock:
+            self._remember(key, value)
+        if persist:
+            self._write(key, value)
+
+    def _remember(self, key: IndicatorKey, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read(self, key: IndicatorKey) -> Any:
+        if self.persist_dir is None:
+            return None
+        try:
+            payload = json.loads(self._path(key).read_text())
+        except (OSError, ValueError):
+            return None
+        # Guard against digest collisions and entries from older key layouts
+        return payload.get("value") if payload.get("key") == list(key) else None
+
+    def _write(self, key: IndicatorKey, value: Any) -> None:
+        if self.persist_dir is None:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps({"key": list(key), "value": value}))
+            os.replace(tmp, path)
+        except (OSError, TypeError) as e:
+            print(f"WARNING: could not persist indicator cache entry: {e}")
+
+    def clear(self) -> None:
+        """Drop in-memory entries and counters (persisted files are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = sum(self._stats.values())
+            hits = self._stats["hits"] + self._stats["disk_hits"]
+            return dict(self._stats, entries=len(self._entries), hit_rate=hits / total if total else 0.0)
+
+
+_caches: Dict[str, IndicatorCache] = {}
+_cache_lock = threading.Lock()
+
+
+def get_indicator_cache(exchange: str = "bybit") -> IndicatorCache:
+    """
+    Process-wide cache for `exchange`, sized by `indicator_cache_max_entries`
+    and persisted under its own directory if `indicator_cache_persist`.
+    """
+    with _cache_lock:
+        if exchange not in _caches:
+            config = get_config()
+            persist_dir = None
+            if config.get("indicator_cache_persist", False):
+                persist_dir = os.path.join(config["data_cache_dir"], "indicators", exchange)
+            _caches[exchange] = IndicatorCache(int(config.get("indicator_cache_max_entries", 512)), persist_dir)
+        return _caches[exchange]
+
+
+def reset_indicator_cache() -> None:
+    """Forget the process-wide caches (the next `get_indicator_cache` rebuilds them from config)."""
+    with _cache_lock:
+        _caches.clear()
@@ -0,0 +1,340 @@
+"""
+Incremental indicator engine for streamed bars.
+
+`IndicatorState` holds the running state of the `compute_indicators` bundle
+(SMA 7/25/99, RSI 14, Bollinger 20/2, MACD 12/26/9) for one series: sliding
+windows with running sums and mean/M2 for the rolling columns, and the last
+value of each EMA. Appending a bar costs O(1) whatever the history length, and
+the values match `compute_indicators` on the same closes.
+
+A bar with the same timestamp as the newest one (the forming bar ticking)
+replaces it: every component keeps a one-step undo record, so revisions are
+O(1) as well. The whole state, undo records included, round-trips through
+`to_dict`/`from_dict` (plain JSON), letting a restarted process resume from a
+saved `IndicatorEngine` instead of recomputing from scratch.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+STATE_VERSION = 1
+
+SMA_WINDOWS = (7, 25, 99)
+RSI_WINDOW = 14
+BB_WINDOW = 20
+BB_STD = 2
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+
+INDICATOR_COLUMNS = [
+    "sma_7",
+    "sma_25",
+    "sma_99",
+    "rsi_14",
+    "bb_mid_20",
+    "bb_upper_20_2",
+    "bb_lower_20_2",
+    "macd",
+    "macd_signal",
+    "macd_hist",
+]
+
+NAN = float("nan")
+
+
+class _SlidingWindow:
+    """
+    Last `n` values with running mean and sum of squared deviations (M2).
+
+    Adding a value to a full window evicts the oldest one with a single
+    add/remove Welford step; the sums are rebuilt from the ring once per lap to
+    keep floating-point drift bounded (amortized O(1)).
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+        self.ring: List[float] = [0.0] * n
+        self.pos = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.nonzero = 0
+        self._undo: Optional[Tuple[int, int, float, float, int, float]] = None
+
+    def push(self, x: float) -> None:
+        old = self.ring[self.pos]
+        self._undo = (self.pos, self.count, self.mean, self.m2, self.nonzero, old)
+        if self.count < self.n:
+            self.count += 1
+            delta = x - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (x - self.mean)
+        else:
+            prev_mean = self.mean
+            self.mean += (x - old) / self.n
+            self.m2 += (x - old) * (x - self.mean + old - prev_mean)
+            self.nonzero -= old != 0
+        self.nonzero += x != 0
+        self.ring[self.pos] = x
+        self.pos = (self.pos + 1) % self.n
+        if self.pos == 0 and self.count == self.n:
+            self._resync()
+
+    def undo(self) -> None:
+        """Revert the last `push` (one level)."""
+        if self._undo is None:
+            return
+        self.pos, self.count, self.mean, self.m2, self.nonzero, old = self._undo
+        self.ring[self.pos] = old
+        self._undo = None
+
+    def _resync(self) -> None:
+        self.mean = math.fsum(self.ring) / self.n
+        self.m2 = math.fsum((v - self.mean) ** 2 for v in self.ring)
+
+    @property
+    def full(self) -> bool:
+        return self.count == self.n
+
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1, like pandas `rolling().std()`)."""
+        return math.sqrt(max(self.m2, 0.0) / (self.n - 1))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "n": self.n,
+            "ring": self.ring,
+            "pos": self.pos,
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "nonzero": self.nonzero,
+            "undo": list(self._undo) if self._undo is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "_SlidingWindow":
+        w = cls(data["n"])
+        w.ring = [float(v) for v in data["ring"]]
+        w.pos, w.count, w.mean, w.m2, w.nonzero = (
+            data["pos"], data["count"], data["mean"], data["m2"], data["nonzero"]
+        )
+        w._undo = tuple(data["undo"]) if data.get("undo") is not None else None
+        return w
+
+
+class _Ema:
+    """EMA with pandas `ewm(span, adjust=False)` semantics: seeded by the first value."""
+
+    def __init__(self, span: int):
+        self.span = span
+        self.alpha = 2.0 / (span + 1)
+        self.value = NAN
+        self._undo = NAN
+
+    def push(self, x: float) -> float:
+        self._undo = self.value
+        self.value = x if math.isnan(self.value) else self.alpha * x + (1 - self.alpha) * self.value
+        return self.value
+
+    def undo(self) -> None:
+        self.value = self._undo
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"span": self.span, "value": self.value, "undo": self._undo}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "_Ema":
+        e = cls(data["span"])
+        e.value, e._undo = data["value"], data["undo"]
+        return e
+
+
+class IndicatorState:
+    """Running `compute_indicators` state for one (symbol, timeframe) series."""
+
+    def __init__(self):
+        self.sma = {n: _SlidingWindow(n) for n in SMA_WINDOWS}
+        self.bb = _SlidingWindow(BB_WINDOW)
+        self.gain = _SlidingWindow(RSI_WINDOW)
+        self.loss = _SlidingWindow(RSI_WINDOW)
+        self.ema_fast = _Ema(MACD_FAST)
+        self.ema_slow = _Ema(MACD_SLOW)
+        self.signal = _Ema(MACD_SIGNAL)
+        self.last_ts: Optional[int] = None
+        self.last_close = NAN
+        self.bars = 0
+        self.values: Dict[str, float] = {c: NAN for c in INDICATOR_COLUMNS}
+        self._prev: Optional[Tuple[Optional[int], float, int, Dict[str, float]]] = None
+
+    def _components(self):
+        return [*self.sma.values(), self.bb, self.gain, self.loss, self.ema_fast, self.ema_slow, self.signal]
+
+    def update(self, ts: int, close: float) -> Dict[str, float]:
+        """
+        Apply one bar and return the indicator values at it.
+
+        A bar with the newest timestamp replaces that bar; older timestamps
+        raise `ValueError`.
+        """
+        ts, close = int(ts), float(close)
+        if self.last_ts is not None and ts < self.last_ts:
+            raise ValueError(f"Bar at {ts} is older than the newest bar at {self.last_ts}")
+        if ts == self.last_ts:
+            self._revert()
+        self._prev = (self.last_ts, self.last_close, self.bars, self.values)
+
+        for window in self.sma.values():
+            window.push(close)
+        self.bb.push(close)
+        if not math.isnan(self.last_close):
+            delta = close - self.last_close
+            self.gain.push(max(delta, 0.0))
+            self.loss.push(max(-delta, 0.0))
+        fast, slow = self.ema_fast.push(close), self.ema_slow.push(close)
+        macd = fast - slow
+        signal = self.signal.push(macd)
+
+        values = {f"sma_{n}": (w.mean if w.full else NAN) for n, w in self.sma.items()}
+        values["rsi_14"] = self._rsi()
+        if self.bb.full:
+            mid, std = self.bb.mean, self.bb.std()
+            values.update(bb_mid_20=mid, bb_upper_20_2=mid + BB_STD * std, bb_lower_20_2=mid - BB_STD * std)
+        else:
+            values.update(bb_mid_20=NAN, bb_upper_20_2=NAN, bb_lower_20_2=NAN)
+        values.update(macd=macd, macd_signal=signal, macd_hist=macd - signal)
+
+        self.last_ts, self.last_close, self.values = ts, close, values
+        self.bars += 1
+        return dict(values)
+
+    def _rsi(self) -> float:
+        # Like compute_indicators: no losses in the window (zero average loss) gives NaN.
+        if not self.gain.full or self.loss.nonzero == 0:
+            return NAN
+        gain = self.gain.mean if self.gain.nonzero else 0.0
+        return 100 - 100 / (1 + gain / self.loss.mean)
+
+    def _revert(self) -> None:
+        if self._prev is None:
+            raise ValueError("Cannot revise the newest bar twice without undo state")
+        had_close = not math.isnan(self._prev[1])
+        for component in self._components():
+            if component in (self.gain, self.loss) and not had_close:
+                continue
+            component.undo()
+        self.last_ts, self.last_close, self.bars, self.values = self._prev
+        self._prev = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": STATE_VERSION,
+            "sma": {str(n): w.to_dict() for n, w in self.sma.items()},
+            "bb": self.bb.to_dict(),
+            "gain": self.gain.to_dict(),
+            "loss": self.loss.to_dict(),
+            "ema_fast": self.ema_fast.to_dict(),
+            "ema_slow": self.ema_slow.to_dict(),
+            "signal": self.signal.to_dict(),
+            "last_ts": self.last_ts,
+            "last_close": self.last_close,
+            "bars": self.bars,
+            "values": self.values,
+            "prev": list(self._prev) if self._prev is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IndicatorState":
+        if data.get("version") != STATE_VERSION:
+            raise ValueError(f"Unsupported indicator state version: {data.get('version')}")
+        s = cls()
+        s.sma = {int(n): _SlidingWindow.from_dict(w) for n, w in data["sma"].items()}
+        s.bb = _SlidingWindow.from_dict(data["bb"])
+        s.gain = _SlidingWindow.from_dict(data["gain"])
+        s.loss = _SlidingWindow.from_dict(data["loss"])
+        s.ema_fast = _Ema.from_dict(data["ema_fast"])
+        s.ema_slow = _Ema.from_dict(data["ema_slow"])
+        s.signal = _Ema.from_dict(data["signal"])
+        s.last_ts, s.last_close, s.bars = data["last_ts"], data["last_close"], data["bars"]
+        s.values = dict(data["values"])
+        s._prev = tuple(data["prev"]) if data.get("prev") is not None else None
+        return s
+
+
+class IndicatorEngine:
+    """
+    Indicator states keyed by (symbol, timeframe).
+
+    `on_bar` has the `KlineStreamHub` listener signature, so the engine can be
+    driven straight from a kline feed via `hub.add_listener(engine.on_bar)`.
+    """
+
+    def __init__(self):
+        self._states: Dict[Tuple[str, str], IndicatorState] = {}
+        self._lock = threading.Lock()
+
+    def state(self, symbol: str, timeframe: str) -> IndicatorState:
+        with self._lock:
+            key = (symbol, timeframe)
+            if key not in self._states:
+                self._states[key] = IndicatorState()
+            return self._states[key]
+
+    def update(self, symbol: str, timeframe: str, ts: int, close: float) -> Dict[str, float]:
+        state = self.state(symbol, timeframe)
+        with self._lock:
+            return state.update(ts, close)
+
+    def on_bar(self, symbol: str, timeframe: str, bar: List[float]) -> None:
+        """Apply a `[ts, o, h, l, c, v]` bar; bars older than the newest are ignored."""
+        state = self.state(symbol, timeframe)
+        with self._lock:
+            if state.last_ts is None or int(bar[0]) >= state.last_ts:
+                state.update(bar[0], bar[4])
+
+    def seed(self, symbol: str, timeframe: str, df: pd.DataFrame) -> Dict[str, float]:
+        """Feed history bars newer than the state's newest bar; returns the latest values."""
+        state = self.state(symbol, timeframe)
+        with self._lock:
+            for ts, close in zip(df["timestamp"].to_numpy(), df["close"].to_numpy()):
+                if state.last_ts is None or int(ts) >= state.last_ts:
+                    state.update(ts, close)
+            return dict(state.values)
+
+    def latest(self, symbol: str, timeframe: str) -> Optional[Dict[str, Any]]:
+        """Newest indicator values with `timestamp` and `close`, or None if nothing was fed."""
+        state = self._states.get((symbol, timeframe))
+        if state is None or state.last_ts is None:
+            return None
+        with self._lock:
+            return dict(state.values, timestamp=state.last_ts, close=state.last_close)
+
+    def save(self, path: str) -> None:
+        """Write every series state to `path` as JSON (atomic replace)."""
+        with self._lock:
+            payload = {f"{s}|{tf}": state.to_dict() for (s, tf), state in self._states.items()}
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(target.suffix + ".tmp")
+        tmp.write_text(json.dumps({"version": STATE_VERSION, "states": payload}))
+        os.replace(tmp, target)
+
+    @classmethod
+    def load(cls, path: str) -> "IndicatorEngine":
+        """Engine restored from `save`; an empty engine if the file is missing."""
+        engine = cls()
+        target = Path(path)
+        if not target.exists():
+            return engine
+        payload = json.loads(target.read_text())
+        for key, data in payload.get("states", {}).items():
+            symbol, timeframe = key.rsplit("|", 1)
+            engine._states[(symbol, timeframe)] = IndicatorState.from_dict(data)
+        return engine
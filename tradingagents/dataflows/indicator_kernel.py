@@ -0,0 +1,181 @@
+"""
+Batched NumPy kernel for the `compute_indicators` bundle.
+
+`batch_indicators` takes a (symbols x bars) close matrix and returns every
+indicator column as a matrix of the same shape, computed for all symbols in one
+pass instead of one pandas frame per symbol. The column definitions live in
+`indicator_registry`; this module provides the array primitives they use:
+
+- rolling means are window differences of a cumulative sum (taken relative to
+  each row's first close to keep the sums small), with a cumulative count of
+  finite values deciding where a full window exists;
+- the Bollinger deviation is a two-pass sum over the lagged window slices;
+- the EMAs run in blocks: inside a block of `EMA_BLOCK` bars the recursion is a
+  matrix product with a lower-triangular decay matrix, carried across blocks
+  by the last value, so the Python loop is bars/EMA_BLOCK iterations long.
+
+Inputs may be float32 (e.g. `ohlcv_arrays.OhlcvArrays` columns): they are
+used as they are, without a float64 copy, while sums and outputs are float64.
+
+Semantics follow pandas (`rolling(w, min_periods=w)`, `std(ddof=1)`,
+`ewm(adjust=False)`). Rows may be left-padded with NaN (series of different
+lengths, right-aligned by `stack_closes`); a padded row gives the same values
+as its unpadded series.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .indicator_engine import INDICATOR_COLUMNS
+from .ohlcv_arrays import OhlcvArrays
+
+EMA_BLOCK = 64
+Bars = Union[pd.DataFrame, OhlcvArrays]
+
+
+def _first_finite(x: np.ndarray) -> np.ndarray:
+    """Per-row first finite value as an (n, 1) column (0 for all-NaN rows)."""
+    finite = np.isfinite(x)
+    idx = finite.argmax(axis=1)
+    first = x[np.arange(len(x)), idx]
+    return np.where(finite.any(axis=1), first, 0.0)[:, None]
+
+
+def _window_diff(cumulative: np.ndarray, window: int) -> np.ndarray:
+    out = cumulative.copy()
+    out[:, window:] -= cumulative[:, :-window]
+    return out
+
+
+def cumulative_sums(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(row reference, cumulative sum of x - reference, cumulative finite count) along axis 1."""
+    finite = np.isfinite(x)
+    ref = _first_finite(x)
+    cs = np.cumsum(np.where(finite, x - ref, 0.0), axis=1, dtype=np.float64)
+    return ref.astype(np.float64), cs, np.cumsum(finite, axis=1)
+
+
+def window_mean(sums: Tuple[np.ndarray, np.ndarray, np.ndarray], window: int) -> np.ndarray:
+    """Trailing mean from `cumulative_sums`; NaN unless the whole window is finite."""
+    ref, cs, cc = sums
+    return np.where(_window_diff(cc, window) == window, _window_diff(cs, window) / window + ref, np.nan)
+
+
+def rolling_means(x: np.ndarray, windows: Sequence[int]) -> Dict[int, np.ndarray]:
+    """Trailing means along axis 1 for several windows from one cumulative sum."""
+    sums = cumulative_sums(x)
+    return {w: window_mean(sums, w) for w in windows}
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean along axis 1, NaN unless the whole window is finite."""
+    return rolling_means(x, [window])[window]
+
+
+def rolling_std(x: np.ndarray, window: int, mean: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Trailing sample standard deviation (ddof=1) along axis 1.
+
+    Two-pass: squared deviations from the window mean are accumulated over the
+    `window` lagged slices, so no (rows x bars x window) temporary is built.
+    """
+    mean = rolling_mean(x, window) if mean is None else mean
+    n_bars = x.shape[1]
+    out = np.full(x.shape, np.nan)
+    if n_bars < window:
+        return out
+    m = mean[:, window - 1:]
+    acc = np.zeros_like(m)
+    for lag in range(window):
+        acc += (x[:, lag:n_bars - window + 1 + lag] - m) ** 2
+    out[:, window - 1:] = np.sqrt(acc / (window - 1))
+    return out
+
+
+def ewm(x: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    `ewm(alpha=alpha, adjust=False).mean()` along axis 1, seeded by each row's
+    first finite value (leading NaNs stay NaN).
+    """
+    finite = np.isfinite(x)
+    started = np.maximum.accumulate(finite, axis=1)
+    # Before the first value the series is held at that value, which leaves the seed unchanged.
+    filled = np.where(started, x, _first_finite(x))
+    n_bars = filled.shape[1]
+    lags = np.arange(EMA_BLOCK)
+    decay = (1 - alpha) ** (lags[:, None] - lags[None, :])
+    weights = np.where(lags[:, None] >= lags[None, :], alpha * decay, 0.0)
+    carry_decay = (1 - alpha) ** (lags + 1)
+
+    out = np.empty(filled.shape)
+    prev = filled[:, 0].astype(np.float64)
+    for start in range(0, n_bars, EMA_BLOCK):
+        block = filled[:, start:start + EMA_BLOCK]
+        k = block.shape[1]
+        out[:, start:start + k] = block @ weights[:k, :k].T + prev[:, None] * carry_decay[None, :k]
+        prev = out[:, start + k - 1]
+    return np.where(started, out, np.nan)
+
+
+def ema(x: np.ndarray, span: int) -> np.ndarray:
+    """`ewm(span=span, adjust=False).mean()` along axis 1."""
+    return ewm(x, 2.0 / (span + 1))
+
+
+def batch_indicators(close: np.ndarray, columns: Sequence[str] = INDICATOR_COLUMNS) -> Dict[str, np.ndarray]:
+    """
+    Compute indicator columns for every row of `close`.
+
+    Args:
+        close: (symbols x bars) float array, or a single 1-D series; float32
+            input is not copied
+        columns: registered close-only indicators to materialize (default: the
+            `compute_indicators` bundle)
+    Returns:
+        {column: array shaped like `close`}
+    """
+    # The registry builds its nodes from this module's primitives
+    from .indicator_registry import compute_arrays
+
+    close = np.asarray(close)
+    if close.dtype.kind != "f":
+        close = close.astype(np.float64)
+    if close.ndim == 1:
+        return {k: v[0] for k, v in compute_arrays({"close": close[None, :]}, columns).items()}
+    return compute_arrays({"close": close}, columns)
+
+
+def stack_closes(frames: Mapping[str, Bars], bars: Optional[int] = None) -> Tuple[List[str], np.ndarray]:
+    """
+    Right-align the close columns of several series into one NaN-padded matrix.
+
+    Args:
+        frames: {symbol: OHLCV frame or `OhlcvArrays`}
+        bars: keep only the last `bars` closes of each series (default: longest)
+    Returns:
+        (symbols, close matrix) with rows in `symbols` order; float32 when every
+        series is float32, float64 otherwise
+    """
+    symbols = list(frames)
+    closes = [np.asarray(frames[s]["close"]) for s in symbols]
+    dtype = np.result_type(np.float32, *(c.dtype for c in closes))
+    width = bars or max((len(c) for c in closes), default=0)
+    matrix = np.full((len(symbols), width), np.nan, dtype=dtype)
+    for i, c in enumerate(closes):
+        c = c[-width:] if width else c[:0]
+        matrix[i, width - len(c):] = c
+    return symbols, matrix
+
+
+def latest_indicators(frames: Mapping[str, Bars], bars: Optional[int] = None) -> pd.DataFrame:
+    """Latest close and indicator values per symbol (one row each), e.g. for watchlist scans."""
+    symbols, close = stack_closes(frames, bars)
+    result = batch_indicators(close)
+    data = {"close": close[:, -1] if close.shape[1] else np.full(len(symbols), np.nan)}
+    for col, values in result.items():
+        data[col] = values[:, -1] if values.shape[1] else np.full(len(symbols), np.nan)
+    return pd.DataFrame(data, index=pd.Index(symbols, name="symbol"))
@@ -0,0 +1,305 @@
+"""
+Declarative indicator registry with shared intermediates and lazy columns.
+
+Every indicator (and every intermediate such as the close cumulative sums, the
+close-to-close delta or the EMAs) is a node that names its inputs. Base inputs
+are the OHLCV arrays ("open", "high", "low", "close", "volume", "timestamp"),
+shaped (series x bars) as in `indicator_kernel`. `LazyIndicators` evaluates a
+node the first time it is read and memoizes it, so a request for RSI alone
+never touches the MACD or ATR nodes, while SMA 7/25/99 and the Bollinger
+midline share one cumulative sum and `bb_mid_20` is just `sma_20`.
+
+Adding an indicator is one `@register` function; callers that do not ask for it
+do not pay for it.
+
+Each node also declares its warmup: the bars its own computation needs before
+its first usable value (a window minus one, or the bars after which an EMA
+seed's weight falls below `EMA_TOLERANCE`). `warmup_bars` chains them through
+the graph, so a caller can fetch just enough history for the columns it wants.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+from .indicator_engine import (
+    BB_STD,
+    BB_WINDOW,
+    INDICATOR_COLUMNS,
+    MACD_FAST,
+    MACD_SIGNAL,
+    MACD_SLOW,
+    RSI_WINDOW,
+    SMA_WINDOWS,
+)
+from .indicator_kernel import _window_diff, cumulative_sums, ema, ewm, rolling_std, window_mean
+from .timeframes import timeframe_to_ms
+
+BASE_INPUTS = ("open", "high", "low", "close", "volume", "timestamp")
+ATR_WINDOW = 14
+DAY_MS = 86_400_000
+# An EMA counts as converged once its seed weighs less than this
+EMA_TOLERANCE = 1e-4
+
+OBV_DELTA_WINDOW = 20
+
+# Columns added on top of the classic bundle for the indicator tool summary. The
+# summaries use the OBV change over a fixed window: the OBV level itself depends
+# on where the loaded window starts.
+EXTRA_COLUMNS = ["atr_14", "vwap", f"obv_delta_{OBV_DELTA_WINDOW}"]
+SUMMARY_COLUMNS = INDICATOR_COLUMNS + EXTRA_COLUMNS
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """
+    A registry node: `func(*inputs)` computes it; intermediates are not output
+    columns. `warmup` is in bars, or a callable of the bar length in ms.
+    """
+
+    name: str
+    inputs: Tuple[str, ...]
+    func: Callable[..., Any]
+    intermediate: bool = False
+    warmup: Union[int, Callable[[int], int]] = 0
+
+
+INDICATORS: Dict[str, IndicatorSpec] = {}
+
+
+def register(name: str, *inputs: str, intermediate: bool = False, warmup: Union[int, Callable[[int], int]] = 0):
+    """Decorator adding `func` to the registry as node `name` computed from `inputs`."""
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        INDICATORS[name] = IndicatorSpec(name, tuple(inputs), func, intermediate, warmup)
+        return func
+
+    return decorator
+
+
+def ema_warmup(alpha: float, tolerance: float = EMA_TOLERANCE) -> int:
+    """Bars after which the seed of an EMA with `alpha` weighs less than `tolerance`."""
+    return math.ceil(math.log(tolerance) / math.log(1 - alpha))
+
+
+def available_indicators() -> List[str]:
+    """Names of the registered output columns."""
+    return [name for name, spec in INDICATORS.items() if not spec.intermediate]
+
+
+def plan(columns: Iterable[str]) -> List[str]:
+    """
+    Nodes needed for `columns` in dependency order, each listed once.
+
+    Raises:
+        KeyError: for an unknown column
+    """
+    order: List[str] = []
+    seen: Set[str] = set()
+
+    def visit(name: str) -> None:
+        if name in seen or name in BASE_INPUTS:
+            return
+        if name not in INDICATORS:
+            raise KeyError(f"Unknown indicator: {name}")
+        seen.add(name)
+        for dep in INDICATORS[name].inputs:
+            visit(dep)
+        order.append(name)
+
+    for column in columns:
+        visit(column)
+    return order
+
+
+def warmup_bars(columns: Iterable[str], timeframe: str = "15m") -> int:
+    """Bars of history needed before the first converged value of every column."""
+    bar_ms = timeframe_to_ms(timeframe)
+    total: Dict[str, int] = {}
+    for name in plan(columns):
+        spec = INDICATORS[name]
+        own = spec.warmup(bar_ms) if callable(spec.warmup) else spec.warmup
+        total[name] = own + max((total.get(dep, 0) for dep in spec.inputs), default=0)
+    return max((total[c] for c in columns), default=0)
+
+
+def required_inputs(columns: Iterable[str]) -> Set[str]:
+    """Base OHLCV inputs the columns depend on."""
+    return {dep for name in plan(columns) for dep in INDICATORS[name].inputs if dep in BASE_INPUTS}
+
+
+class LazyIndicators:
+    """
+    Read-only view of indicator columns over base arrays, computed on first access.
+
+    Args:
+        data: base inputs by name, each (series x bars)
+    """
+
+    def __init__(self, data: Mapping[str, np.ndarray]):
+        self._values: Dict[str, Any] = dict(data)
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._values:
+            for node in plan([name]):
+                if node not in self._values:
+                    spec = INDICATORS[node]
+                    self._values[node] = spec.func(*(self._input(dep) for dep in spec.inputs))
+        return self._values[name]
+
+    def _input(self, name: str) -> Any:
+        if name in BASE_INPUTS and name not in self._values:
+            raise KeyError(f"Missing input column '{name}'")
+        return self[name]
+
+    def computed(self) -> List[str]:
+        """Nodes evaluated so far (base inputs excluded)."""
+        return [name for name in self._values if name not in BASE_INPUTS]
+
+
+def compute_arrays(data: Mapping[str, np.ndarray], columns: Sequence[str] = INDICATOR_COLUMNS) -> Dict[str, np.ndarray]:
+    """Materialize `columns` from (series x bars) base arrays."""
+    lazy = LazyIndicators(data)
+    return {column: lazy[column] for column in columns}
+
+
+# --- close-based bundle -----------------------------------------------------
+
+
+@register("_close_sums", "close", intermediate=True)
+def _close_sums(close):
+    return cumulative_sums(close)
+
+
+def _register_sma(window: int) -> None:
+    register(f"sma_{window}", "_close_sums", warmup=window - 1)(lambda sums: window_mean(sums, window))
+
+
+for _window in (*SMA_WINDOWS, BB_WINDOW):
+    _register_sma(_window)
+
+
+@register("bb_mid_20", f"sma_{BB_WINDOW}")
+def _bb_mid(sma):
+    return sma
+
+
+@register("_std_20", "close", f"sma_{BB_WINDOW}", intermediate=True)
+def _std(close, sma):
+    return rolling_std(close, BB_WINDOW, sma)
+
+
+@register("bb_upper_20_2", "bb_mid_20", "_std_20")
+def _bb_upper(mid, std):
+    return mid + BB_STD * std
+
+
+@register("bb_lower_20_2", "bb_mid_20", "_std_20")
+def _bb_lower(mid, std):
+    return mid - BB_STD * std
+
+
+@register("_delta", "close", intermediate=True, warmup=1)
+def _delta(close):
+    delta = np.full(close.shape, np.nan)
+    delta[:, 1:] = np.diff(close, axis=1)
+    return delta
+
+
+@register("_losses", "_delta", intermediate=True)
+def _losses(delta):
+    return np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0))
+
+
+@register("rsi_14", "_delta", "_losses", warmup=RSI_WINDOW - 1)
+def _rsi(delta, losses):
+    gain = window_mean(cumulative_sums(np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0))), RSI_WINDOW)
+    loss = window_mean(cumulative_sums(losses), RSI_WINDOW)
+    # Zero average loss gives NaN; count the nonzero losses exactly instead of testing a float sum.
+    loss_count = _window_diff(np.cumsum(losses > 0, axis=1), RSI_WINDOW)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(loss_count > 0, 100 - 100 / (1 + gain / loss), np.nan)
+
+
+@register(f"ema_{MACD_FAST}", "close", warmup=ema_warmup(2 / (MACD_FAST + 1)))
+def _ema_fast(close):
+    return ema(close, MACD_FAST)
+
+
+@register(f"ema_{MACD_SLOW}", "close", warmup=ema_warmup(2 / (MACD_SLOW + 1)))
+def _ema_slow(close):
+    return ema(close, MACD_SLOW)
+
+
+@register("macd", f"ema_{MACD_FAST}", f"ema_{MACD_SLOW}")
+def _macd(fast, slow):
+    return fast - slow
+
+
+@register("macd_signal", "macd", warmup=ema_warmup(2 / (MACD_SIGNAL + 1)))
+def _macd_signal(macd):
+    return ema(macd, MACD_SIGNAL)
+
+
+@register("macd_hist", "macd", "macd_signal")
+def _macd_hist(macd, signal):
+    return macd - signal
+
+
+# --- high/low/volume indicators ---------------------------------------------
+
+
+@register("_true_range", "high", "low", "close", intermediate=True, warmup=1)
+def _true_range(high, low, close):
+    prev_close = np.full(close.shape, np.nan)
+    prev_close[:, 1:] = close[:, :-1]
+    ranges = np.stack([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    # The first bar has no previous close: its range is high - low
+    widest = np.max(np.where(np.isnan(ranges), -np.inf, ranges), axis=0)
+    return np.where(np.isnan(high - low), np.nan, widest)
+
+
+@register("atr_14", "_true_range", warmup=ema_warmup(1 / ATR_WINDOW))
+def _atr(true_range):
+    """Wilder's ATR: RMA (alpha = 1/14) of the true range."""
+    return ewm(true_range, 1.0 / ATR_WINDOW)
+
+
+@register("vwap", "high", "low", "close", "volume", "timestamp", warmup=lambda bar_ms: max(DAY_MS // bar_ms - 1, 0))
+def _vwap(high, low, close, volume, timestamp):
+    """Session VWAP anchored at each UTC day start."""
+    typical = (high + low + close) / 3
+    valid = np.isfinite(typical) & np.isfinite(volume)
+    pv = np.cumsum(np.where(valid, typical * volume, 0.0), axis=1, dtype=np.float64)
+    vol = np.cumsum(np.where(valid, volume, 0.0), axis=1, dtype=np.float64)
+    day = np.broadcast_to(np.asarray(timestamp, dtype=np.int64) // DAY_MS, close.shape)
+    bars = np.arange(close.shape[1])
+    new_day = np.ones(close.shape, dtype=bool)
+    new_day[:, 1:] = day[:, 1:] != day[:, :-1]
+    start = np.maximum.accumulate(np.where(new_day, bars, 0), axis=1)
+    rows = np.arange(close.shape[0])[:, None]
+    before = np.where(start > 0, start - 1, 0)
+    pv_base = np.where(start > 0, pv[rows, before], 0.0)
+    vol_base = np.where(start > 0, vol[rows, before], 0.0)
+    session_vol = vol - vol_base
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(valid & (session_vol > 0), (pv - pv_base) / session_vol, np.nan)
+
+
+@register("obv", "_delta", "volume")
+def _obv(delta, volume):
+    """On-balance volume, starting at 0 on each series' first bar."""
+    step = np.where(np.isfinite(delta) & np.isfinite(volume), np.sign(delta) * volume, 0.0)
+    started = np.maximum.accumulate(np.isfinite(volume), axis=1)
+    return np.where(started, np.cumsum(step, axis=1), np.nan)
+
+
+@register(f"obv_delta_{OBV_DELTA_WINDOW}", "_delta", "volume", warmup=OBV_DELTA_WINDOW - 1)
+def _obv_delta(delta, volume):
+    """OBV change over the last 20 bars (summed signed volume), independent of the window start."""
+    step = np.where(np.isfinite(volume), np.sign(delta) * volume, np.nan)
+    return window_mean(cumulative_sums(step), OBV_DELTA_WINDOW) * OBV_DELTA_WINDOW
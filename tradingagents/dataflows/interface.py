@@ -1,16 +1,36 @@
-from typing import Annotated
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, Tuple
 
 # Crypto data via Bybit (ccxt)
 from .ccxt_bybit import (
     get_ohlcv_bybit,
+    load_ohlcv_df,
+    load_ohlcv_window,
     get_orderbook_window,
     get_funding_rate,
     get_open_interest_change,
 )
+from .ccxt_bybit_async import (
+    aget_ohlcv_bybit,
+    aload_ohlcv_df,
+    aload_ohlcv_window,
+    aget_orderbook_window,
+    aget_funding_rate,
+    aget_open_interest_change,
+)
 from .crypto_indicators import compute_indicators, indicators_summary
+from .indicator_cache import get_indicator_cache, indicator_key
+from .indicator_registry import SUMMARY_COLUMNS, warmup_bars
+from .mtf_indicators import bundle_window, format_bundle, multi_timeframe_bundle, parse_timeframes
+from .price_levels import LEVELS_LOOKBACK
+from .timeframes import timeframe_to_ms
 
 # Configuration and routing logic
 from .config import get_config
+from .market_cache import get_market_cache
+from .rate_limiter import get_rate_limiter
+from .singleflight import SingleFlight, make_call_key
 
 # Tools organized by category
 TOOLS_CATEGORIES = {
@@ -20,7 +40,7 @@ TOOLS_CATEGORIES = {
     },
     "technical_indicators": {
         "description": "Technical analysis indicators (crypto)",
-        "tools": ["get_indicators"],
+        "tools": ["get_indicators", "get_indicator_bundle"],
     },
     "market_micro": {
         "description": "Orderbook, funding, open interest context",
@@ -33,37 +53,135 @@ VENDOR_LIST = [
 ]
 
 
+def _cached_indicator_text(symbol: str, timeframe: str, df, params: dict, build) -> str:
+    """
+    `build()` for the bars in `df`, reused from the indicator cache when the same
+    bars (first bar, whole last bar) and params were seen before. A forming bar
+    can tick its high, low or volume without moving the close, so all of its
+    OHLCV values are part of the key.
+    """
+    cache = get_indicator_cache() if get_config().get("indicator_cache_enabled", True) else None
+    last_bar = [float(df[col].iloc[-1]) for col in ("open", "high", "low", "close", "volume")]
+    params = dict(params, first_ts=int(df["timestamp"].iloc[0]), bars=len(df), last_bar=last_bar)
+    key = indicator_key(symbol, timeframe, int(df["timestamp"].iloc[-1]), float(df["close"].iloc[-1]), params)
+    if cache is not None:
+        hit, value = cache.get(key)
+        if hit:
+            return value
+    text = build()
+    if cache is not None:
+        # A forming last bar changes every tick; keep those results out of the disk cache
+        last_close_ms = int(df["timestamp"].iloc[-1]) + timeframe_to_ms(timeframe)
+        cache.set(key, text, persist=last_close_ms <= int(time.time() * 1000))
+    return text
+
+
+def _levels_lookback() -> int:
+    return int(get_config().get("levels_lookback_bars", LEVELS_LOOKBACK))
+
+
+def _indicator_summary(symbol: str, timeframe: str, df, tail: int = 5) -> str:
+    """Indicator summary of `df` (cached by its bars)."""
+    return _cached_indicator_text(
+        symbol,
+        timeframe,
+        df,
+        {"columns": SUMMARY_COLUMNS, "tail": tail, "levels": _levels_lookback()},
+        lambda: indicators_summary(compute_indicators(df, SUMMARY_COLUMNS), tail=tail, levels_lookback=_levels_lookback()),
+    )
+
+
+def _indicator_window(curr_date: str, look_back_days: int, timeframe: str, tail: int = 5) -> Tuple[int, int]:
+    """
+    [since, until) in ms for the indicator tool. Bounded (`indicator_warmup_bounded`),
+    it spans the summary columns' warmup plus `tail` bars, or the levels look-back
+    if longer, ending at the last bar of `curr_date` (or the current bar);
+    otherwise `look_back_days` whole days.
+    """
+    day = datetime.strptime(curr_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    until_ms = int((day + timedelta(days=1)).timestamp() * 1000)
+    if not get_config().get("indicator_warmup_bounded", True):
+        return int((day - timedelta(days=look_back_days)).timestamp() * 1000), until_ms
+    tf_ms = timeframe_to_ms(timeframe)
+    last_end = min(until_ms, (int(time.time() * 1000) // tf_ms + 1) * tf_ms)
+    bars = max(warmup_bars(SUMMARY_COLUMNS, timeframe) + tail, _levels_lookback())
+    return last_end - bars * tf_ms, until_ms
+
+
 def _ccxt_indicators(symbol: str, indicator: str, curr_date: str, look_back_days: int, timeframe: str = "15m") -> str:
     """
-    Fetch OHLCV and compute indicator bundle. `indicator` argument is ignored to keep API stable.
+    Load OHLCV (via the local bar store) and compute indicator bundle. `indicator` argument is ignored to keep API stable.
+    Only the bars the indicators need to converge are loaded (see `_indicator_window`).
     """
-    # use the shorter window derived from look_back_days
-    from datetime import datetime, timedelta
-    end_date = curr_date
-    start_dt = datetime.strptime(curr_date, "%Y-%m-%d") - timedelta(days=look_back_days)
-    start_date = start_dt.strftime("%Y-%m-%d")
-
-    csv_data = get_ohlcv_bybit(symbol, start_date, end_date, timeframe=timeframe)
-    # Parse back to dataframe for indicators
-    df = None
     try:
-        df = _csv_to_df(csv_data)
-        df = compute_indicators(df)
+        since_ms, until_ms = _indicator_window(curr_date, look_back_days, timeframe)
+        df = load_ohlcv_window(symbol, since_ms, until_ms, timeframe=timeframe)
+        if df.empty:
+            raise ValueError("No data to parse for indicators")
+        return _indicator_summary(symbol, timeframe, df)
+    except Exception as e:
+        return f"# Failed to compute indicators for {symbol}: {e}"
+
+
+async def _accxt_indicators(symbol: str, indicator: str, curr_date: str, look_back_days: int, timeframe: str = "15m") -> str:
+    """Async version of `_ccxt_indicators`."""
+    try:
+        since_ms, until_ms = _indicator_window(curr_date, look_back_days, timeframe)
+        df = await aload_ohlcv_window(symbol, since_ms, until_ms, timeframe=timeframe)
+        if df.empty:
+            raise ValueError("No data to parse for indicators")
+        return _indicator_summary(symbol, timeframe, df)
     except Exception as e:
         return f"# Failed to compute indicators for {symbol}: {e}"
 
-    return indicators_summary(df, tail=5)
 
+def _bundle_window(curr_date: str, timeframes: list) -> Tuple[int, int]:
+    day = datetime.strptime(curr_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    until_ms = int((day + timedelta(days=1)).timestamp() * 1000)
+    return bundle_window(timeframes, until_ms, int(time.time() * 1000))
+
+
+def _bundle_text(symbol: str, timeframes: list, df) -> str:
+    return _cached_indicator_text(
+        symbol,
+        timeframes[0],
+        df,
+        {"bundle": timeframes, "columns": SUMMARY_COLUMNS, "levels": _levels_lookback()},
+        lambda: format_bundle(
+            symbol,
+            multi_timeframe_bundle(df, timeframes, now_ms=int(time.time() * 1000)),
+            levels_lookback=_levels_lookback(),
+        ),
+    )
+
+
+def _ccxt_indicator_bundle(symbol: str, curr_date: str, timeframes: str = "15m,1h,4h") -> str:
+    """
+    Indicator bundles for several timeframes from one load of the shortest one,
+    with cross-timeframe fields (see `mtf_indicators`).
+    """
+    try:
+        tfs = parse_timeframes(timeframes)
+        since_ms, until_ms = _bundle_window(curr_date, tfs)
+        df = load_ohlcv_window(symbol, since_ms, until_ms, timeframe=tfs[0])
+        if df.empty:
+            raise ValueError("No data to parse for indicators")
+        return _bundle_text(symbol, tfs, df)
+    except Exception as e:
+        return f"# Failed to compute indicators for {symbol}: {e}"
 
-def _csv_to_df(csv_str: str):
-    import io
-    import pandas as pd
 
-    lines = [line for line in csv_str.splitlines() if not line.startswith("#")]
-    cleaned = "\n".join(lines)
-    if not cleaned.strip():
-        raise ValueError("No data to parse for indicators")
-    return pd.read_csv(io.StringIO(cleaned))
+async def _accxt_indicator_bundle(symbol: str, curr_date: str, timeframes: str = "15m,1h,4h") -> str:
+    """Async version of `_ccxt_indicator_bundle`."""
+    try:
+        tfs = parse_timeframes(timeframes)
+        since_ms, until_ms = _bundle_window(curr_date, tfs)
+        df = await aload_ohlcv_window(symbol, since_ms, until_ms, timeframe=tfs[0])
+        if df.empty:
+            raise ValueError("No data to parse for indicators")
+        return _bundle_text(symbol, tfs, df)
+    except Exception as e:
+        return f"# Failed to compute indicators for {symbol}: {e}"
 
 
 # Mapping of methods to their vendor-specific implementations
@@ -76,6 +194,9 @@ VENDOR_METHODS = {
     "get_indicators": {
         "ccxt": _ccxt_indicators,
     },
+    "get_indicator_bundle": {
+        "ccxt": _ccxt_indicator_bundle,
+    },
     # extra crypto context (exposed via tools only if needed)
     "get_orderbook": {
         "ccxt": get_orderbook_window,
@@ -88,6 +209,28 @@ VENDOR_METHODS = {
     },
 }
 
+# Coroutine implementations awaited by `aroute_to_vendor`
+ASYNC_VENDOR_METHODS = {
+    "get_stock_data": {
+        "ccxt": aget_ohlcv_bybit,
+    },
+    "get_indicators": {
+        "ccxt": _accxt_indicators,
+    },
+    "get_indicator_bundle": {
+        "ccxt": _accxt_indicator_bundle,
+    },
+    "get_orderbook": {
+        "ccxt": aget_orderbook_window,
+    },
+    "get_funding_rate": {
+        "ccxt": aget_funding_rate,
+    },
+    "get_open_interest_change": {
+        "ccxt": aget_open_interest_change,
+    },
+}
+
 def get_category_for_method(method: str) -> str:
     """Get the category that contains the specified method."""
     for category, info in TOOLS_CATEGORIES.items():
@@ -110,25 +253,82 @@ def get_vendor(category: str, method: str = None) -> str:
     # Fall back to category-level configuration
     return config.get("data_vendors", {}).get(category, "default")
 
-def route_to_vendor(method: str, *args, **kwargs):
-    """Route method calls to appropriate vendor implementation with fallback support."""
+def _vendor_order(method: str, methods: dict):
+    """Return (primary_vendors, fallback_vendors) for a method."""
     category = get_category_for_method(method)
     vendor_config = get_vendor(category, method)
 
     # Handle comma-separated vendors
     primary_vendors = [v.strip() for v in vendor_config.split(',')]
 
-    if method not in VENDOR_METHODS:
+    if method not in methods:
         raise ValueError(f"Method '{method}' not supported")
 
     # Get all available vendors for this method for fallback
-    all_available_vendors = list(VENDOR_METHODS[method].keys())
-    
+    all_available_vendors = list(methods[method].keys())
+
     # Create fallback vendor list: primary vendors first, then remaining vendors as fallbacks
     fallback_vendors = primary_vendors.copy()
     for vendor in all_available_vendors:
         if vendor not in fallback_vendors:
             fallback_vendors.append(vendor)
+    return primary_vendors, fallback_vendors
+
+# Shares one upstream fetch between concurrent identical tool calls
+_inflight = SingleFlight()
+
+def _primary_impl(method: str, methods: dict):
+    """First available implementation in vendor order, used to normalize call arguments."""
+    _, fallback_vendors = _vendor_order(method, methods)
+    impl = next((methods[method][v] for v in fallback_vendors if v in methods[method]), None)
+    if isinstance(impl, list):
+        impl = impl[0]
+    return impl
+
+def _cached_call(method: str, methods: dict, args: tuple, kwargs: dict):
+    """Return (key, cache, expires_at, cached_hit, cached_value) for a routed call."""
+    config = get_config()
+    impl = _primary_impl(method, methods)
+    key = make_call_key(method, impl, args, kwargs)
+    cache = get_market_cache() if config.get("market_cache_enabled", True) else None
+    expires_at = cache.expiry_for(method, impl, args, kwargs) if cache else None
+    if expires_at is None:
+        return key, cache, None, False, None
+    hit, value = cache.get(method, key)
+    return key, cache, expires_at, hit, value
+
+def get_dataflow_stats() -> dict:
+    """Counters for the market and indicator caches, request coalescing and rate limiter."""
+    return {
+        "market_cache": get_market_cache().stats(),
+        "indicator_cache": get_indicator_cache().stats(),
+        "coalescing": _inflight.stats(),
+        "rate_limits": get_rate_limiter().stats(),
+    }
+
+def route_to_vendor(method: str, *args, **kwargs):
+    """Route method calls to appropriate vendor implementation with fallback support.
+
+    Market-data results are served from the bar-close-aware cache while fresh
+    (`market_cache_enabled`), and concurrent calls with the same method and
+    arguments share a single upstream fetch (`coalesce_requests`).
+    """
+    key, cache, expires_at, hit, value = _cached_call(method, VENDOR_METHODS, args, kwargs)
+    if hit:
+        return value
+
+    def fetch():
+        result = _route_to_vendor(method, *args, **kwargs)
+        if expires_at is not None:
+            cache.set(key, result, expires_at)
+        return result
+
+    if not get_config().get("coalesce_requests", True):
+        return fetch()
+    return _inflight.do(key, fetch)
+
+def _route_to_vendor(method: str, *args, **kwargs):
+    primary_vendors, fallback_vendors = _vendor_order(method, VENDOR_METHODS)
 
     # Debug: Print fallback ordering
     primary_str = " → ".join(primary_vendors)
@@ -207,3 +407,39 @@ def route_to_vendor(method: str, *args, **kwargs):
     else:
         # Convert all results to strings and concatenate
         return '\n'.join(str(result) for result in results)
+
+
+async def aroute_to_vendor(method: str, *args, **kwargs):
+    """Async counterpart of `route_to_vendor` for methods with coroutine implementations.
+
+    Vendors are tried in the same primary-then-fallback order; the first one that
+    succeeds wins. Caching and coalescing behave like the sync path.
+    """
+    key, cache, expires_at, hit, value = _cached_call(method, ASYNC_VENDOR_METHODS, args, kwargs)
+    if hit:
+        return value
+
+    async def fetch():
+        result = await _aroute_to_vendor(method, *args, **kwargs)
+        if expires_at is not None:
+            cache.set(key, result, expires_at)
+        return result
+
+    if not get_config().get("coalesce_requests", True):
+        return await fetch()
+    return await _inflight.ado(("async",) + key, fetch)
+
+
+async def _aroute_to_vendor(method: str, *args, **kwargs):
+    primary_vendors, fallback_vendors = _vendor_order(method, ASYNC_VENDOR_METHODS)
+
+    for vendor in fallback_vendors:
+        impl_func = ASYNC_VENDOR_METHODS[method].get(vendor)
+        if impl_func is None:
+            continue
+        try:
+            return await impl_func(*args, **kwargs)
+        except Exception as e:
+            print(f"FAILED: {impl_func.__name__} from vendor '{vendor}' failed: {e}")
+
+    raise RuntimeError(f"All vendor implementations failed for method '{method}'")
@@ -0,0 +1,305 @@
+"""
+In-memory kline ring buffers fed by push-style sources.
+
+A `KlineFeed` pushes bars as `(symbol, timeframe, [ts, o, h, l, c, v])` into a
+`KlineStreamHub`, which keeps one fixed-capacity `BarRingBuffer` per series. An
+update with the same timestamp as the newest bar replaces it (the forming bar
+ticking), a newer timestamp appends. `load_ohlcv_df` reads a window straight
+from the hub when the buffer covers it up to the current bar, so live analysis
+needs no REST round trip.
+
+Sources: `CcxtProKlineFeed` (websocket via ccxt.pro, optional dependency) in
+production and `ReplayKlineFeed` (JSON-lines file) in tests and replays. The API
+starts the feed for `kline_stream_subscriptions` through
+`ccxt_bybit.start_kline_stream`, which seeds the buffers from the bar store.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+from .timeframes import timeframe_to_ms
+
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+BarCallback = Callable[[str, str, List[float]], None]
+
+
+class BarRingBuffer:
+    """Fixed-capacity ring of OHLCV bars ordered by timestamp."""
+
+    def __init__(self, capacity: int = 5000):
+        self.capacity = capacity
+        self._ts = np.zeros(capacity, dtype=np.int64)
+        self._values = np.zeros((capacity, 5), dtype=np.float64)
+        self._start = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _slot(self, i: int) -> int:
+        return (self._start + i) % self.capacity
+
+    def update(self, bar: List[float]) -> None:
+        """Append a newer bar or overwrite the newest one; older bars are ignored."""
+        ts = int(bar[0])
+        with self._lock:
+            if self._size:
+                last = self._slot(self._size - 1)
+                if ts == self._ts[last]:
+                    self._values[last] = bar[1:6]
+                    return
+                if ts < self._ts[last]:
+                    return
+            if self._size < self.capacity:
+                slot = self._slot(self._size)
+                self._size += 1
+            else:
+                slot = self._start
+                self._start = (self._start + 1) % self.capacity
+            self._ts[slot] = ts
+            self._values[slot] = bar[1:6]
+
+    def extend(self, bars: Iterable[List[float]]) -> None:
+        for bar in bars:
+            self.update(bar)
+
+    def bounds(self) -> Optional[Tuple[int, int]]:
+        """(first_ts, last_ts) currently held, or None when empty."""
+        with self._lock:
+            if not self._size:
+                return None
+            return int(self._ts[self._start]), int(self._ts[self._slot(self._size - 1)])
+
+    def count(self, since_ms: int, until_ms: int) -> int:
+        """Number of bars held in [since_ms, until_ms)."""
+        with self._lock:
+            order = (self._start + np.arange(self._size)) % self.capacity
+            ts = self._ts[order]
+        return int(np.searchsorted(ts, until_ms, side="left") - np.searchsorted(ts, since_ms, side="left"))
+
+    def window(self, since_ms: int, until_ms: int) -> pd.DataFrame:
+        """Bars in [since_ms, until_ms) as an OHLCV DataFrame."""
+        with self._lock:
+            order = (self._start + np.arange(self._size)) % self.capacity
+            ts = self._ts[order]
+            values = self._values[order]
+        mask = (ts >= since_ms) & (ts < until_ms)
+        df = pd.DataFrame(values[mask], columns=OHLCV_COLUMNS[1:])
+        df.insert(0, "timestamp", ts[mask])
+        return df
+
+
+class KlineStreamHub:
+    """Routes pushed bars into per-(symbol, timeframe) ring buffers."""
+
+    def __init__(self, capacity: int = 5000):
+        self.capacity = capacity
+        self._buffers: Dict[Tuple[str, str], BarRingBuffer] = {}
+        self._feeds: List["KlineFeed"] = []
+        self._listeners: List[BarCallback] = []
+        self._lock = threading.Lock()
+
+    def buffer(self, symbol: str, timeframe: str) -> BarRingBuffer:
+        with self._lock:
+            key = (symbol, timeframe)
+            if key not in self._buffers:
+                self._buffers[key] = BarRingBuffer(self.capacity)
+            return self._buffers[key]
+
+    def add_listener(self, callback: BarCallback) -> None:
+        """Also forward every pushed bar to `callback` (e.g. `IndicatorEngine.on_bar`)."""
+        self._listeners.append(callback)
+
+    def on_bar(self, symbol: str, timeframe: str, bar: List[float]) -> None:
+        self.buffer(symbol, timeframe).update(bar)
+        for callback in self._listeners:
+            callback(symbol, timeframe, bar)
+
+    def seed(self, symbol: str, timeframe: str, df: pd.DataFrame) -> None:
+        """Preload history (e.g. from the bar store) before the feed takes over."""
+        self.buffer(symbol, timeframe).extend(df[OHLCV_COLUMNS].itertuples(index=False, name=None))
+
+    def attach(self, feed: "KlineFeed") -> None:
+        self._feeds.append(feed)
+        feed.start(self.on_bar)
+
+    def stop(self) -> None:
+        for feed in self._feeds:
+            feed.stop()
+        self._feeds.clear()
+
+    def covers(self, symbol: str, timeframe: str, since_ms: int, until_ms: int, now_ms: int) -> bool:
+        """
+        True if the buffer holds every bar of the window, including the newest
+        bar the window can contain. A stalled feed misses the latest bar and
+        stops qualifying on its own; bars missed across a reconnect leave a gap
+        that fails the bar count.
+        """
+        buf = self._buffers.get((symbol, timeframe))
+        bounds = buf.bounds() if buf is not None else None
+        if bounds is None:
+            return False
+        tf_ms = timeframe_to_ms(timeframe)
+        first_needed = -(-since_ms // tf_ms) * tf_ms
+        last_needed = min(-(-until_ms // tf_ms) * tf_ms - tf_ms, now_ms // tf_ms * tf_ms)
+        if bounds[0] > first_needed or bounds[1] < last_needed:
+            return False
+        expected = max((last_needed - first_needed) // tf_ms + 1, 0)
+        return buf.count(first_needed, last_needed + 1) == expected
+
+    def window(self, symbol: str, timeframe: str, since_ms: int, until_ms: int) -> pd.DataFrame:
+        return self.buffer(symbol, timeframe).window(since_ms, until_ms)
+
+
+class KlineFeed(ABC):
+    """Push source of bars. Subclasses call `on_bar(symbol, timeframe, bar)`."""
+
+    @abstractmethod
+    def start(self, on_bar: BarCallback) -> None:
+        """Begin pushing bars to `on_bar`."""
+
+    def stop(self) -> None:
+        """Stop pushing bars (no-op by default)."""
+
+
+class ReplayKlineFeed(KlineFeed):
+    """
+    Replays a JSON-lines file (optionally gzip) of
+    {"symbol": ..., "timeframe": ..., "bar": [ts, o, h, l, c, v]} records.
+
+    With `interval=0` all bars are pushed synchronously inside `start`; otherwise
+    they are pushed from a background thread `interval` seconds apart.
+    """
+
+    def __init__(self, path: str, interval: float = 0.0):
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _records(self):
+        opener = gzip.open if self.path.endswith(".gz") else open
+        with opener(self.path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+
+    def _run(self, on_bar: BarCallback) -> None:
+        for record in self._records():
+            if self._stop.is_set():
+                return
+            on_bar(record["symbol"], record["timeframe"], record["bar"])
+            if self.interval:
+                time.sleep(self.interval)
+
+    def start(self, on_bar: BarCallback) -> None:
+        if not self.interval:
+            self._run(on_bar)
+            return
+        self._thread = threading.Thread(target=self._run, args=(on_bar,), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+
+class CcxtProKlineFeed(KlineFeed):
+    """
+    Websocket klines through `ccxt.pro.watch_ohlcv`, run on a private event loop
+    in a daemon thread. Requires ccxt with the pro module.
+    """
+
+    def __init__(self, subscriptions: Iterable[Tuple[str, str]], exchange_id: str = "bybit"):
+        self.subscriptions = list(subscriptions)
+        self.exchange_id = exchange_id
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._tasks: List[asyncio.Future] = []
+        self._running = False
+
+    async def _watch(self, exchange: Any, symbol: str, timeframe: str, on_bar: BarCallback) -> None:
+        while self._running:
+            try:
+                for bar in await exchange.watch_ohlcv(symbol, timeframe):
+                    on_bar(symbol, timeframe, bar)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # pragma: no cover - network specific
+                print(f"WARNING: kline stream {symbol} {timeframe} error: {e}")
+                await asyncio.sleep(1.0)
+
+    async def _main(self, on_bar: BarCallback) -> None:
+        import ccxt.pro as ccxtpro  # optional dependency
+
+        exchange = getattr(ccxtpro, self.exchange_id)({"enableRateLimit": True})
+        try:
+            self._tasks = [
+                asyncio.ensure_future(self._watch(exchange, s, tf, on_bar)) for s, tf in self.subscriptions
+            ]
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        finally:
+            await exchange.close()
+
+    def _run(self, on_bar: BarCallback) -> None:
+        try:
+            self._loop.run_until_complete(self._main(on_bar))
+        finally:
+            self._loop.close()
+
+    def _cancel_tasks(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+    def start(self, on_bar: BarCallback) -> None:
+        import ccxt.pro  # noqa: F401 - fail here rather than inside the thread
+
+        self._running = True
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, args=(on_bar,), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        # A watcher blocked in `watch_ohlcv` never re-checks `_running`: cancel
+        # it on its own loop so `_main` closes the exchange connection.
+        self._running = False
+        if self._loop is not None and not self._loop.is_closed():
+            try:
+                self._loop.call_soon_threadsafe(self._cancel_tasks)
+            except RuntimeError:  # loop closed in between
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+
+
+_hub: Optional[KlineStreamHub] = None
+
+
+def get_stream_hub() -> KlineStreamHub:
+    """Process-wide hub consulted by `load_ohlcv_df`."""
+    global _hub
+    if _hub is None:
+        _hub = KlineStreamHub(int(get_config().get("kline_buffer_capacity", 5000)))
+    return _hub
+
+
+def reset_stream_hub() -> None:
+    """Stop attached feeds and drop all buffers."""
+    global _hub
+    if _hub is not None:
+        _hub.stop()
+    _hub = None
@@ -0,0 +1,126 @@
+"""
+Bar-close-aware result cache for routed market-data tools.
+
+OHLCV and indicator results only change when a bar closes, so their entries
+expire exactly at the next close of the requested timeframe. Funding and open
+interest entries use their own TTLs from config. Per-method hit/miss counters
+make the cache's effect visible in production.
+"""
+
+from __future__ import annotations
+
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .config import get_config
+from .timeframes import timeframe_to_ms
+
+# How each routed method expires: "bar_close" or the config key holding its TTL
+CACHE_POLICIES = {
+    "get_stock_data": "bar_close",
+    "get_indicators": "bar_close",
+    "get_indicator_bundle": "bar_close",
+    "get_funding_rate": "funding_rate_cache_ttl_seconds",
+    "get_open_interest_change": "open_interest_cache_ttl_seconds",
+}
+
+# Error/empty texts returned by the dataflows must not be kept until the next bar
+_UNCACHEABLE_MARKERS = ("# Failed", "# No ", "unavailable", "insufficient data")
+
+
+def next_bar_close(timeframe: str, now: float) -> float:
+    """Epoch seconds at which the bar containing `now` closes."""
+    tf_ms = timeframe_to_ms(timeframe)
+    now_ms = int(now * 1000)
+    return (now_ms // tf_ms + 1) * tf_ms / 1000.0
+
+
+def _timeframe_arg(func: Optional[Callable], args: tuple, kwargs: dict) -> str:
+    if func is not None:
+        try:
+            bound = inspect.signature(func).bind(*args, **kwargs)
+            bound.apply_defaults()
+            return bound.arguments.get("timeframe", "15m")
+        except (TypeError, ValueError):
+            pass
+    return kwargs.get("timeframe", "15m")
+
+
+def _is_cacheable(result: Any) -> bool:
+    if not isinstance(result, str):
+        return False
+    first_line = result.split("\n", 1)[0]
+    return not any(marker in first_line for marker in _UNCACHEABLE_MARKERS)
+
+
+class MarketDataCache:
+    """Thread-safe LRU of routed results with absolute expiry times."""
+
+    def __init__(self, max_entries: int = 2048, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def expiry_for(self, method: str, func: Optional[Callable], args: tuple, kwargs: dict) -> Optional[float]:
+        """Absolute expiry (epoch seconds) for a call, or None if it is not cached."""
+        policy = CACHE_POLICIES.get(method)
+        if policy is None:
+            return None
+        now = self._clock()
+        if policy == "bar_close":
+            return next_bar_close(_timeframe_arg(func, args, kwargs), now)
+        return now + float(get_config().get(policy, 60))
+
+    def get(self, method: str, key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            stats = self._stats.setdefault(method, {"hits": 0, "misses": 0})
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                stats["hits"] += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            stats["misses"] += 1
+            return False, None
+
+    def set(self, key: Hashable, value: Any, expires_at: float) -> None:
+        if not _is_cacheable(value):
+            return
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-method hits, misses and hit_rate since start (or the last clear)."""
+        with self._lock:
+            out = {}
+            for method, counts in self._stats.items():
+                total = counts["hits"] + counts["misses"]
+                out[method] = dict(counts, hit_rate=counts["hits"] / total if total else 0.0)
+            return out
+
+
+_cache: Optional[MarketDataCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_market_cache() -> MarketDataCache:
+    """Return the process-wide cache sized by `market_cache_max_entries`."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = MarketDataCache(int(get_config().get("market_cache_max_entries", 2048)))
+        return _cache
@@ -0,0 +1,253 @@
+"""
+On-disk snapshot of exchange market metadata.
+
+The snapshot (`data_cache_dir/markets/<exchange>.json`) keeps every market's
+symbol, exchange id, contract size, tick size, amount step, status and listing
+time, plus the unified ccxt market dicts so pooled clients can start from it
+with `set_markets` instead of downloading the market list again. It is refreshed
+from the exchange once older than `market_catalogue_ttl_seconds`; a stale
+snapshot is still used when the refresh fails.
+
+`normalize_symbol` resolves user input such as "BTC/USDT", "BTCUSDT",
+"btc-usdt" or "BTC/USDT:USDT" to a listed symbol with a dict lookup, so the API
+and CLI can reject bad symbols before any LLM or data work starts. Every
+spelling of a base/quote pair maps to one canonical market, the linear
+perpetual where one is listed, so "BTC/USDT" and "BTCUSDT" never end up as two
+different instruments.
+"""
+
+from __future__ import annotations
+
+import difflib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .config import get_config
+
+CATALOGUE_VERSION = 1
+
+
+class UnknownSymbolError(ValueError):
+    """Raised when a symbol is not listed (or not trading) on the exchange."""
+
+    def __init__(self, symbol: str, suggestions: List[str]):
+        self.symbol = symbol
+        self.suggestions = suggestions
+        hint = f" Did you mean: {', '.join(suggestions)}?" if suggestions else ""
+        super().__init__(f"Unknown or inactive symbol '{symbol}'.{hint}")
+
+
+def _alias_key(symbol: str) -> str:
+    return re.sub(r"[^A-Z0-9]", "", symbol.upper())
+
+
+def _compact(market: Dict[str, Any]) -> Dict[str, Any]:
+    precision = market.get("precision") or {}
+    limits = (market.get("limits") or {}).get("amount") or {}
+    return {
+        "id": market.get("id"),
+        "base": market.get("base"),
+        "quote": market.get("quote"),
+        "settle": market.get("settle"),
+        "type": market.get("type"),
+        "linear": market.get("linear"),
+        "active": market.get("active") is not False,
+        "contract_size": market.get("contractSize"),
+        "tick_size": precision.get("price"),
+        "amount_step": precision.get("amount"),
+        "min_amount": limits.get("min"),
+        # Listing time in ms where the exchange reports it (ccxt `created`)
+        "listed_at": market.get("created"),
+    }
+
+
+class MarketCatalogue:
+    """
+    Symbol metadata plus an alias index for normalization.
+
+    Args:
+        markets: {symbol: compact metadata} (see `from_ccxt_markets`)
+        fetched_at: epoch seconds of the exchange download
+        raw_markets: unified ccxt market dicts (without "info") for client seeding
+        preferred_type: market type chosen when an alias is ambiguous
+    """
+
+    def __init__(
+        self,
+        markets: Dict[str, Dict[str, Any]],
+        fetched_at: float,
+        raw_markets: Optional[Dict[str, Dict[str, Any]]] = None,
+        preferred_type: str = "swap",
+    ):
+        self.markets = markets
+        self.fetched_at = fetched_at
+        self.raw_markets = raw_markets or {}
+        self.preferred_type = preferred_type
+        self._aliases: Dict[str, str] = {}
+        self._index()
+
+    @classmethod
+    def from_ccxt_markets(cls, markets: Dict[str, Dict[str, Any]], fetched_at: Optional[float] = None, **kwargs):
+        raw = {s: {k: v for k, v in m.items() if k != "info"} for s, m in markets.items()}
+        compact = {s: _compact(m) for s, m in markets.items()}
+        return cls(compact, time.time() if fetched_at is None else fetched_at, raw, **kwargs)
+
+    def _rank(self, symbol: str) -> tuple:
+        m = self.markets[symbol]
+        return (
+            not m["active"],
+            m["type"] != self.preferred_type,
+            m["linear"] is False,
+            len(symbol),
+            symbol,
+        )
+
+    def _index(self) -> None:
+        candidates: Dict[str, List[str]] = {}
+        for symbol, m in self.markets.items():
+            keys = {_alias_key(symbol), _alias_key(f"{m['base']}{m['quote']}")}
+            if m.get("id"):
+                keys.add(_alias_key(m["id"]))
+            for key in keys:
+                candidates.setdefault(key, []).append(symbol)
+        self._aliases = {key: min(symbols, key=self._rank) for key, symbols in candidates.items()}
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (time.time() if now is None else now) - self.fetched_at
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        return self.markets[self.normalize(symbol)]
+
+    def normalize(self, symbol: str) -> str:
+        """
+        Return the canonical listed symbol for `symbol`, or raise `UnknownSymbolError`.
+
+        The alias index is consulted before exact symbols, so a listed spot
+        symbol such as "BTC/USDT" resolves to the preferred market for its
+        base/quote pair like "BTCUSDT" does.
+        """
+        text = symbol.strip()
+        resolved = self._aliases.get(_alias_key(text)) or (text if text in self.markets else None)
+        if resolved is None or not self.markets[resolved]["active"]:
+            suggestions = difflib.get_close_matches(text.upper(), list(self.markets), n=3, cutoff=0.6)
+            raise UnknownSymbolError(text, suggestions)
+        return resolved
+
+    def save(self, path: str) -> None:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": CATALOGUE_VERSION,
+            "fetched_at": self.fetched_at,
+            "markets": self.markets,
+            "raw_markets": self.raw_markets,
+        }
+        tmp = target.with_suffix(target.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload, default=str))
+        os.replace(tmp, target)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> Optional["MarketCatalogue"]:
+        try:
+            payload = json.loads(Path(path).read_text())
+        except (OSError, ValueError):
+            return None
+        if payload.get("version") != CATALOGUE_VERSION:
+            return None
+        return cls(payload["markets"], payload["fetched_at"], payload.get("raw_markets"), **kwargs)
+
+
+_catalogues: Dict[str, MarketCatalogue] = {}
+_failed_refresh_at: Dict[str, float] = {}
+_lock = threading.Lock()
+# After a failed refresh, wait this long before hitting the exchange again
+REFRESH_RETRY_SECONDS = 300.0
+
+
+def catalogue_path(exchange: str = "bybit") -> Path:
+    return Path(get_config()["data_cache_dir"]) / "markets" / f"{exchange}.json"
+
+
+def _ttl() -> float:
+    return float(get_config().get("market_catalogue_ttl_seconds", 86400))
+
+
+def set_market_catalogue(catalogue: Optional[MarketCatalogue], exchange: str = "bybit") -> None:
+    """Inject (or with None, forget) the in-memory catalogue, e.g. in tests."""
+    with _lock:
+        if catalogue is None:
+            _catalogues.pop(exchange, None)
+        else:
+            _catalogues[exchange] = catalogue
+
+
+def load_market_catalogue(exchange: str = "bybit") -> Optional[MarketCatalogue]:
+    """In-memory catalogue, falling back to the on-disk snapshot; no network."""
+    with _lock:
+        catalogue = _catalogues.get(exchange)
+        if catalogue is None:
+            catalogue = MarketCatalogue.load(str(catalogue_path(exchange)))
+            if catalogue is not None:
+                _catalogues[exchange] = catalogue
+        return catalogue
+
+
+def save_market_catalogue(markets: Any, exchange: str = "bybit") -> Optional[MarketCatalogue]:
+    """Snapshot freshly loaded ccxt markets; empty or non-dict results are ignored."""
+    if not isinstance(markets, dict) or not markets:
+        return None
+    catalogue = MarketCatalogue.from_ccxt_markets(markets)
+    try:
+        catalogue.save(str(catalogue_path(exchange)))
+    except OSError as e:  # pragma: no cover - read-only cache dir
+        print(f"WARNING: could not persist market catalogue: {e}")
+    set_market_catalogue(catalogue, exchange)
+    return catalogue
+
+
+def fresh_market_catalogue(exchange: str = "bybit") -> Optional[MarketCatalogue]:
+    """The catalogue if it exists and is within the refresh TTL."""
+    catalogue = load_market_catalogue(exchange)
+    return catalogue if catalogue is not None and catalogue.age() <= _ttl() else None
+
+
+def get_market_catalogue(exchange: str = "bybit") -> Optional[MarketCatalogue]:
+    """
+    Return the catalogue, refreshing it through the pooled client when missing
+    or older than the TTL. Returns a stale snapshot (or None) if that fails.
+    """
+    catalogue = fresh_market_catalogue(exchange)
+    if catalogue is not None:
+        return catalogue
+    if time.time() - _failed_refresh_at.get(exchange, float("-inf")) < REFRESH_RETRY_SECONDS:
+        return load_market_catalogue(exchange)
+    try:
+        from .ccxt_pool import get_client
+
+        client = get_client(exchange)
+        return save_market_catalogue(getattr(client, "markets", None), exchange) or load_market_catalogue(exchange)
+    except Exception as e:
+        _failed_refresh_at[exchange] = time.time()
+        print(f"WARNING: market catalogue refresh failed ({e}); using cached snapshot if any")
+        return load_market_catalogue(exchange)
+
+
+def normalize_symbol(symbol: str, exchange: str = "bybit", refresh: bool = True) -> str:
+    """
+    Resolve `symbol` to a listed market symbol. Without any catalogue (offline,
+    no snapshot yet) the input is returned stripped and unvalidated.
+
+    Args:
+        refresh: refresh a missing or expired catalogue from the exchange; with
+            False only the in-memory or on-disk snapshot is used, so the call
+            never blocks on the network (as request handlers need)
+    """
+    catalogue = get_market_catalogue(exchange) if refresh else load_market_catalogue(exchange)
+    if catalogue is None:
+        return symbol.strip()
+    return catalogue.normalize(symbol)
@@ -0,0 +1,175 @@
+"""
+Multi-timeframe indicator bundle from one base OHLCV load.
+
+The smallest requested timeframe is the base: one window of base bars, long
+enough for the warmup of the largest timeframe, is loaded once. Every higher
+timeframe is resampled from it (`resample_ohlcv`, keeping the forming bar), so
+all bundles end at the same moment. The text output puts one CSV row per
+timeframe next to cross-timeframe fields: how the base price sits against each
+higher timeframe's SMA stack, and whether stacks and MACD momentum agree, then
+the base timeframe's swing levels, S/R zones and range state (`price_levels`).
+The analyst gets 15m/1h/4h context in a single tool turn.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .crypto_indicators import compute_indicators
+from .indicator_registry import SUMMARY_COLUMNS, warmup_bars
+from .price_levels import LEVELS_LOOKBACK, detect_levels, format_levels
+from .resample import resample_ohlcv
+from .timeframes import timeframe_to_ms
+
+STACK_SMAS = ("sma_7", "sma_25", "sma_99")
+
+
+def parse_timeframes(timeframes: Any) -> List[str]:
+    """Timeframes from "15m,1h,4h" or a sequence, ordered from shortest to longest."""
+    items = timeframes.split(",") if isinstance(timeframes, str) else list(timeframes)
+    unique = list(dict.fromkeys(tf.strip() for tf in items if tf.strip()))
+    if not unique:
+        raise ValueError("No timeframes requested")
+    ordered = sorted(unique, key=timeframe_to_ms)
+    base_ms = timeframe_to_ms(ordered[0])
+    for tf in ordered[1:]:
+        if timeframe_to_ms(tf) % base_ms:
+            raise ValueError(f"{tf} is not a multiple of the base timeframe {ordered[0]}")
+    return ordered
+
+
+def bundle_window(timeframes: Sequence[str], until_ms: int, now_ms: int, tail: int = 5) -> Tuple[int, int]:
+    """
+    [since, until) of base bars covering every timeframe's warmup plus `tail` bars,
+    ending at the last bar before `until_ms` (or the current bar).
+    """
+    top_ms = timeframe_to_ms(timeframes[-1])
+    base_ms = timeframe_to_ms(timeframes[0])
+    last_end = min(until_ms, (now_ms // base_ms + 1) * base_ms)
+    span = max((warmup_bars(SUMMARY_COLUMNS, tf) + tail) * timeframe_to_ms(tf) for tf in timeframes)
+    since = last_end - span
+    # Start on a boundary of the longest timeframe so its first bucket is complete
+    return since - since % top_ms, until_ms
+
+
+def multi_timeframe_bundle(
+    base_df: pd.DataFrame, timeframes: Sequence[str], now_ms: Optional[int] = None
+) -> Dict[str, pd.DataFrame]:
+    """{timeframe: bars with `SUMMARY_COLUMNS`} with higher timeframes resampled from `base_df`."""
+    base = timeframes[0]
+    frames = {base: base_df}
+    for tf in timeframes[1:]:
+        frames[tf] = resample_ohlcv(base_df, base, tf, keep_partial_last=True, now_ms=now_ms)
+    return {tf: compute_indicators(df, SUMMARY_COLUMNS) for tf, df in frames.items() if not df.empty}
+
+
+def sma_stack(row: pd.Series) -> str:
+    """SMA stack of a row: "bullish" (7 > 25 > 99), "bearish" (7 < 25 < 99) or "mixed"."""
+    values = [row.get(c) for c in STACK_SMAS]
+    if any(v is None or not np.isfinite(v) for v in values):
+        return "n/a"
+    if values[0] > values[1] > values[2]:
+        return "bullish"
+    if values[0] < values[1] < values[2]:
+        return "bearish"
+    return "mixed"
+
+
+def cross_timeframe_fields(latest: Dict[str, pd.Series]) -> Dict[str, Any]:
+    """
+    Base-price position against each higher timeframe's SMA stack plus agreement
+    counts across timeframes.
+
+    Args:
+        latest: {timeframe: latest indicator row}, base timeframe first
+    """
+    timeframes = list(latest)
+    price = float(latest[timeframes[0]]["close"])
+    out: Dict[str, Any] = {"higher": {}}
+    for tf in timeframes[1:]:
+        row = latest[tf]
+        stack = sma_stack(row)
+        distances = {}
+        for col in STACK_SMAS:
+            value = row.get(col)
+            distances[col] = (price / value - 1) * 100 if value is not None and np.isfinite(value) and value else np.nan
+        finite = [d for d in distances.values() if np.isfinite(d)]
+        if len(finite) < len(STACK_SMAS):
+            position = "n/a"
+        elif all(d > 0 for d in finite):
+            position = "above_all"
+        elif all(d < 0 for d in finite):
+            position = "below_all"
+        else:
+            position = "inside"
+        if stack == "bullish" and position == "above_all":
+            alignment = "aligned_bullish"
+        elif stack == "bearish" and position == "below_all":
+            alignment = "aligned_bearish"
+        elif stack in ("bullish", "bearish") and position in ("above_all", "below_all"):
+            alignment = "against_stack"
+        else:
+            alignment = "neutral"
+        out["higher"][tf] = {"stack": stack, "price_vs_pct": distances, "position": position, "alignment": alignment}
+
+    stacks = [sma_stack(latest[tf]) for tf in timeframes]
+    out["bullish_stacks"] = stacks.count("bullish")
+    out["bearish_stacks"] = stacks.count("bearish")
+    out["macd_hist_signs"] = {
+        tf: ("+" if latest[tf]["macd_hist"] > 0 else "-" if latest[tf]["macd_hist"] < 0 else "0")
+        if np.isfinite(latest[tf]["macd_hist"])
+        else "n/a"
+        for tf in timeframes
+    }
+    return out
+
+
+def _fmt(value: Any) -> str:
+    if value is None or (isinstance(value, float) and not np.isfinite(value)):
+        return ""
+    return format(float(value), ".8g")
+
+
+def format_bundle(
+    symbol: str, bundles: Dict[str, pd.DataFrame], levels_lookback: Optional[int] = LEVELS_LOOKBACK
+) -> str:
+    """
+    One CSV row of latest values per timeframe followed by the cross-timeframe
+    fields and the base timeframe's levels over `levels_lookback` bars (None: no levels).
+    """
+    latest = {tf: df.iloc[-1] for tf, df in bundles.items()}
+    base = next(iter(latest))
+    as_of = pd.to_datetime(int(latest[base]["timestamp"]), unit="ms").strftime("%Y-%m-%d %H:%M")
+    lines = [
+        f"# Multi-timeframe indicators for {symbol} (latest {base} bar {as_of} UTC; "
+        "higher timeframes include their forming bar)",
+        ",".join(["timeframe", "bar_time", "close", *SUMMARY_COLUMNS, "sma_stack"]),
+    ]
+    for tf, row in latest.items():
+        bar_time = pd.to_datetime(int(row["timestamp"]), unit="ms").strftime("%Y-%m-%d %H:%M")
+        values = [_fmt(row["close"])] + [_fmt(row.get(c)) for c in SUMMARY_COLUMNS]
+        lines.append(",".join([tf, bar_time, *values, sma_stack(row)]))
+
+    cross = cross_timeframe_fields(latest)
+    if cross["higher"]:
+        lines.append(f"# Cross-timeframe: {base} close vs higher-timeframe SMA stacks")
+        for tf, fields in cross["higher"].items():
+            distances = " ".join(
+                f"vs_{col.replace('_', '')}=" + (f"{pct:+.2f}%" if np.isfinite(pct) else "n/a")
+                for col, pct in fields["price_vs_pct"].items()
+            )
+            lines.append(
+                f"{tf}: stack={fields['stack']} position={fields['position']} "
+                f"alignment={fields['alignment']} {distances}"
+            )
+    signs = ",".join(f"{tf}:{sign}" for tf, sign in cross["macd_hist_signs"].items())
+    lines.append(
+        f"agreement: bullish_stacks={cross['bullish_stacks']}/{len(latest)} "
+        f"bearish_stacks={cross['bearish_stacks']}/{len(latest)} macd_hist_signs={signs}"
+    )
+    if levels_lookback and len(bundles[base]) > 1:
+        lines.extend(format_levels(detect_levels(bundles[base], lookback=levels_lookback)))
+    return "\n".join(lines) + "\n"
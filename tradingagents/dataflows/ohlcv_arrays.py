@@ -0,0 +1,103 @@
+"""
+Compact, array-backed OHLCV bars for long histories.
+
+`OhlcvArrays` holds one series as plain NumPy columns: int64 epoch-millisecond
+timestamps and float32 (by default) open/high/low/close/volume. Against a
+float64 DataFrame with a datetime column that is about half the memory per bar,
+with no index or block manager on top, which matters for multi-year backtests
+and many-symbol watchlist scans.
+
+Columns are read with `bars["close"]` like a frame, and `tail`/`window` return
+views, so the indicator kernels consume them without a copy; the kernels keep
+float32 inputs as they are and accumulate in float64 (see `indicator_kernel`).
+`indicator_kernel.stack_closes` stacks many of them into a matrix of the same
+dtype.
+`to_frame` converts back where a DataFrame is needed for formatting.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+COMPACT_DTYPE = np.dtype("float32")
+
+
+class OhlcvArrays:
+    """
+    One OHLCV series as a timestamp array plus price/volume arrays of one dtype.
+
+    Args:
+        timestamp: bar open times in epoch ms, ascending
+        columns: {"open", "high", "low", "close", "volume": array}; each must have
+            the length of `timestamp`
+        dtype: price/volume dtype; arrays already of that dtype are kept without copying
+    """
+
+    __slots__ = ("timestamp", "_columns")
+
+    def __init__(self, timestamp: Any, columns: Mapping[str, Any], dtype: Any = COMPACT_DTYPE):
+        self.timestamp = np.asarray(timestamp, dtype=np.int64)
+        self._columns: Dict[str, np.ndarray] = {}
+        for name in PRICE_COLUMNS:
+            values = np.asarray(columns[name], dtype=dtype)
+            if values.shape != self.timestamp.shape:
+                raise ValueError(f"Column '{name}' has {values.shape[0]} bars, expected {len(self.timestamp)}")
+            self._columns[name] = values
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, dtype: Any = COMPACT_DTYPE) -> "OhlcvArrays":
+        """Convert an OHLCV frame with a `timestamp` (ms) or `datetime` column."""
+        if "timestamp" in df:
+            ts = df["timestamp"].to_numpy(dtype=np.int64)
+        else:
+            ts = pd.to_datetime(df["datetime"]).to_numpy(dtype="datetime64[ms]").astype(np.int64)
+        return cls(ts, {name: df[name].to_numpy() for name in PRICE_COLUMNS}, dtype)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._columns["close"].dtype
+
+    @property
+    def nbytes(self) -> int:
+        return self.timestamp.nbytes + sum(a.nbytes for a in self._columns.values())
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __contains__(self, name: object) -> bool:
+        return name == "timestamp" or name in self._columns
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name == "timestamp":
+            return self.timestamp
+        if name == "datetime":
+            return self.timestamp.astype("datetime64[ms]")
+        return self._columns[name]
+
+    def _slice(self, index: slice) -> "OhlcvArrays":
+        return OhlcvArrays(self.timestamp[index], {k: v[index] for k, v in self._columns.items()}, self.dtype)
+
+    def tail(self, bars: int) -> "OhlcvArrays":
+        """View of the last `bars` bars."""
+        return self._slice(slice(max(len(self) - bars, 0), None))
+
+    def window(self, since_ms: Optional[int] = None, until_ms: Optional[int] = None) -> "OhlcvArrays":
+        """View of the bars in [since_ms, until_ms)."""
+        lo = 0 if since_ms is None else int(np.searchsorted(self.timestamp, since_ms, side="left"))
+        hi = len(self) if until_ms is None else int(np.searchsorted(self.timestamp, until_ms, side="left"))
+        return self._slice(slice(lo, hi))
+
+    def inputs(self, names: Iterable[str]) -> Dict[str, np.ndarray]:
+        """(1 x bars) views of the named columns, as `indicator_registry` takes them."""
+        return {name: self[name][None, :] for name in names}
+
+    def to_frame(self, extra: Optional[Mapping[str, np.ndarray]] = None) -> pd.DataFrame:
+        """DataFrame with timestamp, OHLCV, `datetime` and any `extra` columns."""
+        data: Dict[str, Any] = {"timestamp": self.timestamp, **self._columns}
+        data["datetime"] = pd.to_datetime(self.timestamp, unit="ms")
+        data.update(extra or {})
+        return pd.DataFrame(data)
@@ -0,0 +1,120 @@
+"""
+Vectorized orderbook microstructure analytics.
+
+The raw ccxt book is converted once into contiguous NumPy arrays. Cumulative size
+and notional sums over each side then answer every window with a `searchsorted`
+lookup: depth, imbalance and the VWAP a market order would get sweeping the
+window, plus wall detection against the typical level size.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_WINDOWS_PCT = (0.001, 0.0025, 0.005, 0.01, 0.02)
+
+
+def book_arrays(ob: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Return (bid_px, bid_sz, ask_px, ask_sz); bids descending, asks ascending."""
+    bids = np.ascontiguousarray(np.asarray([lvl[:2] for lvl in ob["bids"]], dtype=np.float64))
+    asks = np.ascontiguousarray(np.asarray([lvl[:2] for lvl in ob["asks"]], dtype=np.float64))
+    return bids[:, 0], bids[:, 1], asks[:, 0], asks[:, 1]
+
+
+def _side_windows(px: np.ndarray, sz: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Cumulative size and VWAP of the first `counts[i]` levels for every window i."""
+    cum_sz = np.r_[0.0, np.cumsum(sz)]
+    cum_notional = np.r_[0.0, np.cumsum(px * sz)]
+    depth = cum_sz[counts]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vwap = np.where(depth > 0, cum_notional[counts] / depth, np.nan)
+    return depth, vwap
+
+
+def _walls(px: np.ndarray, sz: np.ndarray, n: int, mid: float, multiple: float, top: int):
+    if n == 0:
+        return []
+    sizes = sz[:n]
+    threshold = multiple * float(np.median(sizes))
+    idx = np.flatnonzero(sizes >= threshold)
+    idx = idx[np.argsort(sizes[idx])[::-1][:top]]
+    return [
+        {"price": float(px[i]), "size": float(sz[i]), "distance_pct": float(abs(px[i] / mid - 1) * 100)}
+        for i in idx
+    ]
+
+
+def analyze_orderbook(
+    ob: Any,
+    windows_pct: Sequence[float] = DEFAULT_WINDOWS_PCT,
+    wall_multiple: float = 5.0,
+    max_walls: int = 3,
+) -> Dict[str, Any]:
+    """
+    Compute multi-window depth statistics from one pass over the book.
+
+    Args:
+        ob: ccxt order book dict with "bids" and "asks" as [price, size, ...] lists
+        windows_pct: half-widths around mid as fractions (0.005 = +/-0.5%)
+        wall_multiple: a level is a wall if its size is at least this multiple of
+            the median level size inside the widest window
+    Returns:
+        Dict with best prices, spread, per-window stats and walls per side
+    """
+    bid_px, bid_sz, ask_px, ask_sz = book_arrays(ob)
+    best_bid, best_ask = float(bid_px[0]), float(ask_px[0])
+    mid = (best_bid + best_ask) / 2.0
+    windows = np.asarray(sorted(windows_pct), dtype=np.float64)
+
+    # Bids are descending, so search the negated prices
+    bid_counts = np.searchsorted(-bid_px, -(mid * (1 - windows)), side="right")
+    ask_counts = np.searchsorted(ask_px, mid * (1 + windows), side="right")
+    bid_depth, bid_vwap = _side_windows(bid_px, bid_sz, bid_counts)
+    ask_depth, ask_vwap = _side_windows(ask_px, ask_sz, ask_counts)
+    total = np.maximum(bid_depth + ask_depth, 1e-9)
+    imbalance = (bid_depth - ask_depth) / total
+
+    per_window = [
+        {
+            "window_pct": float(w * 100),
+            "bid_volume": float(bid_depth[i]),
+            "ask_volume": float(ask_depth[i]),
+            "imbalance": float(imbalance[i]),
+            # Average fill sweeping the window, and its cost vs mid in bps
+            "sell_vwap": float(bid_vwap[i]),
+            "buy_vwap": float(ask_vwap[i]),
+            "sell_slippage_bps": float((1 - bid_vwap[i] / mid) * 1e4),
+            "buy_slippage_bps": float((ask_vwap[i] / mid - 1) * 1e4),
+        }
+        for i, w in enumerate(windows)
+    ]
+
+    return {
+        "best_bid": best_bid,
+        "best_ask": best_ask,
+        "mid": mid,
+        "spread_bps": (best_ask - best_bid) / mid * 1e4,
+        "windows": per_window,
+        "bid_walls": _walls(bid_px, bid_sz, int(bid_counts[-1]), mid, wall_multiple, max_walls),
+        "ask_walls": _walls(ask_px, ask_sz, int(ask_counts[-1]), mid, wall_multiple, max_walls),
+    }
+
+
+def format_orderbook_analytics(stats: Dict[str, Any]) -> str:
+    """Render `analyze_orderbook` output as compact CSV-style lines for the LLM."""
+    lines = [
+        f"spread_bps={stats['spread_bps']:.2f}",
+        "window_pct,bid_volume,ask_volume,imbalance,buy_vwap,buy_slippage_bps,sell_vwap,sell_slippage_bps",
+    ]
+    for w in stats["windows"]:
+        lines.append(
+            f"{w['window_pct']:.2f},{w['bid_volume']:.4f},{w['ask_volume']:.4f},{w['imbalance']:.3f},"
+            f"{w['buy_vwap']:.6g},{w['buy_slippage_bps']:.2f},{w['sell_vwap']:.6g},{w['sell_slippage_bps']:.2f}"
+        )
+    for side in ("bid", "ask"):
+        walls = stats[f"{side}_walls"]
+        desc = "; ".join(f"{x['price']}x{x['size']} ({x['distance_pct']:.2f}%)" for x in walls)
+        lines.append(f"{side}_walls={desc or 'none'}")
+    return "\n".join(lines) + "\n"
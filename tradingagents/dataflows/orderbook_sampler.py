@@ -0,0 +1,226 @@
+"""
+Background orderbook sampling with rolling microstructure statistics.
+
+An `OrderbookSampler` thread snapshots the books of watched symbols at a fixed
+cadence. Each snapshot is reduced once by `analyze_orderbook` into a row of
+numbers (spread plus per-window depth and imbalance) that goes into a bounded
+per-symbol ring, so memory stays flat however long it runs. Rolling means and
+dispersion are column reductions over that ring, which lets the orderbook tool
+answer instantly from memory with time-averaged values instead of a single
+noisy point.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .orderbook_analytics import DEFAULT_WINDOWS_PCT, analyze_orderbook
+
+
+class _SampleRing:
+    """Fixed-capacity ring of equally sized float rows."""
+
+    def __init__(self, capacity: int, width: int):
+        self._rows = np.full((capacity, width), np.nan)
+        self._ts = np.zeros(capacity)
+        self._next = 0
+        self._size = 0
+
+    def push(self, ts: float, row: np.ndarray) -> None:
+        self._rows[self._next] = row
+        self._ts[self._next] = ts
+        self._next = (self._next + 1) % len(self._ts)
+        self._size = min(self._size + 1, len(self._ts))
+
+    def view(self) -> "tuple[np.ndarray, np.ndarray]":
+        """(timestamps, rows) oldest first."""
+        order = (self._next - self._size + np.arange(self._size)) % len(self._ts)
+        return self._ts[order], self._rows[order]
+
+
+class OrderbookSampler:
+    """
+    Samples books on a daemon thread and keeps rolling stats per symbol.
+
+    Args:
+        fetch_book: callable returning a ccxt order book for a symbol
+        symbols: symbols to watch
+        interval: seconds between sampling sweeps
+        capacity: samples kept per symbol
+        windows_pct: depth windows tracked, as fractions of mid
+    """
+
+    def __init__(
+        self,
+        fetch_book: Callable[[str], Any],
+        symbols: Iterable[str] = (),
+        interval: float = 2.0,
+        capacity: int = 900,
+        windows_pct: Sequence[float] = DEFAULT_WINDOWS_PCT,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.fetch_book = fetch_book
+        self.interval = interval
+        self.capacity = capacity
+        self.windows_pct = tuple(sorted(windows_pct))
+        self._clock = clock
+        self._symbols: List[str] = list(dict.fromkeys(symbols))
+        self._rings: Dict[str, _SampleRing] = {}
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, symbol: str) -> None:
+        with self._lock:
+            if symbol not in self._symbols:
+                self._symbols.append(symbol)
+
+    def unwatch(self, symbol: str) -> None:
+        with self._lock:
+            if symbol in self._symbols:
+                self._symbols.remove(symbol)
+            self._rings.pop(symbol, None)
+            self._latest.pop(symbol, None)
+
+    def _row(self, stats: Dict[str, Any]) -> np.ndarray:
+        windows = stats["windows"]
+        return np.array(
+            [stats["spread_bps"], stats["mid"]]
+            + [w["imbalance"] for w in windows]
+            + [w["bid_volume"] for w in windows]
+            + [w["ask_volume"] for w in windows]
+        )
+
+    def sample_once(self) -> None:
+        """Take one snapshot of every watched symbol; a failing symbol keeps its history."""
+        with self._lock:
+            symbols = list(self._symbols)
+        for symbol in symbols:
+            try:
+                ob = self.fetch_book(symbol)
+                if not ob or not ob.get("bids") or not ob.get("asks"):
+                    raise ValueError("empty book")
+                stats = analyze_orderbook(ob, windows_pct=self.windows_pct)
+            except Exception as e:
+                self._errors[symbol] = str(e)
+                continue
+            now = self._clock()
+            with self._lock:
+                if symbol not in self._symbols:
+                    continue
+                ring = self._rings.get(symbol)
+                if ring is None:
+                    ring = self._rings[symbol] = _SampleRing(self.capacity, 2 + 3 * len(self.windows_pct))
+                ring.push(now, self._row(stats))
+                self._latest[symbol] = dict(stats, sampled_at=now)
+                self._errors.pop(symbol, None)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            started = self._clock()
+            self.sample_once()
+            self._stop.wait(max(0.0, self.interval - (self._clock() - started)))
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="orderbook-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1.0)
+            self._thread = None
+
+    def is_fresh(self, symbol: str, max_age: Optional[float] = None) -> bool:
+        """True if the symbol has a sample newer than `max_age` (default 3 intervals)."""
+        latest = self._latest.get(symbol)
+        max_age = 3 * self.interval if max_age is None else max_age
+        return latest is not None and self._clock() - latest["sampled_at"] <= max_age
+
+    def latest(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """`analyze_orderbook` output of the newest sample, with `sampled_at`."""
+        return self._latest.get(symbol)
+
+    def rolling_stats(self, symbol: str, horizon_s: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Mean/std of imbalance and mean depth per window, plus spread distribution,
+        over the samples of the last `horizon_s` seconds (default: whole ring).
+        """
+        with self._lock:
+            ring = self._rings.get(symbol)
+            if ring is None:
+                return None
+            ts, rows = ring.view()
+        if horizon_s is not None:
+            keep = ts >= self._clock() - horizon_s
+            ts, rows = ts[keep], rows[keep]
+        if not len(ts):
+            return None
+
+        k = len(self.windows_pct)
+        spread = rows[:, 0]
+        imbalance, bid, ask = rows[:, 2:2 + k], rows[:, 2 + k:2 + 2 * k], rows[:, 2 + 2 * k:]
+        imb_mean, bid_mean, ask_mean = imbalance.mean(axis=0), bid.mean(axis=0), ask.mean(axis=0)
+        imb_std = imbalance.std(axis=0)
+        return {
+            "samples": int(len(ts)),
+            "span_s": float(ts[-1] - ts[0]),
+            "spread_bps": {
+                "mean": float(spread.mean()),
+                "median": float(np.median(spread)),
+                "max": float(spread.max()),
+            },
+            "mid_change_pct": float((rows[-1, 1] / rows[0, 1] - 1) * 100),
+            "windows": [
+                {
+                    "window_pct": float(w * 100),
+                    "imbalance_mean": float(imb_mean[i]),
+                    "imbalance_std": float(imb_std[i]),
+                    "bid_volume_mean": float(bid_mean[i]),
+                    "ask_volume_mean": float(ask_mean[i]),
+                }
+                for i, w in enumerate(self.windows_pct)
+            ],
+        }
+
+
+def format_rolling_stats(stats: Dict[str, Any], interval: float) -> str:
+    """Render `rolling_stats` as compact CSV-style lines for the LLM."""
+    spread = stats["spread_bps"]
+    lines = [
+        f"# Rolling over {stats['samples']} samples ({stats['span_s']:.0f}s, every {interval:g}s)",
+        f"spread_bps mean={spread['mean']:.2f} median={spread['median']:.2f} max={spread['max']:.2f}, "
+        f"mid_change_pct={stats['mid_change_pct']:.3f}",
+        "window_pct,imbalance_mean,imbalance_std,bid_volume_mean,ask_volume_mean",
+    ]
+    for w in stats["windows"]:
+        lines.append(
+            f"{w['window_pct']:.2f},{w['imbalance_mean']:.3f},{w['imbalance_std']:.3f},"
+            f"{w['bid_volume_mean']:.4f},{w['ask_volume_mean']:.4f}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+_sampler: Optional[OrderbookSampler] = None
+
+
+def get_orderbook_sampler() -> Optional[OrderbookSampler]:
+    """The running process-wide sampler, or None when none was started."""
+    return _sampler
+
+
+def set_orderbook_sampler(sampler: Optional[OrderbookSampler]) -> None:
+    """Install (or with None, stop and remove) the process-wide sampler."""
+    global _sampler
+    if _sampler is not None and _sampler is not sampler:
+        _sampler.stop()
+    _sampler = sampler
@@ -0,0 +1,245 @@
+"""
+Swing points, support/resistance zones and range boundaries from OHLC arrays.
+
+The prompts ask for concrete levels ("recent swing, band, or liquidity zone");
+this module computes them so the LLM reads prices instead of deriving them from
+raw candles:
+
+- a swing high is a bar whose high beats the `swing_bars` highs before it and is
+  not exceeded by the `swing_bars` after it (lows mirrored); all bars are tested
+  at once over a sliding-window view, so the last `swing_bars` bars are not yet
+  confirmed;
+- swing prices are clustered into zones by single linkage on the sorted prices:
+  neighbours closer than `zone_atr_mult` x ATR(14) share a zone, and a zone's
+  touch count, extent and last touch come from `reduceat` over the clusters;
+- the range is the high/low of the `range_bars` bars before the current one,
+  with the swing touches at each edge, whether the market is range-bound
+  (both edges touched at least twice, width within `range_max_atr` ATRs) and
+  whether the current close broke out of it.
+
+Input may be an OHLCV DataFrame or `OhlcvArrays`.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .indicator_registry import compute_arrays
+
+SWING_BARS = 3
+LEVELS_LOOKBACK = 192
+RANGE_BARS = 48
+ZONE_ATR_MULT = 0.5
+RANGE_MAX_ATR = 8.0
+# Zone tolerance when ATR is unavailable, as a fraction of the close
+FALLBACK_TOLERANCE = 0.002
+
+
+def swing_points(high: np.ndarray, low: np.ndarray, swing_bars: int = SWING_BARS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Boolean masks of confirmed swing highs and lows along the last axis.
+
+    A flat top or bottom marks its first bar only.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    is_high = np.zeros(high.shape, dtype=bool)
+    is_low = np.zeros(low.shape, dtype=bool)
+    width = 2 * swing_bars + 1
+    if high.shape[-1] < width:
+        return is_high, is_low
+    centre = slice(swing_bars, high.shape[-1] - swing_bars)
+    with np.errstate(invalid="ignore"):
+        hw = sliding_window_view(high, width, axis=-1)
+        is_high[..., centre] = (hw[..., swing_bars] > hw[..., :swing_bars].max(axis=-1)) & (
+            hw[..., swing_bars] >= hw[..., swing_bars + 1:].max(axis=-1)
+        )
+        lw = sliding_window_view(low, width, axis=-1)
+        is_low[..., centre] = (lw[..., swing_bars] < lw[..., :swing_bars].min(axis=-1)) & (
+            lw[..., swing_bars] <= lw[..., swing_bars + 1:].min(axis=-1)
+        )
+    return is_high, is_low
+
+
+def cluster_zones(
+    prices: np.ndarray, index: np.ndarray, is_high: np.ndarray, tolerance: float
+) -> List[Dict[str, Any]]:
+    """
+    Group swing prices closer than `tolerance` into zones (single linkage).
+
+    Args:
+        prices: swing prices
+        index: bar index of each swing
+        is_high: True for swing highs, False for swing lows
+    Returns:
+        [{"low", "high", "mid", "touches", "swing_highs", "swing_lows", "last_index"}]
+        ordered by price
+    """
+    if len(prices) == 0:
+        return []
+    order = np.argsort(prices, kind="stable")
+    p, idx, highs = prices[order], index[order], is_high[order].astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, np.diff(p) > tolerance])
+    bottoms = p[starts]
+    tops = np.maximum.reduceat(p, starts)
+    touches = np.diff(np.r_[starts, len(p)])
+    high_count = np.add.reduceat(highs, starts)
+    last = np.maximum.reduceat(idx, starts)
+    return [
+        {
+            "low": float(bottoms[i]),
+            "high": float(tops[i]),
+            "mid": float((bottoms[i] + tops[i]) / 2),
+            "touches": int(touches[i]),
+            "swing_highs": int(high_count[i]),
+            "swing_lows": int(touches[i] - high_count[i]),
+            "last_index": int(last[i]),
+        }
+        for i in range(len(starts))
+    ]
+
+
+def _timestamps(bars: Any) -> np.ndarray:
+    if "timestamp" in bars:
+        return np.asarray(bars["timestamp"], dtype=np.int64)
+    return pd.to_datetime(bars["datetime"]).to_numpy(dtype="datetime64[ms]").astype(np.int64)
+
+
+def _latest_atr(bars: Any, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> float:
+    if "atr_14" in bars:
+        atr = np.asarray(bars["atr_14"], dtype=np.float64)
+    else:
+        atr = compute_arrays({"high": high[None, :], "low": low[None, :], "close": close[None, :]}, ["atr_14"])["atr_14"][0]
+    return float(atr[-1]) if len(atr) else float("nan")
+
+
+def range_boundaries(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    is_high: np.ndarray,
+    is_low: np.ndarray,
+    tolerance: float,
+    atr: float,
+    range_bars: int = RANGE_BARS,
+    range_max_atr: float = RANGE_MAX_ATR,
+) -> Dict[str, Any]:
+    """
+    Range of the `range_bars` bars before the last one and where the last close sits in it.
+
+    Returns:
+        {"high", "low", "width_pct", "position_pct", "touches_high", "touches_low",
+        "is_range", "state"} with state "inside", "breakout_up" or "breakout_down"
+    """
+    prior = slice(max(len(close) - 1 - range_bars, 0), len(close) - 1)
+    top, bottom = float(np.nanmax(high[prior])), float(np.nanmin(low[prior]))
+    last = float(close[-1])
+    touches_high = int(np.count_nonzero(is_high[prior] & (high[prior] >= top - tolerance)))
+    touches_low = int(np.count_nonzero(is_low[prior] & (low[prior] <= bottom + tolerance)))
+    width = top - bottom
+    narrow = np.isfinite(atr) and width <= range_max_atr * atr
+    state = "breakout_up" if last > top else "breakout_down" if last < bottom else "inside"
+    return {
+        "bars": prior.stop - prior.start,
+        "high": top,
+        "low": bottom,
+        "width_pct": width / bottom * 100 if bottom else float("nan"),
+        "position_pct": (last - bottom) / width * 100 if width else float("nan"),
+        "touches_high": touches_high,
+        "touches_low": touches_low,
+        "is_range": bool(narrow and touches_high >= 2 and touches_low >= 2),
+        "state": state,
+    }
+
+
+def detect_levels(
+    bars: Any,
+    lookback: int = LEVELS_LOOKBACK,
+    swing_bars: int = SWING_BARS,
+    zone_atr_mult: float = ZONE_ATR_MULT,
+    range_bars: int = RANGE_BARS,
+    max_zones: int = 3,
+) -> Dict[str, Any]:
+    """
+    Swing points, nearest S/R zones and range state over the last `lookback` bars.
+
+    Args:
+        bars: OHLCV frame or `OhlcvArrays` (an `atr_14` column is reused if present)
+        max_zones: zones reported on each side of the close, nearest first
+    Returns:
+        Dict with close, atr, tolerance, recent swing highs/lows as (timestamp, price),
+        "supports"/"resistances" zones (with distance_pct and distance_atr) and "range"
+    """
+    high = np.asarray(bars["high"], dtype=np.float64)
+    low = np.asarray(bars["low"], dtype=np.float64)
+    close = np.asarray(bars["close"], dtype=np.float64)
+    if len(close) < 2:
+        raise ValueError("Need at least two bars to detect levels")
+    ts = _timestamps(bars)
+    atr = _latest_atr(bars, high, low, close)
+    start = max(len(close) - lookback, 0)
+    high, low, close, ts = high[start:], low[start:], close[start:], ts[start:]
+
+    last = float(close[-1])
+    tolerance = zone_atr_mult * atr if np.isfinite(atr) and atr > 0 else FALLBACK_TOLERANCE * last
+    is_high, is_low = swing_points(high, low, swing_bars)
+    hi_idx, lo_idx = np.flatnonzero(is_high), np.flatnonzero(is_low)
+    prices = np.r_[high[hi_idx], low[lo_idx]]
+    zones = cluster_zones(
+        prices, np.r_[hi_idx, lo_idx], np.r_[np.ones(len(hi_idx), bool), np.zeros(len(lo_idx), bool)], tolerance
+    )
+
+    supports, resistances = [], []
+    for zone in zones:
+        zone["last_timestamp"] = int(ts[zone.pop("last_index")])
+        is_support = zone["mid"] < last
+        edge = zone["high"] if is_support else zone["low"]
+        distance = 0.0 if zone["low"] <= last <= zone["high"] else edge - last
+        zone["distance_pct"] = distance / last * 100
+        zone["distance_atr"] = distance / atr if np.isfinite(atr) and atr > 0 else float("nan")
+        (supports if is_support else resistances).append(zone)
+    supports.sort(key=lambda z: -z["mid"])
+    resistances.sort(key=lambda z: z["mid"])
+
+    return {
+        "bars": len(close),
+        "close": last,
+        "atr": atr,
+        "tolerance": tolerance,
+        "swing_highs": [(int(ts[i]), float(high[i])) for i in hi_idx[-max_zones:]],
+        "swing_lows": [(int(ts[i]), float(low[i])) for i in lo_idx[-max_zones:]],
+        "supports": supports[:max_zones],
+        "resistances": resistances[:max_zones],
+        "range": range_boundaries(high, low, close, is_high, is_low, tolerance, atr, range_bars),
+    }
+
+
+def _time(ts: int) -> str:
+    return pd.to_datetime(ts, unit="ms").strftime("%m-%d %H:%M")
+
+
+def _zone(zone: Dict[str, Any]) -> str:
+    band = f"{zone['low']:.8g}" if zone["low"] == zone["high"] else f"{zone['low']:.8g}-{zone['high']:.8g}"
+    if zone["distance_pct"] == 0:
+        return f"{band} (touches={zone['touches']}, price inside)"
+    atr = f", {zone['distance_atr']:+.1f}atr" if np.isfinite(zone["distance_atr"]) else ""
+    return f"{band} (touches={zone['touches']}, {zone['distance_pct']:+.2f}%{atr})"
+
+
+def format_levels(levels: Dict[str, Any]) -> List[str]:
+    """Render `detect_levels` output as summary lines."""
+    rng = levels["range"]
+    return [
+        f"# Levels (swings over last {levels['bars']} bars, zone tolerance {levels['tolerance']:.6g})",
+        "resistance=" + ("; ".join(_zone(z) for z in levels["resistances"]) or "none above"),
+        "support=" + ("; ".join(_zone(z) for z in levels["supports"]) or "none below"),
+        "swing_highs=" + (", ".join(f"{p:.8g}@{_time(t)}" for t, p in levels["swing_highs"]) or "none"),
+        "swing_lows=" + (", ".join(f"{p:.8g}@{_time(t)}" for t, p in levels["swing_lows"]) or "none"),
+        f"range_{rng['bars']}bars: high={rng['high']:.8g} low={rng['low']:.8g} width={rng['width_pct']:.2f}% "
+        f"position={rng['position_pct']:.0f}% touches_high={rng['touches_high']} touches_low={rng['touches_low']} "
+        f"range_bound={'yes' if rng['is_range'] else 'no'} state={rng['state']}",
+    ]
@@ -0,0 +1,182 @@
+"""
+Shared token-bucket rate limiting for exchange and data-vendor requests.
+
+Every vendor has one bucket (`rate` tokens per second, burst `capacity`) and each
+endpoint spends a configurable weight. Acquiring reserves tokens immediately and
+returns how long the caller must wait, so concurrent threads and asyncio tasks
+queue in arrival order instead of racing into 429s. The sleep happens outside
+the lock (`time.sleep` for threads, `asyncio.sleep` for tasks).
+
+The default backend keeps buckets in process memory. `RedisBucketBackend` keeps
+them in Redis so several API workers share one budget per vendor. Backends that
+do network I/O set `blocking = True`; `aacquire` then reserves in a worker
+thread so the round trip never stalls the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .config import get_config
+
+
+class RateLimitTimeout(Exception):
+    """Raised when the required wait exceeds the caller's `max_wait`."""
+
+
+class LocalBucketBackend:
+    """In-process token buckets guarded by a lock."""
+
+    blocking = False
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._buckets: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key: str, rate: float, capacity: float, cost: float) -> float:
+        """Spend `cost` tokens and return the seconds until they are available."""
+        with self._lock:
+            now = self._clock()
+            tokens, ts = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - ts) * rate) - cost
+            self._buckets[key] = [tokens, now]
+        return max(0.0, -tokens / rate)
+
+    def refund(self, key: str, cost: float) -> None:
+        with self._lock:
+            if key in self._buckets:
+                self._buckets[key][0] += cost
+
+
+_REDIS_RESERVE = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate) - cost
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 1)
+if tokens < 0 then
+    return tostring(-tokens / rate)
+end
+return '0'
+"""
+
+
+class RedisBucketBackend:
+    """Token buckets stored in Redis and updated atomically by a Lua script."""
+
+    blocking = True
+
+    def __init__(self, url: str, prefix: str = "tradingagents:ratelimit:"):
+        import redis  # optional dependency, only needed for the shared backend
+
+        self._redis = redis.Redis.from_url(url)
+        self._reserve = self._redis.register_script(_REDIS_RESERVE)
+        self._prefix = prefix
+
+    def reserve(self, key: str, rate: float, capacity: float, cost: float) -> float:
+        return float(self._reserve(keys=[self._prefix + key], args=[rate, capacity, cost]))
+
+    def refund(self, key: str, cost: float) -> None:
+        self._redis.hincrbyfloat(self._prefix + key, "tokens", cost)
+
+
+class RateLimiter:
+    """
+    Per-vendor token buckets with per-endpoint weights.
+
+    Args:
+        limits: {vendor: {"rate": tokens/s, "capacity": burst, "weights": {endpoint: cost}}}
+        backend: bucket storage (defaults to in-process)
+    """
+
+    def __init__(
+        self,
+        limits: Dict[str, Dict[str, Any]],
+        backend: Any = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.limits = limits
+        self.backend = backend or LocalBucketBackend()
+        self._sleep = sleep
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._stats_lock = threading.Lock()
+
+    def _reserve(self, vendor: str, endpoint: Optional[str], max_wait: Optional[float]) -> float:
+        limit = self.limits.get(vendor)
+        if not limit:
+            return 0.0
+        cost = float(limit.get("weights", {}).get(endpoint, 1))
+        wait = self.backend.reserve(vendor, float(limit["rate"]), float(limit["capacity"]), cost)
+        if max_wait is not None and wait > max_wait:
+            self.backend.refund(vendor, cost)
+            raise RateLimitTimeout(
+                f"{vendor}:{endpoint} needs {wait:.2f}s of rate-limit budget (max_wait={max_wait}s)"
+            )
+        self._record(vendor, wait)
+        return wait
+
+    def acquire(self, vendor: str, endpoint: Optional[str] = None, max_wait: Optional[float] = None) -> float:
+        """Block until the request may be sent. Returns the seconds waited."""
+        wait = self._reserve(vendor, endpoint, max_wait)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    async def aacquire(self, vendor: str, endpoint: Optional[str] = None, max_wait: Optional[float] = None) -> float:
+        """Async version of `acquire`; reserves and waits without blocking the event loop."""
+        if getattr(self.backend, "blocking", True):
+            wait = await asyncio.to_thread(self._reserve, vendor, endpoint, max_wait)
+        else:
+            wait = self._reserve(vendor, endpoint, max_wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def _record(self, vendor: str, wait: float) -> None:
+        with self._stats_lock:
+            stats = self._stats.setdefault(
+                vendor, {"calls": 0, "waited_calls": 0, "total_wait_s": 0.0, "max_wait_s": 0.0}
+            )
+            stats["calls"] += 1
+            if wait > 0:
+                stats["waited_calls"] += 1
+                stats["total_wait_s"] += wait
+                stats["max_wait_s"] = max(stats["max_wait_s"], wait)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-vendor counters: calls, waited_calls, total_wait_s, max_wait_s."""
+        with self._stats_lock:
+            return {vendor: dict(values) for vendor, values in self._stats.items()}
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter built from the `rate_limits` config."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            config = get_config()
+            backend_url = config.get("rate_limit_backend")
+            backend = RedisBucketBackend(backend_url) if backend_url else None
+            _limiter = RateLimiter(config.get("rate_limits", {}), backend=backend)
+        return _limiter
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """Replace the shared limiter (None rebuilds it from config on next use)."""
+    global _limiter
+    with _limiter_lock:
+        _limiter = limiter
@@ -0,0 +1,74 @@
+"""
+Derive higher-timeframe OHLCV bars from a stored base timeframe.
+
+Buckets are aligned to UTC epoch multiples of the target bar length, which is how
+Bybit aligns its own klines, so a 1h bar built from four 15m bars matches the
+exchange's 1h bar. Aggregation is a single `np.*.reduceat` pass per column.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .timeframes import timeframe_to_ms
+
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
+def resample_ohlcv(
+    df: pd.DataFrame,
+    base_timeframe: str,
+    target_timeframe: str,
+    keep_partial_last: bool = False,
+    now_ms: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Aggregate `base_timeframe` bars into `target_timeframe` bars.
+
+    Only closed buckets are emitted: a leading bucket that starts before the first
+    base bar and a trailing bucket whose close is after the last base bar's close
+    are dropped. With `keep_partial_last`, a trailing bucket that contains `now_ms`
+    is kept as the forming bar, like the exchange returns it.
+
+    Args:
+        df: frame with timestamp (ms), open, high, low, close, volume, sorted by time
+        base_timeframe: timeframe of `df`, e.g. "15m"
+        target_timeframe: coarser timeframe, e.g. "1h"
+    Returns:
+        DataFrame with the same OHLCV columns at the target timeframe
+    """
+    base_ms = timeframe_to_ms(base_timeframe)
+    target_ms = timeframe_to_ms(target_timeframe)
+    if target_ms % base_ms:
+        raise ValueError(f"{target_timeframe} is not a multiple of {base_timeframe}")
+    if df.empty:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+    ts = df["timestamp"].to_numpy(dtype="int64")
+    bucket = ts - ts % target_ms
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(ts)] - 1
+
+    out = pd.DataFrame(
+        {
+            "timestamp": bucket[starts],
+            "open": df["open"].to_numpy()[starts],
+            "high": np.maximum.reduceat(df["high"].to_numpy(), starts),
+            "low": np.minimum.reduceat(df["low"].to_numpy(), starts),
+            "close": df["close"].to_numpy()[ends],
+            "volume": np.add.reduceat(df["volume"].to_numpy(), starts),
+        }
+    )
+
+    keep = np.ones(len(out), dtype=bool)
+    if ts[0] != bucket[0]:
+        keep[0] = False
+    last_close = ts[-1] + base_ms
+    bucket_end = out["timestamp"].to_numpy() + target_ms
+    if bucket_end[-1] > last_close:
+        forming = keep_partial_last and now_ms is not None and out["timestamp"].iloc[-1] <= now_ms < bucket_end[-1]
+        keep[-1] = keep[-1] and forming
+    return out[keep].reset_index(drop=True)
@@ -0,0 +1,127 @@
+"""
+Single-flight coalescing of identical in-flight calls.
+
+When several graph runs ask for the same data at the same time, the first caller
+(the leader) runs the fetch and every concurrent caller with the same key waits
+for and receives that result, or the same exception. Nothing is cached: once the
+leader finishes, the next call with that key starts a new fetch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def make_call_key(method: str, func: Optional[Callable], args: tuple, kwargs: dict) -> Hashable:
+    """
+    Build a key for `method(*args, **kwargs)`.
+
+    Arguments are bound to `func`'s signature with defaults applied, so passing a
+    default explicitly, positionally or by keyword yields the same key.
+    """
+    if func is not None:
+        try:
+            bound = inspect.signature(func).bind(*args, **kwargs)
+            bound.apply_defaults()
+            return (method, _freeze(dict(bound.arguments)))
+        except (TypeError, ValueError):
+            pass
+    return (method, _freeze(args), _freeze(kwargs))
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key, across threads and asyncio tasks."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._futures = weakref.WeakKeyDictionary()
+        self._stats = {"executed": 0, "shared": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run `fn` unless an identical call is in flight; then share its outcome."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["executed"] += 1
+            else:
+                self._stats["shared"] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return call.result
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async version of `do` for tasks on the running event loop."""
+        futures = self._futures.setdefault(asyncio.get_running_loop(), {})
+        future = futures.get(key)
+        if future is not None:
+            with self._lock:
+                self._stats["shared"] += 1
+            # shield so one cancelled follower does not cancel the shared fetch
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        futures[key] = future
+        with self._lock:
+            self._stats["executed"] += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an exception nobody else awaited is not logged
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            futures.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of calls that ran upstream (`executed`) and that piggybacked (`shared`)."""
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,37 @@
+"""
+Timeframe helpers shared by the crypto dataflows.
+"""
+
+from __future__ import annotations
+
+TIMEFRAME_MINUTES = {
+    "1m": 1,
+    "3m": 3,
+    "5m": 5,
+    "15m": 15,
+    "30m": 30,
+    "1h": 60,
+    "2h": 120,
+    "4h": 240,
+    "6h": 360,
+    "12h": 720,
+    "1d": 1440,
+}
+
+
+def timeframe_to_ms(timeframe: str) -> int:
+    """Bar length of a ccxt timeframe string in milliseconds."""
+    if timeframe not in TIMEFRAME_MINUTES:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return TIMEFRAME_MINUTES[timeframe] * 60_000
+
+
+_DURATION_UNITS_MS = {"m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+
+
+def duration_to_ms(duration: str) -> int:
+    """Length of a look-back horizon such as "90m", "24h" or "7d" in milliseconds."""
+    unit = duration[-1:]
+    if unit not in _DURATION_UNITS_MS or not duration[:-1].isdigit():
+        raise ValueError(f"Unsupported duration: {duration}")
+    return int(duration[:-1]) * _DURATION_UNITS_MS[unit]
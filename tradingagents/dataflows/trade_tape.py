@@ -0,0 +1,354 @@
+"""
+Trade tape ingestion and order-flow analytics.
+
+Public trades (from `fetch_trades` or a replayed JSON-lines file) are kept in a
+`TradeTape`: growable NumPy columns (timestamp, price, amount, taker side) with
+de-duplication by trade id, so repeated polls only add new prints. Analytics are
+vectorized passes over those columns:
+
+- cumulative volume delta (taker buys minus taker sells)
+- aggressor (taker-buy) ratios over trailing windows
+- custom bars: time bars of any duration (3m, 10m, ...) and volume bars
+
+A tape only holds what the exchange returned: one `fetch_trades` page of recent
+prints, and whatever later polls added. `covered_since` is where its unbroken
+record starts (the first print, moved forward when a full page arrives that
+does not reach back to the previous poll, or when old trades are evicted), and
+each window reports the span it actually covers and whether it is partial.
+
+`BarBuilder` keeps bars up to date incrementally: each update only re-reduces
+the trades from the start of the last (still open) bar.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .ccxt_bybit import _call, _ensure_client
+from .timeframes import duration_to_ms
+
+TRADE_BAR_COLUMNS = [
+    "timestamp", "open", "high", "low", "close", "volume",
+    "buy_volume", "sell_volume", "delta", "trades",
+]
+
+
+class TradeTape:
+    """Append-only in-memory trade columns, bounded to `max_trades` (oldest dropped)."""
+
+    def __init__(self, symbol: str = "", max_trades: int = 1_000_000):
+        self.symbol = symbol
+        self.max_trades = max_trades
+        self._ts = np.empty(0, dtype=np.int64)
+        self._price = np.empty(0, dtype=np.float64)
+        self._amount = np.empty(0, dtype=np.float64)
+        self._side = np.empty(0, dtype=np.int8)
+        self._size = 0
+        # Ids seen at the newest timestamp, to drop re-delivered prints
+        self._edge_ids: set = set()
+        self._dropped = 0
+        self._covered_since: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dropped(self) -> int:
+        """Trades evicted from the front so far (used to keep bar builders aligned)."""
+        return self._dropped
+
+    def last_timestamp(self) -> Optional[int]:
+        return int(self._ts[self._size - 1]) if self._size else None
+
+    @property
+    def covered_since(self) -> Optional[int]:
+        """Start of the span with no missing trades (None while empty)."""
+        return self._covered_since
+
+    def mark_gap(self, resumed_ms: int) -> None:
+        """Record that trades before `resumed_ms` may be missing (e.g. between two polls)."""
+        with self._lock:
+            self._covered_since = max(self._covered_since or resumed_ms, resumed_ms)
+
+    def _reserve(self, extra: int) -> None:
+        need = self._size + extra
+        if need <= len(self._ts):
+            return
+        cap = max(need, 2 * len(self._ts), 1024)
+        for name in ("_ts", "_price", "_amount", "_side"):
+            old = getattr(self, name)
+            new = np.empty(cap, dtype=old.dtype)
+            new[: self._size] = old[: self._size]
+            setattr(self, name, new)
+
+    def ingest(self, trades: Iterable[Dict[str, Any]]) -> int:
+        """Add ccxt-style trade dicts newer than the tape; returns the number added."""
+        with self._lock:
+            last = self.last_timestamp()
+            rows = []
+            for t in sorted(trades, key=lambda t: t["timestamp"]):
+                ts = int(t["timestamp"])
+                tid = t.get("id")
+                if last is not None and (ts < last or (ts == last and tid is not None and tid in self._edge_ids)):
+                    continue
+                if last is None or ts > last:
+                    last, self._edge_ids = ts, set()
+                if tid is not None:
+                    self._edge_ids.add(tid)
+                side = 1 if t.get("side") == "buy" else -1
+                rows.append((ts, float(t["price"]), float(t["amount"]), side))
+            if not rows:
+                return 0
+            ts, price, amount, side = (np.asarray(c) for c in zip(*rows))
+            self._reserve(len(rows))
+            end = self._size + len(rows)
+            self._ts[self._size:end] = ts
+            self._price[self._size:end] = price
+            self._amount[self._size:end] = amount
+            self._side[self._size:end] = side
+            self._size = end
+            if self._covered_since is None:
+                self._covered_since = int(ts[0])
+            self._trim()
+            return len(rows)
+
+    def _trim(self) -> None:
+        excess = self._size - self.max_trades
+        if excess <= 0:
+            return
+        for name in ("_ts", "_price", "_amount", "_side"):
+            col = getattr(self, name)
+            col[: self._size - excess] = col[excess: self._size]
+        self._size -= excess
+        self._dropped += excess
+        self._covered_since = max(self._covered_since, int(self._ts[0]))
+
+    def arrays(self, start: int = 0) -> Dict[str, np.ndarray]:
+        """
+        Copies of the stored columns (timestamp, price, amount, side) from trade
+        `start` on. Eviction shifts the columns in place, so views would change
+        under the caller; copies stay a consistent snapshot.
+        """
+        with self._lock:
+            start = min(start, self._size)
+            return {
+                "timestamp": self._ts[start: self._size].copy(),
+                "price": self._price[start: self._size].copy(),
+                "amount": self._amount[start: self._size].copy(),
+                "side": self._side[start: self._size].copy(),
+            }
+
+
+def read_trades_file(path: str) -> List[Dict[str, Any]]:
+    """Load ccxt trade dicts from a JSON-lines file (optionally gzip) for replay."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def cumulative_volume_delta(tape: TradeTape) -> np.ndarray:
+    """Running sum of signed taker volume, one value per trade."""
+    a = tape.arrays()
+    return np.cumsum(a["amount"] * a["side"])
+
+
+def aggressor_ratios(tape: TradeTape, windows: Sequence[str], now_ms: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Taker-buy share of volume and volume delta over each trailing window.
+
+    Args:
+        windows: durations such as ["1m", "5m", "15m"]
+        now_ms: window end (defaults to the last trade)
+    Returns:
+        {window: {"volume", "delta", "buy_ratio", "trades", "covered_ms", "partial"}};
+        `covered_ms` is the part of the window the tape covers and `partial` is
+        True when the window starts before `covered_since`
+    """
+    a = tape.arrays()
+    if not len(a["timestamp"]):
+        return {}
+    end = int(a["timestamp"][-1]) if now_ms is None else now_ms
+    signed = a["amount"] * a["side"]
+    cum_vol = np.r_[0.0, np.cumsum(a["amount"])]
+    cum_delta = np.r_[0.0, np.cumsum(signed)]
+    window_starts = end - np.array([duration_to_ms(w) for w in windows])
+    starts = np.searchsorted(a["timestamp"], window_starts, side="left")
+    covered_since = tape.covered_since if tape.covered_since is not None else int(a["timestamp"][0])
+    covered = np.maximum(end - np.maximum(window_starts, covered_since), 0)
+    stop = np.searchsorted(a["timestamp"], end, side="right")
+    volume = cum_vol[stop] - cum_vol[starts]
+    delta = cum_delta[stop] - cum_delta[starts]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        buy_ratio = np.where(volume > 0, (volume + delta) / 2 / volume, np.nan)
+    return {
+        w: {"volume": float(volume[i]), "delta": float(delta[i]), "buy_ratio": float(buy_ratio[i]),
+            "trades": int(stop - starts[i]), "covered_ms": int(covered[i]),
+            "partial": bool(window_starts[i] < covered_since)}
+        for i, w in enumerate(windows)
+    }
+
+
+def _reduce_bars(
+    ts: np.ndarray, price: np.ndarray, amount: np.ndarray, side: np.ndarray, groups: np.ndarray, stamps: np.ndarray
+) -> pd.DataFrame:
+    """Aggregate consecutive trades sharing a group id; `stamps` is the bar timestamp per trade."""
+    if not len(ts):
+        return pd.DataFrame(columns=TRADE_BAR_COLUMNS)
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    buy = np.where(side > 0, amount, 0.0)
+    volume = np.add.reduceat(amount, starts)
+    buy_volume = np.add.reduceat(buy, starts)
+    return pd.DataFrame({
+        "timestamp": stamps[starts],
+        "open": price[starts],
+        "high": np.maximum.reduceat(price, starts),
+        "low": np.minimum.reduceat(price, starts),
+        "close": price[np.r_[starts[1:], len(price)] - 1],
+        "volume": volume,
+        "buy_volume": buy_volume,
+        "sell_volume": volume - buy_volume,
+        "delta": 2 * buy_volume - volume,
+        "trades": np.diff(np.r_[starts, len(price)]),
+    })
+
+
+def time_bars(tape: TradeTape, duration: str, start: int = 0) -> pd.DataFrame:
+    """UTC-aligned time bars ("3m", "10m", ...) from trades[start:]; empty intervals are skipped."""
+    a = tape.arrays(start)
+    bar_ms = duration_to_ms(duration)
+    buckets = a["timestamp"] // bar_ms * bar_ms
+    return _reduce_bars(a["timestamp"], a["price"], a["amount"], a["side"], buckets, buckets)
+
+
+def volume_bars(tape: TradeTape, bar_volume: float, start: int = 0, offset: float = 0.0) -> pd.DataFrame:
+    """
+    Bars cut on a grid of `bar_volume` cumulative traded size, so each holds about
+    `bar_volume`. A trade belongs to the bar in which it starts; `offset` is the
+    grid position of trades[start]. The timestamp is the bar's first trade.
+    """
+    a = tape.arrays(start)
+    before = offset + np.r_[0.0, np.cumsum(a["amount"])[:-1]]
+    groups = np.floor(before / bar_volume).astype(np.int64)
+    return _reduce_bars(a["timestamp"], a["price"], a["amount"], a["side"], groups, a["timestamp"])
+
+
+class BarBuilder:
+    """
+    Incrementally maintained custom bars over a tape.
+
+    Args:
+        tape: source trades
+        duration: time-bar length such as "3m" (mutually exclusive with bar_volume)
+        bar_volume: size per volume bar
+    """
+
+    def __init__(self, tape: TradeTape, duration: Optional[str] = None, bar_volume: Optional[float] = None):
+        if (duration is None) == (bar_volume is None):
+            raise ValueError("Pass exactly one of duration or bar_volume")
+        self.tape = tape
+        self.duration = duration
+        self.bar_volume = bar_volume
+        self._closed = pd.DataFrame(columns=TRADE_BAR_COLUMNS)
+        self._open_start = 0  # absolute trade index where the last (open) bar begins
+        self._offset = 0.0  # volume carried into the open volume bar
+        self._bars = self._closed
+
+    def update(self) -> pd.DataFrame:
+        """Re-reduce only trades from the open bar onward; returns all bars (last may be open)."""
+        start = max(0, self._open_start - self.tape.dropped)
+        if self.duration is not None:
+            tail = time_bars(self.tape, self.duration, start)
+        else:
+            tail = volume_bars(self.tape, self.bar_volume, start, self._offset)
+        if tail.empty:
+            return self._bars
+        # Everything but the last bar is final; remember where the last one starts
+        counts = tail["trades"].to_numpy()
+        self._open_start += int(counts[:-1].sum())
+        if self.bar_volume is not None:
+            done = tail["volume"].to_numpy()[:-1]
+            # Whole bars closed, so the carry restarts at the remainder inside the open bar
+            self._offset = (self._offset + done.sum()) % self.bar_volume if len(done) else self._offset
+        frames = [f for f in (self._closed, tail.iloc[:-1]) if not f.empty]
+        self._closed = pd.concat(frames, ignore_index=True) if frames else self._closed
+        self._bars = pd.concat([self._closed, tail.iloc[-1:]], ignore_index=True)
+        return self._bars
+
+
+def trade_flow_summary(tape: TradeTape, windows: Sequence[str] = ("1m", "5m", "15m"), bar: str = "3m", tail: int = 5) -> str:
+    """Compact text of CVD, aggressor ratios and the latest custom time bars."""
+    if not len(tape):
+        return f"# No trades for {tape.symbol}\n"
+    cvd = cumulative_volume_delta(tape)
+    lines = [
+        f"# Trade flow for {tape.symbol} trades={len(tape)} cvd={cvd[-1]:.4f}",
+        "window,volume,delta,buy_ratio,trades,covered_s,partial",
+    ]
+    for w, r in aggressor_ratios(tape, windows).items():
+        lines.append(
+            f"{w},{r['volume']:.4f},{r['delta']:.4f},{r['buy_ratio']:.3f},{r['trades']},"
+            f"{r['covered_ms'] // 1000},{'yes' if r['partial'] else 'no'}"
+        )
+    bars = time_bars(tape, bar).tail(tail).copy()
+    bars["datetime"] = pd.to_datetime(bars["timestamp"], unit="ms")
+    lines.append(f"# Last {len(bars)} {bar} trade bars")
+    lines.append(bars[["datetime", "open", "high", "low", "close", "volume", "delta", "trades"]].to_csv(index=False).rstrip())
+    return "\n".join(lines) + "\n"
+
+
+_tapes: Dict[str, TradeTape] = {}
+_tapes_lock = threading.Lock()
+
+
+def get_trade_tape(symbol: str) -> TradeTape:
+    """Process-wide tape for `symbol`."""
+    with _tapes_lock:
+        if symbol not in _tapes:
+            _tapes[symbol] = TradeTape(symbol)
+        return _tapes[symbol]
+
+
+# Bybit returns at most this many recent public trades per request.
+TRADES_PAGE_LIMIT = 1000
+
+
+def sync_trades(symbol: str, client: Any = None, tape: Optional[TradeTape] = None) -> TradeTape:
+    """
+    Fetch trades since the tape's last print and ingest them (the shared tape by default).
+
+    One page is requested. A full page whose oldest trade is newer than the
+    tape's last one may have skipped trades in between, so the tape's covered
+    span restarts at that page.
+    """
+    tape = tape if tape is not None else get_trade_tape(symbol)
+    c = client or _ensure_client()
+    since = tape.last_timestamp()
+    trades = _call(c, "fetch_trades", symbol, since=since, limit=TRADES_PAGE_LIMIT) or []
+    if since is not None and len(trades) >= TRADES_PAGE_LIMIT:
+        oldest = min(int(t["timestamp"]) for t in trades)
+        if oldest > since:
+            tape.mark_gap(oldest)
+    tape.ingest(trades)
+    return tape
+
+
+def get_trade_flow(
+    symbol: str,
+    client: Any = None,
+    tape: Optional[TradeTape] = None,
+    windows: Sequence[str] = ("1m", "5m", "15m"),
+    bar: str = "3m",
+) -> str:
+    """Sync recent trades, then summarize CVD, aggressor ratios and custom bars."""
+    try:
+        tape = sync_trades(symbol, client=client, tape=tape)
+    except Exception as e:  # pragma: no cover - ccxt specific
+        return f"# Trades unavailable for {symbol}: {e}\n"
+    return trade_flow_summary(tape, windows=windows, bar=bar)
@@ -0,0 +1,155 @@
+"""
+Batch market snapshots for a watchlist of Bybit USDT perpetuals.
+
+Top-of-book and funding come from the bulk `fetch_tickers`/`fetch_funding_rates`
+endpoints (one request for the whole list). If a bulk call is unsupported or
+fails (one delisted symbol is enough to make Bybit reject it), those fields are
+fetched per symbol instead. OHLCV and open interest have no bulk endpoint, so
+they are fetched per symbol on a bounded thread pool that shares the Bybit rate
+limiter and the local bar store; open interest goes through the same synced
+history (and derivatives store) as `get_open_interest_change`. Each component
+fails on its own and its error is recorded in that symbol's snapshot rather
+than failing the batch or the symbol's other fields.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .bar_store import BarStore
+from .ccxt_bybit import _call, _ensure_client, get_derivatives_store, load_ohlcv_df, sync_open_interest_history
+from .ohlcv_arrays import OhlcvArrays
+
+MAX_SYMBOL_WORKERS = 8
+
+
+def _supports(client: Any, method: str) -> bool:
+    has = getattr(client, "has", None)
+    if isinstance(has, dict) and method in has:
+        return bool(has[method])
+    return callable(getattr(client, method, None))
+
+
+def _bulk(client: Any, method: str, symbols: Sequence[str]) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Result of one bulk call, or None when unsupported or failed (callers then go per symbol)."""
+    if not _supports(client, method):
+        return None
+    try:
+        return _call(client, method, list(symbols)) or {}
+    except Exception as e:
+        print(f"WARNING: {method} failed ({e}); fetching per symbol")
+        return None
+
+
+def _single(client: Any, method: str, symbol: str, errors: List[str]) -> Dict[str, Any]:
+    try:
+        return _call(client, method, symbol) or {}
+    except Exception as e:
+        errors.append(f"{method}: {e}")
+        return {}
+
+
+def _oi_change_pct(client: Any, symbol: str, timeframe: str, store: Optional[BarStore]) -> Optional[float]:
+    """Last open interest change in %, from the history `get_open_interest_change` reports."""
+    _, values = sync_open_interest_history(client, symbol, timeframe, store)
+    if len(values) < 2:
+        return None
+    prev = float(values[-2])
+    return (float(values[-1]) - prev) / prev * 100 if prev else None
+
+
+def get_market_snapshots(
+    symbols: Sequence[str],
+    start_date: str,
+    end_date: str,
+    timeframe: str = "15m",
+    oi_timeframe: str = "1h",
+    client: Any = None,
+    store: Optional[BarStore] = None,
+    max_workers: int = MAX_SYMBOL_WORKERS,
+    compact: bool = False,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch OHLCV, funding, open interest change and top-of-book for many symbols.
+
+    Args:
+        symbols: e.g. ["BTC/USDT:USDT", "ETH/USDT:USDT"]
+        start_date / end_date: inclusive "YYYY-MM-DD" window for OHLCV
+        client: optional ccxt client (for tests, pass a dummy)
+        max_workers: bound on concurrent per-symbol requests
+        compact: keep each symbol's bars as float32 `OhlcvArrays` instead of a
+            DataFrame (about half the memory for large scans)
+    Returns:
+        {symbol: {"ohlcv": DataFrame or OhlcvArrays, "bid", "ask", "last", "funding_rate",
+        "oi_change_pct", "error"}}; a failing symbol carries its errors (joined
+        with "; ") instead of failing the batch.
+    """
+    c = client or _ensure_client()
+    oi_store = get_derivatives_store() if client is None else None
+    tickers = _bulk(c, "fetch_tickers", symbols)
+    funding = _bulk(c, "fetch_funding_rates", symbols)
+
+    def per_symbol(symbol: str) -> Dict[str, Any]:
+        errors: List[str] = []
+        ticker = (tickers.get(symbol) or {}) if tickers is not None else _single(c, "fetch_ticker", symbol, errors)
+        rate = (funding.get(symbol) or {}) if funding is not None else _single(c, "fetch_funding_rate", symbol, errors)
+        snap: Dict[str, Any] = {
+            "bid": ticker.get("bid"),
+            "ask": ticker.get("ask"),
+            "last": ticker.get("last"),
+            "funding_rate": rate.get("fundingRate"),
+            "ohlcv": pd.DataFrame(),
+            "oi_change_pct": None,
+            "error": None,
+        }
+        try:
+            df = load_ohlcv_df(symbol, start_date, end_date, timeframe, client=client, store=store)
+            snap["ohlcv"] = OhlcvArrays.from_frame(df) if compact else df
+        except Exception as e:
+            errors.append(str(e))
+        try:
+            snap["oi_change_pct"] = _oi_change_pct(c, symbol, oi_timeframe, oi_store)
+        except Exception as e:
+            errors.append(f"open interest: {e}")
+        snap["error"] = "; ".join(errors) or None
+        return snap
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols)))) as pool:
+        results = list(pool.map(per_symbol, symbols))
+    return dict(zip(symbols, results))
+
+
+def _fmt(value: Any, digits: Optional[int] = None) -> str:
+    if value is None:
+        return ""
+    if digits is not None:
+        return f"{value:.{digits}f}"
+    return str(value).replace(",", ";")
+
+
+def format_watchlist_snapshot(snapshots: Dict[str, Dict[str, Any]]) -> str:
+    """One CSV row per symbol: top-of-book, funding, OI change and window return."""
+    rows: List[str] = [
+        f"# Watchlist snapshot symbols={len(snapshots)}",
+        "symbol,last,bid,ask,spread_bps,funding_rate,oi_change_pct,close,window_change_pct,bars,error",
+    ]
+    for symbol, snap in snapshots.items():
+        bid, ask = snap.get("bid"), snap.get("ask")
+        spread = (ask - bid) / ((ask + bid) / 2) * 1e4 if bid and ask else None
+        df = snap.get("ohlcv")
+        close = change = None
+        bars = 0 if df is None else len(df)
+        if bars:
+            close = float(np.asarray(df["close"])[-1])
+            first = float(np.asarray(df["open"])[0])
+            change = (close / first - 1) * 100 if first else None
+        rows.append(",".join([
+            symbol, _fmt(snap.get("last")), _fmt(bid), _fmt(ask), _fmt(spread, 2),
+            _fmt(snap.get("funding_rate")), _fmt(snap.get("oi_change_pct"), 2),
+            _fmt(close), _fmt(change, 2), str(bars), _fmt(snap.get("error")),
+        ]))
+    return "\n".join(rows) + "\n"
@@ -6,11 +6,63 @@ DEFAULT_CONFIG = {
     # Crypto data settings
     "default_symbol": "BTC/USDT",
     "default_timeframes": ["15m", "1h"],
+    # Higher timeframes are resampled locally from the base series when it is
+    # stored (or at most one page short); cold windows fetch them natively
+    "ohlcv_base_timeframe": "15m",
+    "resampled_timeframes": ["1h", "4h", "1d"],
     # Optional cache directory for fetched data (used by CCXT/pandas)
     "data_cache_dir": os.path.join(
         os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
         "dataflows/data_cache",
     ),
+    # Persist closed OHLCV bars under data_cache_dir and only fetch the delta
+    "bar_store_enabled": True,
+    # Serve OHLCV windows from live kline ring buffers when they cover them
+    "kline_stream_enabled": True,
+    "kline_buffer_capacity": 5000,
+    # API streams websocket klines for these [symbol, timeframe] pairs, seeding
+    # each buffer from the bar store (empty = off; resampled timeframes follow
+    # their base series)
+    "kline_stream_subscriptions": [],
+    # Pooled ccxt clients reload market metadata at most this often
+    "ccxt_markets_ttl_seconds": 3600,
+    # On-disk market catalogue (symbol validation, client cold start) refresh age
+    "market_catalogue_ttl_seconds": 86400,
+    # Shared token buckets per vendor: rate (tokens/s), burst capacity and
+    # per-endpoint weights (default weight 1)
+    "rate_limits": {
+        "bybit": {"rate": 20, "capacity": 40, "weights": {}},
+        "alpha_vantage": {"rate": 1.0, "capacity": 5, "weights": {}},
+        "google_news": {"rate": 0.25, "capacity": 1, "weights": {}},
+    },
+    # Concurrent identical data requests share one upstream fetch
+    "coalesce_requests": True,
+    # Cache routed market data: OHLCV/indicators until the next bar close,
+    # funding and open interest for their own TTLs
+    "market_cache_enabled": True,
+    "market_cache_max_entries": 2048,
+    "funding_rate_cache_ttl_seconds": 60,
+    "open_interest_cache_ttl_seconds": 60,
+    # Indicator results keyed by (symbol, timeframe, last bar, params); persisting
+    # writes them under data_cache_dir/indicators for other runs to reuse
+    "indicator_cache_enabled": True,
+    "indicator_cache_max_entries": 512,
+    "indicator_cache_persist": False,
+    # Indicator tool loads only the bars its indicators need to converge (plus the
+    # summary tail) instead of the whole look-back window
+    "indicator_warmup_bounded": True,
+    # Bars scanned for swing points, S/R zones and the range state in the
+    # indicator summaries (the bounded window is widened to cover them)
+    "levels_lookback_bars": 192,
+    # Funding / open interest history kept locally and the horizons reported from it
+    "derivatives_history_days": 30,
+    "derivatives_horizons": ["1h", "4h", "24h"],
+    # Background orderbook sampling (API starts it for these symbols; empty = off)
+    "orderbook_sampler_symbols": [],
+    "orderbook_sampler_interval_seconds": 2.0,
+    "orderbook_sampler_capacity": 900,
+    # Optional Redis URL (e.g. redis://localhost:6379/0) to share the buckets across processes
+    "rate_limit_backend": None,
     # LLM settings
     "llm_provider": "openai",
     "deep_think_llm": "o4-mini",
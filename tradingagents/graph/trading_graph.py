@@ -26,6 +26,7 @@ from tradingagents.dataflows.config import set_config
 from tradingagents.agents.utils.agent_utils import (
     get_stock_data,
     get_indicators,
+    get_indicator_bundle,
     get_fundamentals,
     get_balance_sheet,
     get_cashflow,
@@ -129,6 +130,7 @@ class TradingAgentsGraph:
                     get_stock_data,
                     # Technical indicators
                     get_indicators,
+                    get_indicator_bundle,
                 ]
             ),
             "social": ToolNode(